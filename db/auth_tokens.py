@@ -0,0 +1,123 @@
+from typing import Dict, Any, Optional
+from collections import OrderedDict
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+
+from fastapi import HTTPException, Request
+from firebase_admin import auth
+
+logger = logging.getLogger(__name__)
+
+# Decoded Firebase ID tokens are cached by token hash until the token's own `exp`, so a
+# client reusing its token skips the JWT signature check on every request after the first.
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv('AUTH_TOKEN_CACHE_MAX_ENTRIES', '10000'))
+# Upper bound on how long one decoded token is reused, whatever its `exp` says
+TOKEN_CACHE_MAX_TTL_SECONDS = float(os.getenv('AUTH_TOKEN_CACHE_MAX_TTL_SECONDS', '3600'))
+
+
+class TokenCache:
+    """Bounded LRU of decoded ID tokens keyed by the SHA-256 of the raw token."""
+
+    def __init__(self, max_entries: int = TOKEN_CACHE_MAX_ENTRIES, max_ttl_seconds: float = TOKEN_CACHE_MAX_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.max_ttl_seconds = max_ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self.make_key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, token: str, decoded_token: Dict[str, Any]) -> None:
+        exp = decoded_token.get('exp')
+        if not exp:
+            return
+        expires_at = min(float(exp), time.time() + self.max_ttl_seconds)
+        key = self.make_key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, decoded_token)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'entries': len(self._entries), 'maxEntries': self.max_entries, 'hits': self.hits, 'misses': self.misses}
+
+
+token_cache = TokenCache()
+
+
+async def verify_id_token_async(token: str) -> Dict[str, Any]:
+    """Verify a Firebase ID token, reusing the decoded result while the token is still valid.
+
+    Signature verification (and a possible cert fetch) is blocking, so a cache miss is verified
+    on a worker thread instead of the event loop.
+    """
+    decoded_token = token_cache.get(token)
+    if decoded_token is None:
+        decoded_token = await asyncio.to_thread(auth.verify_id_token, token)
+        token_cache.set(token, decoded_token)
+    return decoded_token
+
+
+async def verify_token(request: Request) -> Dict[str, Any]:
+    """FastAPI dependency verifying the Bearer token in the Authorization header."""
+    authorization = request.headers.get("Authorization")
+
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Missing or invalid authorization token")
+
+    token = authorization.split("Bearer ")[1]
+
+    try:
+        decoded_token = await verify_id_token_async(token)
+        request.state.user = decoded_token
+        return decoded_token
+    except Exception as e:
+        logger.error(f"Error verifying token: {e}")
+        raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
+
+
+def warm_public_keys() -> None:
+    """Fetch Google's ID token signing certs ahead of the first request. Best effort.
+
+    firebase_admin keeps the certs in an HTTP cache on its token verifier, which is not part of
+    its public API. When this firebase_admin version does not have the expected internals, or the
+    fetch fails, warming is skipped and the first request fetches the certs instead.
+    """
+    try:
+        get_client = getattr(auth, '_get_client', None)
+        verifier = getattr(get_client(None), '_token_verifier', None) if get_client else None
+        cert_url = getattr(getattr(verifier, 'id_token_verifier', None), 'cert_url', None)
+        if verifier is None or cert_url is None or not callable(getattr(verifier, 'request', None)):
+            logger.info("Skipping Firebase ID token public key warm-up, not supported by this firebase_admin version")
+            return
+        verifier.request(cert_url, method='GET')
+        logger.info("Warmed Firebase ID token public key cache")
+    except Exception as e:
+        logger.warning(f"Could not warm Firebase ID token public keys: {e}")
@@ -0,0 +1,17 @@
+"""Build the targetSchoolIndex collection for target schools added before it existed.
+
+Run from the repository root:
+
+    python -m db.backfill_target_school_index
+"""
+import logging
+
+from .firestore_client import FirestoreClient
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+if __name__ == "__main__":
+    count = FirestoreClient().backfill_target_school_index()
+    logger.info(f"Indexed {count} target schools")
@@ -0,0 +1,267 @@
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import logging
+import hashlib
+import threading
+import time
+import os
+import traceback
+
+from .firestore_client import FirestoreClient, run_blocking
+
+
+logger = logging.getLogger(__name__)
+
+CATALOG_COLLECTION = 'US-Colleges'
+
+# Name fields used by the different generations of US-Colleges documents
+NAME_FIELDS = ('University Name', 'schoolName')
+
+# Sorted orders kept per snapshot; they are rebuilt lazily after every swap
+MAX_CACHED_ORDERS = 32
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    # Numbers sort numerically and before strings, so mixed-type fields still have a total order
+    if isinstance(value, bool):
+        return (1, str(value).lower())
+    if isinstance(value, (int, float)):
+        return (0, value)
+    return (1, str(value).lower())
+
+
+def _fail_on_event_loop() -> None:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    raise RuntimeError("College catalog is not loaded; await CollegeCatalog().ensure_loaded() before reading it from async code")
+
+
+class CollegeCatalog:
+    """Process-wide, in-memory snapshot of the US-Colleges collection.
+
+    The collection is streamed once and then kept current either by reloading it in a
+    background thread once the snapshot is older than COLLEGE_CATALOG_TTL_SECONDS, or by
+    a Firestore on_snapshot listener when COLLEGE_CATALOG_LISTENER is enabled. Reads are
+    served from memory; the returned documents are shared and must be treated as read-only.
+
+    The synchronous accessors load the collection on first use, which blocks the calling
+    thread for a full collection stream. That is fine on worker threads, but on the event loop
+    they raise RuntimeError instead: async code must `await ensure_loaded()` first (the service
+    startup hooks do).
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(CollegeCatalog, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.collection = CATALOG_COLLECTION
+        self.ttl_seconds = float(os.getenv('COLLEGE_CATALOG_TTL_SECONDS', '3600'))
+        self.use_listener = os.getenv('COLLEGE_CATALOG_LISTENER', 'false').lower() in ('1', 'true', 'yes')
+        self.version: Optional[str] = None
+
+        self._lock = threading.Lock()
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._orders: Dict[str, Tuple[List[Dict[str, Any]], Dict[str, int]]] = {}
+        self._loaded_at: Optional[float] = None
+        self._next_refresh_at = 0.0
+        self._refreshing = False
+        self._cold_load_lock = threading.Lock()
+        self._watch = None
+        self._initialized = True
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def load(self) -> None:
+        """Stream the whole collection from Firestore and swap in a fresh snapshot."""
+        start = time.monotonic()
+        docs = FirestoreClient().db.collection(self.collection).stream()
+        self._swap(docs)
+        logger.info(f"Loaded {len(self._docs)} documents from {self.collection} in {time.monotonic() - start:.2f}s (version {self.version})")
+
+    def start_listener(self) -> None:
+        """Keep the snapshot current from an on_snapshot listener instead of TTL reloads."""
+        if self._watch is not None:
+            return
+
+        def on_snapshot(col_snapshot, changes, read_time):
+            try:
+                self._swap(col_snapshot)
+                logger.info(f"{self.collection} changed ({len(changes)} documents), catalog version {self.version}")
+            except Exception as e:
+                logger.error(f"Error applying {self.collection} snapshot: {e}")
+
+        self._watch = FirestoreClient().db.collection(self.collection).on_snapshot(on_snapshot)
+        logger.info(f"Listening for changes on {self.collection}")
+
+    def stop(self) -> None:
+        """Detach the on_snapshot listener, if any."""
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+    def _swap(self, docs) -> None:
+        snapshot = {}
+        by_name = {}
+        digest = hashlib.sha1()
+        for doc in docs:
+            if not doc.exists:
+                continue
+            data = doc.to_dict()
+            data['id'] = doc.id
+            snapshot[doc.id] = data
+            for field in NAME_FIELDS:
+                name = data.get(field)
+                if name:
+                    by_name.setdefault(name, data)
+            digest.update(doc.id.encode('utf-8'))
+            digest.update(str(getattr(doc, 'update_time', '')).encode('utf-8'))
+
+        with self._lock:
+            self._docs = snapshot
+            self._by_name = by_name
+            self._orders = {}
+            self.version = digest.hexdigest()[:16]
+            self._loaded_at = time.monotonic()
+            self._next_refresh_at = self._loaded_at + self.ttl_seconds
+
+    def _ensure_fresh(self) -> None:
+        if self._loaded_at is None:
+            _fail_on_event_loop()
+            # Other threads needing the cold load wait for it here rather than loading twice
+            with self._cold_load_lock:
+                if self._loaded_at is None:
+                    self.load()
+                    if self.use_listener:
+                        self.start_listener()
+            return
+
+        if self._watch is not None or time.monotonic() < self._next_refresh_at:
+            return
+
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, name='college-catalog-refresh', daemon=True).start()
+
+    def _background_refresh(self) -> None:
+        try:
+            self.load()
+        except Exception as e:
+            # Keep serving the stale snapshot and retry a bit later
+            logger.error(f"Error refreshing {self.collection} catalog: {e}")
+            logger.error(traceback.format_exc())
+            self._next_refresh_at = time.monotonic() + min(self.ttl_seconds, 60.0)
+        finally:
+            self._refreshing = False
+
+    async def ensure_loaded(self) -> None:
+        """Load the snapshot off the event loop if needed; use from startup hooks and async routes."""
+        if self._loaded_at is None:
+            await run_blocking(self._ensure_fresh)
+        else:
+            self._ensure_fresh()
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Get every college document, each including its document ID under 'id'."""
+        self._ensure_fresh()
+        return list(self._docs.values())
+
+    async def all_async(self) -> List[Dict[str, Any]]:
+        """Async version of all() that never blocks the event loop on a cold load."""
+        await self.ensure_loaded()
+        return list(self._docs.values())
+
+    def snapshot(self) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """Get the catalog version together with the documents it describes."""
+        self._ensure_fresh()
+        with self._lock:
+            return self.version, list(self._docs.values())
+
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Get a college by document ID."""
+        self._ensure_fresh()
+        return self._docs.get(doc_id)
+
+    def get_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get a college by document ID or by its 'University Name' / 'schoolName' field."""
+        self._ensure_fresh()
+        return self._docs.get(name) or self._by_name.get(name)
+
+    def peek(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Get a college by document ID only if the snapshot is already loaded, never touching Firestore."""
+        return self._docs.get(doc_id)
+
+    def _ordered(self, sort: Optional[str]) -> Tuple[Optional[str], List[Dict[str, Any]], Dict[str, int]]:
+        """The snapshot sorted by `sort` ('field' or '-field', document ID when empty) with each ID's position."""
+        with self._lock:
+            version, docs, orders = self.version, self._docs, self._orders
+            cached = orders.get(sort or '')
+        if cached is not None:
+            return version, cached[0], cached[1]
+
+        field = (sort or '').lstrip('-')
+        if not field:
+            ordered = sorted(docs.values(), key=lambda d: d['id'])
+        else:
+            present = [d for d in docs.values() if d.get(field) is not None]
+            missing = [d for d in docs.values() if d.get(field) is None]
+            present.sort(key=lambda d: (_sort_key(d[field]), d['id']), reverse=(sort or '').startswith('-'))
+            # Documents without the field always come last, whatever the direction
+            missing.sort(key=lambda d: d['id'])
+            ordered = present + missing
+        positions = {d['id']: i for i, d in enumerate(ordered)}
+
+        with self._lock:
+            # Only cache against the snapshot it was built from
+            if self._orders is orders:
+                if len(orders) >= MAX_CACHED_ORDERS:
+                    orders.clear()
+                orders[sort or ''] = (ordered, positions)
+        return version, ordered, positions
+
+    def page(
+        self,
+        limit: int,
+        start_after: Optional[str] = None,
+        sort: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Get one page of colleges from the snapshot.
+
+        start_after is the ID of the last document of the previous page and must belong to the same
+        sort order; fields, when given, restricts each document to those fields (plus 'id'). Returns
+        the catalog version, the page, the cursor of the next page (None on the last one) and the total.
+        Raises ValueError for an unknown cursor.
+        """
+        self._ensure_fresh()
+        version, ordered, positions = self._ordered(sort)
+
+        start = 0
+        if start_after:
+            if start_after not in positions:
+                raise ValueError(f"Unknown startAfter cursor: {start_after}")
+            start = positions[start_after] + 1
+
+        docs = ordered[start:start + limit]
+        next_cursor = docs[-1]['id'] if docs and start + limit < len(ordered) else None
+        if fields:
+            docs = [{'id': d['id'], **{f: d[f] for f in fields if f in d}} for d in docs]
+        return {
+            'version': version,
+            'schools': docs,
+            'nextCursor': next_cursor,
+            'total': len(ordered),
+        }
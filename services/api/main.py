@@ -1,10 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import os
+import asyncio
 import logging
 
 # Import routes
 from src.routes import student_routes, school_routes, onboarding_routes, recommendation_routes
+from db.auth_tokens import warm_public_keys
+from db.catalog_cache import CollegeCatalog
+from src.http_responses import FirestoreJSONResponse, CompressionMiddleware
+from src.http_clients import open_clients, close_clients, clients_stats
 
 # Configure logging
 logging.basicConfig(
@@ -18,8 +23,12 @@ app = FastAPI(
     title="PrivSchool LMS API",
     description="API for the PrivSchool Learning Management System",
     version="1.0.0",
+    default_response_class=FirestoreJSONResponse,
 )
 
+# Compress large JSON bodies (school lists, profiles with their tasks)
+app.add_middleware(CompressionMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -40,11 +49,38 @@ app.include_router(school_routes.router, tags=["Schools"])
 app.include_router(onboarding_routes.router, tags=["Onboarding"])
 app.include_router(recommendation_routes.router, tags=["Recommendations"])
 
+@app.on_event("startup")
+async def warm_auth_public_keys():
+    """Fetch the Firebase token signing certs before the first authenticated request."""
+    await asyncio.to_thread(warm_public_keys)
+
+@app.on_event("startup")
+async def open_downstream_clients():
+    """Open the pooled crew and llm service clients shared by all requests."""
+    open_clients()
+
+@app.on_event("shutdown")
+async def close_downstream_clients():
+    await close_clients()
+
+@app.on_event("startup")
+async def warm_college_catalog():
+    """Load the US-Colleges snapshot before the first school listing needs it."""
+    try:
+        await CollegeCatalog().ensure_loaded()
+    except Exception as e:
+        logger.error(f"Could not preload college catalog: {e}")
+
 # Health check endpoint
 @app.get("/health", tags=["Health"])
 async def health_check():
     return {"status": "ok"}
 
+@app.get("/metrics/downstream", tags=["Health"])
+async def downstream_metrics():
+    """Connection pool usage and retry counters of the crew and llm service clients."""
+    return clients_stats()
+
 if __name__ == "__main__":
     import uvicorn
     logger.info("Starting PrivSchool LMS API Service on port 3002")
@@ -6,3 +6,21 @@ import os
 
 CREW_SERVICE_URL = os.getenv("CREW_SERVICE_URL", "http://crew:8003")
 LLM_SERVICE_URL = os.getenv("LLM_SERVICE_URL", "http://llm:8002")
+
+# Pooled clients for the calls to the crew and llm services (see src/http_clients.py).
+# Every downstream service gets its own pool of at most DOWNSTREAM_MAX_CONNECTIONS connections.
+DOWNSTREAM_MAX_CONNECTIONS = int(os.getenv("DOWNSTREAM_MAX_CONNECTIONS", "20"))
+DOWNSTREAM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("DOWNSTREAM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+DOWNSTREAM_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("DOWNSTREAM_KEEPALIVE_EXPIRY_SECONDS", "60"))
+DOWNSTREAM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("DOWNSTREAM_CONNECT_TIMEOUT_SECONDS", "5"))
+# How long a call may wait for a free connection before failing
+DOWNSTREAM_POOL_TIMEOUT_SECONDS = float(os.getenv("DOWNSTREAM_POOL_TIMEOUT_SECONDS", "10"))
+DOWNSTREAM_MAX_RETRIES = int(os.getenv("DOWNSTREAM_MAX_RETRIES", "2"))
+DOWNSTREAM_RETRY_BASE_DELAY_SECONDS = float(os.getenv("DOWNSTREAM_RETRY_BASE_DELAY_SECONDS", "0.2"))
+
+# Default read timeouts; crew and LLM generation can take minutes
+CREW_SERVICE_TIMEOUT_SECONDS = float(os.getenv("CREW_SERVICE_TIMEOUT_SECONDS", "300"))
+LLM_SERVICE_TIMEOUT_SECONDS = float(os.getenv("LLM_SERVICE_TIMEOUT_SECONDS", "300"))
+
+# Schools of one /api/analyze-schools request analysed at the same time
+ANALYZE_SCHOOLS_CONCURRENCY = int(os.getenv("ANALYZE_SCHOOLS_CONCURRENCY", "4"))
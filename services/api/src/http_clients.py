@@ -0,0 +1,218 @@
+from typing import Dict, Any, Optional
+import asyncio
+import logging
+import random
+import time
+
+import httpx
+
+from .config import (
+    CREW_SERVICE_URL,
+    LLM_SERVICE_URL,
+    CREW_SERVICE_TIMEOUT_SECONDS,
+    LLM_SERVICE_TIMEOUT_SECONDS,
+    DOWNSTREAM_MAX_CONNECTIONS,
+    DOWNSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+    DOWNSTREAM_KEEPALIVE_EXPIRY_SECONDS,
+    DOWNSTREAM_CONNECT_TIMEOUT_SECONDS,
+    DOWNSTREAM_POOL_TIMEOUT_SECONDS,
+    DOWNSTREAM_MAX_RETRIES,
+    DOWNSTREAM_RETRY_BASE_DELAY_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUS_CODES = frozenset({502, 503, 504})
+# Absolute Unix time (seconds) after which this service stops waiting for the call; the llm
+# service shortens its own request budget and OpenAI timeouts to it
+DEADLINE_HEADER = "X-Request-Deadline"
+# Failures where the request never reached the service, so even a POST can be sent again
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class DownstreamClient:
+    """Application-scoped, keep-alive HTTP client for one downstream service.
+
+    Calls are admitted through a semaphore sized like the connection pool, so the time a call
+    waits for a connection and the number of calls in flight can be reported. Idempotent calls
+    (GET/PUT/DELETE, or any call made with idempotent=True) are retried with jittered exponential
+    backoff on transport errors and 502/503/504; other calls only when the connection failed
+    before anything was sent. Every attempt carries an X-Request-Deadline header matching its
+    read timeout, so the service can stop working on a call nobody is waiting for any more.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        timeout_seconds: float,
+        max_connections: int = DOWNSTREAM_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DOWNSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DOWNSTREAM_KEEPALIVE_EXPIRY_SECONDS,
+        connect_timeout: float = DOWNSTREAM_CONNECT_TIMEOUT_SECONDS,
+        pool_timeout: float = DOWNSTREAM_POOL_TIMEOUT_SECONDS,
+        max_retries: int = DOWNSTREAM_MAX_RETRIES,
+        retry_base_delay: float = DOWNSTREAM_RETRY_BASE_DELAY_SECONDS
+    ):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.timeout_seconds = timeout_seconds
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.connect_timeout = connect_timeout
+        self.pool_timeout = pool_timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots = asyncio.Semaphore(max_connections)
+        self.in_use = 0
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.pool_timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def _timeout(self, read_timeout: Optional[float]) -> httpx.Timeout:
+        return httpx.Timeout(
+            read_timeout if read_timeout is not None else self.timeout_seconds,
+            connect=self.connect_timeout,
+            pool=self.pool_timeout
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled client, created on first use if the startup hook has not run."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self._timeout(None),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry
+                )
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _acquire(self) -> None:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.pool_timeout)
+        except asyncio.TimeoutError:
+            self.pool_timeouts += 1
+            raise httpx.PoolTimeout(f"No free connection to the {self.name} service within {self.pool_timeout}s")
+        waited = time.perf_counter() - started
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: anywhere between 0 and the exponential delay, so callers do not retry in lockstep
+        return random.uniform(0, self.retry_base_delay * (2 ** attempt))
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        timeout: Optional[float] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """Send a request to the service; `timeout` overrides the read timeout for this call."""
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+
+        headers = kwargs.pop("headers", None) or {}
+
+        attempt = 0
+        while True:
+            self.requests += 1
+            await self._acquire()
+            self.in_use += 1
+            try:
+                call_timeout = self._timeout(timeout)
+                deadline = {DEADLINE_HEADER: f"{time.time() + call_timeout.read:.3f}"}
+                response = await self.client.request(
+                    method, path, timeout=call_timeout, headers={**headers, **deadline}, **kwargs
+                )
+            except httpx.TransportError as e:
+                retryable = isinstance(e, _NOT_SENT_ERRORS) or idempotent
+                if not retryable or attempt >= self.max_retries:
+                    self.errors += 1
+                    raise
+                logger.warning(f"{self.name} {method} {path} failed ({type(e).__name__}: {e}), retrying")
+            else:
+                if not (idempotent and response.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries):
+                    return response
+                logger.warning(f"{self.name} {method} {path} returned {response.status_code}, retrying")
+                await response.aclose()
+            finally:
+                self.in_use -= 1
+                self._slots.release()
+
+            self.retries += 1
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    async def get(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    def _idle_connections(self) -> Optional[int]:
+        # httpx does not expose its pool; read httpcore's connection list when it is there
+        try:
+            connections = self._client._transport._pool.connections
+            return sum(1 for connection in connections if connection.is_idle())
+        except Exception:
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        admitted = self.requests - self.pool_timeouts
+        return {
+            "baseUrl": self.base_url,
+            "maxConnections": self.max_connections,
+            "inUse": self.in_use,
+            "idle": self._idle_connections() if self._client is not None else 0,
+            "requests": self.requests,
+            "retries": self.retries,
+            "errors": self.errors,
+            "poolTimeouts": self.pool_timeouts,
+            "waitSecondsAvg": self.wait_seconds_total / admitted if admitted else 0.0,
+            "waitSecondsMax": self.wait_seconds_max,
+        }
+
+
+crew_client = DownstreamClient("crew", CREW_SERVICE_URL, CREW_SERVICE_TIMEOUT_SECONDS)
+llm_client = DownstreamClient("llm", LLM_SERVICE_URL, LLM_SERVICE_TIMEOUT_SECONDS)
+
+DOWNSTREAM_CLIENTS = {client.name: client for client in (crew_client, llm_client)}
+
+
+def open_clients() -> None:
+    """Create every downstream pool; called on application startup."""
+    for client in DOWNSTREAM_CLIENTS.values():
+        client.client
+
+
+async def close_clients() -> None:
+    """Close every downstream pool; called on application shutdown."""
+    for client in DOWNSTREAM_CLIENTS.values():
+        await client.close()
+
+
+def clients_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: client.stats() for name, client in DOWNSTREAM_CLIENTS.items()}
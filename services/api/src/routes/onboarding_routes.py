@@ -1,13 +1,12 @@
-from fastapi import APIRouter, HTTPException, Request, Depends
-from typing import Dict, Any, List, Optional
+from fastapi import APIRouter, HTTPException, Request, Depends, BackgroundTasks
+from typing import Dict, Any, List
+import asyncio
 import logging
 import sys
-import os
 import httpx
-from datetime import datetime
-import json
 from pathlib import Path
-from ..config import CREW_SERVICE_URL, LLM_SERVICE_URL
+from ..config import ANALYZE_SCHOOLS_CONCURRENCY
+from ..http_clients import crew_client, llm_client
 
 # Add project root to Python path - fix for Docker container structure
 # In Docker, the directory structure is different, so we need a more robust approach
@@ -23,44 +22,26 @@ except IndexError:
     # Also add the services directory which is mounted at /app/services
     sys.path.append("/app/services")
 
-from db.firestore_client import FirestoreClient
-from firebase_admin import auth, firestore
+from db.firestore_client import (
+    FirestoreClient,
+    ROADMAP_STATUS_FIELD,
+    ROADMAP_PENDING,
+    ROADMAP_FAILED,
+    pending_roadmap_status,
+)
+from db.auth_tokens import verify_token
+from db.catalog_cache import CollegeCatalog
+from ..http_responses import dumps
+from firebase_admin import firestore
 
 # Configure logging
 logger = logging.getLogger(__name__)
 router = APIRouter()
 db_client = FirestoreClient()
+college_catalog = CollegeCatalog()
 
-# Custom JSON encoder to handle Firestore SERVER_TIMESTAMP
-class FirestoreEncoder(json.JSONEncoder):
-    def default(self, obj):
-        # Check if it's a Firestore Sentinel object
-        if hasattr(obj, '_sentinel_type'):
-            return f"Sentinel: {obj._sentinel_type}"
-        # Check if it's a datetime object
-        if hasattr(obj, 'isoformat'):
-            return obj.isoformat()
-        # Let the base class handle anything else
-        try:
-            return super().default(obj)
-        except TypeError:
-            return str(obj)  # Convert any non-serializable objects to strings
-
-# Helper function to verify authentication token
-async def verify_token(request: Request):
-    authorization = request.headers.get("Authorization")
-    
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization token")
-    
-    token = authorization.split("Bearer ")[1]
-    
-    try:
-        decoded_token = auth.verify_id_token(token)
-        return decoded_token
-    except Exception as e:
-        logger.error(f"Error verifying token: {e}")
-        raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
+# Queueing a crew job returns at once; this only bounds a slow or unreachable crew service
+ROADMAP_ENQUEUE_TIMEOUT_SECONDS = 30.0
 
 # Helper to remove undefined and null values from an object recursively
 def clean_object(obj):
@@ -71,9 +52,43 @@ def clean_object(obj):
     else:
         return obj
 
+async def enqueue_roadmap_job(user_id: str, target_schools: List[str]) -> None:
+    """Queue roadmap generation on the crew service; runs after the onboarding response is sent.
+
+    The crew worker moves roadmapStatus through running to done/failed. Here only the job id is
+    recorded, or the status set to failed if the job could not be queued.
+    """
+    roadmap_path = "/api/crew/jobs/roadmap"
+    try:
+        logger.info(f"Queueing roadmap job at {crew_client.url(roadmap_path)} for user {user_id}")
+        response = await crew_client.post(
+            roadmap_path,
+            json={"userId": user_id, "targetSchools": target_schools},
+            timeout=ROADMAP_ENQUEUE_TIMEOUT_SECONDS,
+        )
+        if response.status_code != 202:
+            raise RuntimeError(f"Crew service returned {response.status_code}: {response.text}")
+        # Status is left alone: the worker may already have marked the job running
+        await db_client.update_roadmap_status(user_id, jobId=response.json().get("jobId"))
+    except Exception as e:
+        logger.error(f"Error queueing roadmap generation for user {user_id}: {e}")
+        try:
+            await db_client.update_roadmap_status(
+                user_id,
+                ROADMAP_FAILED,
+                finishedAt=firestore.SERVER_TIMESTAMP,
+                error=f"Could not queue roadmap generation: {e}"
+            )
+        except Exception as status_error:
+            logger.error(f"Error recording roadmap failure for user {user_id}: {status_error}")
+
 @router.post("/api/onboarding")
-async def submit_onboarding(request: Request, token: Dict = Depends(verify_token)):
-    """Submit onboarding data."""
+async def submit_onboarding(request: Request, background_tasks: BackgroundTasks, token: Dict = Depends(verify_token)):
+    """Submit onboarding data.
+
+    The profile is saved and the response returned at once; when target schools are given the
+    roadmap is generated in the background and tracked in the user's roadmapStatus.
+    """
     try:
         onboarding_data = await request.json()
         user_id = token.get("uid")
@@ -89,12 +104,15 @@ async def submit_onboarding(request: Request, token: Dict = Depends(verify_token
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
+        # Get target schools for roadmap generation
+        target_schools = onboarding_data.get("collegePreferences", {}).get("targetSchools", [])
+        
         # Prepare onboarding data
         cleaned_data = clean_object({
             "studentProfile": {
                 "collegePreferences": {
                     "schoolCategories": onboarding_data.get("collegePreferences", {}).get("schoolCategories", []),
-                    "targetSchools": onboarding_data.get("collegePreferences", {}).get("targetSchools", []),
+                    "targetSchools": target_schools,
                     "earlyDecision": onboarding_data.get("collegePreferences", {}).get("earlyDecision", "none")
                 },
                 "generalInfo": onboarding_data.get("generalInfo", {}),
@@ -110,53 +128,22 @@ async def submit_onboarding(request: Request, token: Dict = Depends(verify_token
             "totalTasks": 0,
             "updatedAt": firestore.SERVER_TIMESTAMP
         })
-        
+        if target_schools:
+            # Written with the profile; added after clean_object so its None fields clear the last run
+            cleaned_data[ROADMAP_STATUS_FIELD] = pending_roadmap_status()
         
         # Update user profile with onboarding data
         await db_client.update_user_profile(user_id, cleaned_data)
         
-        # Get target schools for roadmap generation
-        target_schools = onboarding_data.get("collegePreferences", {}).get("targetSchools", [])
-        
-        # Generate tasks if target schools are provided
-        tasks = []
-        if target_schools and len(target_schools) > 0:
-            # Get college info from Firestore
-            college_data = []
-            for school_name in target_schools:
-                college = await db_client.get_college_by_name(school_name)
-                if college:
-                    college_data.append(college)
-                else:
-                    logger.warning(f"College not found: {school_name}")
-            
-            if college_data:
-                # Call LLM service to generate roadmap
-                try:
-                    async with httpx.AsyncClient(timeout=300.0) as client:
-                        roadmap_payload = {
-                            "userId": user_id,
-                            "targetSchools": target_schools,
-                            "schoolInfo": college_data
-                        }
-                        roadmap_url = f"{CREW_SERVICE_URL}/api/crew/roadmap"
-                        logger.info(f"Calling crew service at {roadmap_url}")
-                        response = await client.post(
-                            roadmap_url,
-                            json=roadmap_payload,
-                        )
-                        
-                        if response.status_code == 200:
-                            logger.info("Roadmap generated and saved successfully")
-                            
-                except Exception as e:
-                    logger.error(f"Error generating roadmap: {e}")
-                    # Continue without tasks if roadmap generation fails
+        # The crew service resolves the schools from its college catalog itself
+        if target_schools:
+            background_tasks.add_task(enqueue_roadmap_job, user_id, target_schools)
         
         # Return success response
         return {
             "success": True,
             "message": "Onboarding completed successfully",
+            "roadmapStatus": ROADMAP_PENDING if target_schools else None,
         }
     except HTTPException as e:
         raise e
@@ -164,9 +151,82 @@ async def submit_onboarding(request: Request, token: Dict = Depends(verify_token
         logger.error(f"Error in onboarding: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/api/onboarding/roadmap-status")
+async def get_roadmap_status(token: Dict = Depends(verify_token)):
+    """Get the status of the user's background roadmap generation."""
+    try:
+        user_id = token.get("uid")
+        if not user_id:
+            raise HTTPException(status_code=400, detail="User ID is required")
+        
+        user = await db_client.get_user_profile(user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        
+        return user.get(ROADMAP_STATUS_FIELD) or {"status": None}
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        logger.error(f"Error retrieving roadmap status: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def failed_analysis(school_name: str, error: str) -> Dict[str, Any]:
+    """A SchoolAnalysis entry (see the llm service's models/school.py) for a school that could not be analysed."""
+    return {
+        "schoolName": school_name,
+        "overallFit": "",
+        "keyPrograms": [],
+        "admissionRequirements": {"tests": [], "scores": {}, "other": []},
+        "recommendations": [],
+        "error": error,
+    }
+
+async def analyze_school(school_name: str, school: Dict[str, Any], slots: asyncio.Semaphore) -> List[Dict[str, Any]]:
+    """Analyses of one school from the LLM service, or a single failed entry; never raises."""
+    analysis_path = "/analyze-schools"
+    async with slots:
+        try:
+            logger.info(f"Calling LLM service at {llm_client.url(analysis_path)} for {school_name}")
+            # Analysis only reads, so a failed call can safely be sent again
+            analysis_response = await llm_client.post(
+                analysis_path,
+                content=dumps(school),
+                headers={"Content-Type": "application/json"},
+                idempotent=True,
+            )
+        except httpx.RequestError as e:
+            logger.error(f"Error calling LLM service for {school_name}: {e}")
+            return [failed_analysis(school_name, "LLM service unavailable")]
+
+    if analysis_response.status_code != 200:
+        logger.error(f"LLM service returned {analysis_response.status_code} for {school_name}: {analysis_response.text}")
+        return [failed_analysis(school_name, f"Error from LLM service: {analysis_response.text}")]
+
+    try:
+        analysis_data = analysis_response.json()
+    except ValueError:
+        return [failed_analysis(school_name, "Invalid response from LLM service")]
+    # Accept either a SchoolAnalysisResponse or a single SchoolAnalysis
+    analyses = analysis_data.get("analyses", [analysis_data]) if isinstance(analysis_data, dict) else []
+    if not analyses:
+        return [failed_analysis(school_name, "Empty analysis from LLM service")]
+    for analysis in analyses:
+        if isinstance(analysis, dict):
+            analysis.setdefault("schoolName", school_name)
+    return analyses
+
+async def school_not_found(school_name: str) -> List[Dict[str, Any]]:
+    logger.warning(f"College not found: {school_name}")
+    return [failed_analysis(school_name, "School not found")]
+
 @router.post("/api/analyze-schools")
 async def analyze_schools(request: Request, token: Dict = Depends(verify_token)):
-    """Analyze schools using LLM."""
+    """Analyze schools using LLM.
+
+    Every school is analysed concurrently, at most ANALYZE_SCHOOLS_CONCURRENCY at a time, and the
+    results are returned as a SchoolAnalysisResponse. Schools that could not be found or analysed
+    are included with their error; the request only fails when no school could be analysed.
+    """
     try:
         data = await request.json()
         schools = data.get("schools", [])
@@ -174,40 +234,28 @@ async def analyze_schools(request: Request, token: Dict = Depends(verify_token))
         if not schools or len(schools) == 0:
             raise HTTPException(status_code=400, detail="Schools list is required")
         
-        # Get school data from Firestore
-        school_data = []
-        for school_name in schools:
-            school = await db_client.get_college_by_name(school_name)
-            if school:
-                school_data.append(school)
+        # Resolve the schools from the in-memory college catalog
+        await college_catalog.ensure_loaded()
+        school_data = {name: college_catalog.get_by_name(name) for name in dict.fromkeys(schools)}
         
-        if not school_data:
+        if not any(school_data.values()):
             raise HTTPException(status_code=404, detail="No valid schools found")
         
-        # Call LLM service to analyze schools
-        try:
-            async with httpx.AsyncClient(timeout=300.0) as client:
-                for school in school_data:
-                    analysis_url = f"{LLM_SERVICE_URL}/analyze-schools"
-                    logger.info(f"Calling LLM service at {analysis_url}")
-                    analysis_response = await client.post(
-                        analysis_url,
-                        json=school,
-                    )
-
-                    if analysis_response.status_code == 200:
-                        analysis_data = analysis_response.json()
-                        return analysis_data
-                    else:
-                        raise HTTPException(
-                            status_code=analysis_response.status_code,
-                            detail=f"Error from LLM service: {analysis_response.text}"
-                        )
-        except httpx.RequestError as e:
-            logger.error(f"Error calling LLM service: {e}")
-            raise HTTPException(status_code=503, detail="LLM service unavailable")
+        # Call LLM service to analyze the schools, bounded per request
+        slots = asyncio.Semaphore(ANALYZE_SCHOOLS_CONCURRENCY)
+        results = await asyncio.gather(*[
+            analyze_school(name, school, slots) if school else school_not_found(name)
+            for name, school in school_data.items()
+        ])
+        analyses = [analysis for result in results for analysis in result]
+        
+        if all(isinstance(a, dict) and a.get("error") for a in analyses):
+            logger.error(f"Every school analysis failed: {[a.get('error') for a in analyses]}")
+            raise HTTPException(status_code=502, detail={"message": "Could not analyze any school", "analyses": analyses})
+        
+        return {"analyses": analyses}
     except HTTPException as e:
         raise e
     except Exception as e:
         logger.error(f"Error analyzing schools: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -5,9 +5,8 @@ import sys
 import os
 import httpx
 from datetime import datetime
-import json
 from pathlib import Path
-from ..config import CREW_SERVICE_URL
+from ..http_clients import crew_client
 
 # Add project root to Python path - fix for Docker container structure
 try:
@@ -21,49 +20,13 @@ except IndexError:
     sys.path.append("/app/services")
 
 from db.firestore_client import FirestoreClient
-from firebase_admin import auth, firestore
-# Helper function to verify authentication token
-async def verify_token(request: Request):
-    authorization = request.headers.get("Authorization")
-    
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization token")
-    
-    token = authorization.split("Bearer ")[1]
-    
-    try:
-        decoded_token = auth.verify_id_token(token)
-        return decoded_token
-    except Exception as e:
-        logger.error(f"Error verifying token: {e}")
-        raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
+from db.auth_tokens import verify_token
 
 # Configure logging
 logger = logging.getLogger(__name__)
 router = APIRouter()
 db_client = FirestoreClient()
 
-# Custom JSON encoder to handle Firestore SERVER_TIMESTAMP
-class FirestoreEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if hasattr(obj, '_sentinel_type'):
-            return f"Sentinel: {obj._sentinel_type}"
-        if hasattr(obj, 'isoformat'):
-            return obj.isoformat()
-        try:
-            return super().default(obj)
-        except TypeError:
-            return str(obj)
-
-# Helper to remove undefined and null values from an object recursively
-def clean_object(obj):
-    if isinstance(obj, dict):
-        return {k: clean_object(v) for k, v in obj.items() if v is not None}
-    elif isinstance(obj, list):
-        return [clean_object(item) for item in obj if item is not None]
-    else:
-        return obj
-
 @router.post("/api/recommendations")
 async def get_crew_recommendations(request: Request, token: Dict = Depends(verify_token)):
     """Get crew recommendations based on user profile and preferences."""
@@ -82,28 +45,27 @@ async def get_crew_recommendations(request: Request, token: Dict = Depends(verif
         
         # Call crew service for recommendations
         try:
-            async with httpx.AsyncClient(timeout=300.0) as client:
-                recommendation_url = f"{CREW_SERVICE_URL}/api/crew/recommendations"
-                logger.info(f"Calling crew service at {recommendation_url}")
-                response = await client.post(
-                    recommendation_url,
-                    json={
-                        "userId": user_id,
-                        "gpa": data.get('gpa'),
-                        "sat": data.get('sat'),
-                        "act": data.get('act'),
-                        "interests": data.get('interests', [])
-                    },
-                )
+            recommendation_path = "/api/crew/recommendations"
+            logger.info(f"Calling crew service at {crew_client.url(recommendation_path)}")
+            response = await crew_client.post(
+                recommendation_path,
+                json={
+                    "userId": user_id,
+                    "gpa": data.get('gpa'),
+                    "sat": data.get('sat'),
+                    "act": data.get('act'),
+                    "interests": data.get('interests', [])
+                },
+            )
 
-                if response.status_code == 200:
-                    recommendations = response.json()
-                    return recommendations
-                else:
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"Error from crew service: {response.text}"
-                    )
+            if response.status_code == 200:
+                recommendations = response.json()
+                return recommendations
+            else:
+                raise HTTPException(
+                    status_code=response.status_code,
+                    detail=f"Error from crew service: {response.text}"
+                )
         except httpx.RequestError as e:
             logger.error(f"Error calling crew service: {e}")
             raise HTTPException(status_code=503, detail="Crew service unavailable")
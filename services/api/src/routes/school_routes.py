@@ -1,40 +1,81 @@
-from fastapi import APIRouter, HTTPException, Request, Depends
+from fastapi import APIRouter, HTTPException, Request, Response, Depends, Query
 from typing import Dict, Any, List, Optional
+import asyncio
+import hashlib
 import logging
 from db.firestore_client import FirestoreClient
+from db.catalog_cache import CollegeCatalog
+from db.auth_tokens import verify_token
+from ..http_responses import FirestoreJSONResponse
 
 # Initialize Firestore client
 db_client = FirestoreClient()
+college_catalog = CollegeCatalog()
 
-from firebase_admin import auth
+DEFAULT_SCHOOLS_PAGE_SIZE = 50
+MAX_SCHOOLS_PAGE_SIZE = 500
+# Responses are per user (authenticated), so only the browser may keep them, revalidating with the ETag
+SCHOOLS_CACHE_CONTROL = "private, no-cache"
 
 # Configure logging
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# Helper function to verify authentication token
-async def verify_token(request: Request):
-    authorization = request.headers.get("Authorization")
-    
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization token")
-    
-    token = authorization.split("Bearer ")[1]
-    
-    try:
-        decoded_token = auth.verify_id_token(token)
-        return decoded_token
-    except Exception as e:
-        logger.error(f"Error verifying token: {e}")
-        raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
+
+def _schools_etag(version: Optional[str], limit: int, start_after: Optional[str], fields: Optional[List[str]], sort: Optional[str]) -> str:
+    params = f"{limit}|{start_after or ''}|{','.join(fields or [])}|{sort or ''}"
+    digest = hashlib.sha1(f"{version}|{params}".encode("utf-8")).hexdigest()[:16]
+    return f'W/"{digest}"'
+
+
+def _opaque_tag(tag: str) -> str:
+    # Weak comparison: W/"x" and "x" name the same representation
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header (a comma-separated list of tags, or *) names `etag`."""
+    tags = [tag.strip() for tag in if_none_match.split(",") if tag.strip()]
+    if "*" in tags:
+        return True
+    return _opaque_tag(etag) in {_opaque_tag(tag) for tag in tags}
 
 @router.get("/api/schools")
-async def get_all_schools(token: Dict = Depends(verify_token)):
-    """Get all schools."""
+async def get_all_schools(
+    request: Request,
+    limit: int = Query(DEFAULT_SCHOOLS_PAGE_SIZE, ge=1, le=MAX_SCHOOLS_PAGE_SIZE),
+    start_after: Optional[str] = Query(None, alias="startAfter"),
+    fields: Optional[str] = Query(None),
+    sort: Optional[str] = Query(None),
+    token: Dict = Depends(verify_token)
+):
+    """Get one page of schools from the college catalog.
+
+    `startAfter` is the `nextCursor` of the previous page, `fields` a comma-separated list of
+    fields to return (the ID is always included) and `sort` a field name, prefixed with `-`
+    for descending order. Responses carry an ETag derived from the catalog version.
+    """
     try:
-        # Get all schools from Firestore
-        schools = await db_client.get_all_schools()
-        return schools
+        field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+
+        await college_catalog.ensure_loaded()
+        etag = _schools_etag(college_catalog.version, limit, start_after, field_list, sort)
+        if _etag_matches(request.headers.get("If-None-Match", ""), etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": SCHOOLS_CACHE_CONTROL})
+
+        try:
+            page = college_catalog.page(limit, start_after=start_after, sort=sort, fields=field_list)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        # The catalog may have been swapped while the page was cut; tag the page with its own version
+        etag = _schools_etag(page["version"], limit, start_after, field_list, sort)
+        # Returned directly so the page is serialized once by orjson, without jsonable_encoder
+        return FirestoreJSONResponse(
+            content=page,
+            headers={"ETag": etag, "Cache-Control": SCHOOLS_CACHE_CONTROL}
+        )
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -45,21 +86,17 @@ async def get_all_schools(token: Dict = Depends(verify_token)):
 async def get_school_by_id(school_id: str, token: Dict = Depends(verify_token)):
     """Get school by ID with programs and activities."""
     try:
-        # Get school from Firestore
-        school = await db_client.get_school(school_id)
+        # The school document and its sub-collections are independent reads, so fetch them together
+        school, programs, activities, test_requirements = await asyncio.gather(
+            db_client.get_school(school_id),
+            db_client.get_school_programs(school_id),
+            db_client.get_school_activities(school_id),
+            db_client.get_school_test_requirements(school_id)
+        )
         
         if not school:
             raise HTTPException(status_code=404, detail="School not found")
         
-        # Get programs for the school
-        programs = await db_client.get_school_programs(school_id)
-        
-        # Get activities for the school
-        activities = await db_client.get_school_activities(school_id)
-        
-        # Get test requirements for the school
-        test_requirements = await db_client.get_school_test_requirements(school_id)
-        
         # Combine all data
         response = {
             **school,
@@ -125,13 +162,18 @@ async def get_student_target_schools(student_id: str, token: Dict = Depends(veri
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/api/schools/target/{target_id}")
-async def update_target_school(target_id: str, request: Request, token: Dict = Depends(verify_token)):
-    """Update target school status."""
+async def update_target_school(
+    target_id: str,
+    request: Request,
+    student_id: Optional[str] = Query(None, alias="studentId"),
+    token: Dict = Depends(verify_token)
+):
+    """Update target school status. Passing studentId lets the target be addressed directly."""
     try:
         data = await request.json()
         
         # Update target school in Firestore
-        success = await db_client.update_target_school(target_id, data)
+        success = await db_client.update_target_school(target_id, data, student_id)
         
         if not success:
             raise HTTPException(status_code=404, detail="Target school not found")
@@ -144,11 +186,15 @@ async def update_target_school(target_id: str, request: Request, token: Dict = D
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/api/schools/target/{target_id}")
-async def remove_target_school(target_id: str, token: Dict = Depends(verify_token)):
-    """Remove target school."""
+async def remove_target_school(
+    target_id: str,
+    student_id: Optional[str] = Query(None, alias="studentId"),
+    token: Dict = Depends(verify_token)
+):
+    """Remove target school. Passing studentId lets the target be addressed directly."""
     try:
         # Remove target school from Firestore
-        success = await db_client.remove_target_school(target_id)
+        success = await db_client.remove_target_school(target_id, student_id)
         
         if not success:
             raise HTTPException(status_code=404, detail="Target school not found")
@@ -1,49 +1,31 @@
 from fastapi import APIRouter, HTTPException, Request, Depends
 from typing import Dict, Any, List, Optional
+import asyncio
 import logging
 from db.firestore_client import FirestoreClient
+from db.auth_tokens import verify_token
 
 # Initialize Firestore client
 db_client = FirestoreClient()
 
-from firebase_admin import auth
-
 # Configure logging
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# Helper function to verify authentication token
-async def verify_token(request: Request):
-    authorization = request.headers.get("Authorization")
-    
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization token")
-    
-    token = authorization.split("Bearer ")[1]
-    
-    try:
-        decoded_token = auth.verify_id_token(token)
-        return decoded_token
-    except Exception as e:
-        logger.error(f"Error verifying token: {e}")
-        raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
-
 @router.get("/api/student/{student_id}")
 async def get_student_profile(student_id: str, token: Dict = Depends(verify_token)):
     """Get student profile information."""
     try:
-        # Get student profile from Firestore
-        student = await db_client.get_student(student_id)
+        # Fetch the student, target schools and interests together
+        student, target_schools, interests = await asyncio.gather(
+            db_client.get_student(student_id),
+            db_client.get_student_target_schools(student_id),
+            db_client.get_student_interests(student_id)
+        )
         
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
         
-        # Get target schools for the student
-        target_schools = await db_client.get_student_target_schools(student_id)
-        
-        # Get student interests
-        interests = await db_client.get_student_interests(student_id)
-        
         # Combine all data
         response = {
             **student,
@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("firebase_admin")
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from db.auth_tokens import verify_token
+from src.routes import school_routes, student_routes
+
+LATENCY = 0.1
+
+
+class SlowSnapshot:
+    def __init__(self, doc_id):
+        self.id = doc_id
+        self.exists = True
+
+    def to_dict(self):
+        return {"name": self.id}
+
+
+class SlowReference:
+    """Document or collection reference of a fake Firestore where every read takes LATENCY seconds."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def collection(self, name):
+        return SlowReference(f"{self.path}/{name}")
+
+    def document(self, doc_id):
+        return SlowReference(f"{self.path}/{doc_id}")
+
+    def get(self):
+        time.sleep(LATENCY)
+        return SlowSnapshot(self.path.rsplit("/", 1)[-1])
+
+    def stream(self):
+        time.sleep(LATENCY)
+        return [SlowSnapshot("item")]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Both routers share the FirestoreClient singleton
+    monkeypatch.setattr(school_routes.db_client, "db", SlowReference(""), raising=False)
+    app = FastAPI()
+    app.include_router(school_routes.router)
+    app.include_router(student_routes.router)
+    app.dependency_overrides[verify_token] = lambda: {"uid": "u1"}
+    return TestClient(app)
+
+
+def timed_get(client, path):
+    started = time.perf_counter()
+    response = client.get(path)
+    return response, time.perf_counter() - started
+
+
+def test_school_detail_reads_run_together(client):
+    response, elapsed = timed_get(client, "/api/schools/mit")
+
+    assert response.status_code == 200
+    assert response.json()["programs"] == [{"name": "item", "id": "item"}]
+    # Four reads back to back would take 4 * LATENCY
+    assert elapsed < 2 * LATENCY
+
+
+def test_student_profile_reads_run_together(client):
+    response, elapsed = timed_get(client, "/api/student/s1")
+
+    assert response.status_code == 200
+    assert set(response.json()) >= {"targetSchools", "interests"}
+    assert elapsed < 2 * LATENCY
+
+
+@pytest.mark.benchmark
+def test_benchmark_school_detail_latency(client):
+    db_client = school_routes.db_client
+
+    async def sequential(school_id):
+        # What the route did before: each read awaited after the previous one
+        await db_client.get_school(school_id)
+        await db_client.get_school_programs(school_id)
+        await db_client.get_school_activities(school_id)
+        await db_client.get_school_test_requirements(school_id)
+
+    started = time.perf_counter()
+    asyncio.run(sequential("mit"))
+    before = time.perf_counter() - started
+    _, after = timed_get(client, "/api/schools/mit")
+
+    print(f"\nSchool detail with {LATENCY * 1000:.0f} ms reads: {before * 1000:.0f} ms sequential, {after * 1000:.0f} ms fanned out")
+    assert after < before / 2
@@ -0,0 +1,96 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("firebase_admin")
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from db.auth_tokens import verify_token
+from src.routes import school_routes
+from src.routes.school_routes import MAX_SCHOOLS_PAGE_SIZE
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self.exists = True
+        self.update_time = "2026-01-01T00:00:00Z"
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+@pytest.fixture
+def client():
+    school_routes.college_catalog._swap(
+        FakeSnapshot(f"school-{i}", {"schoolName": f"School {i}", "acceptanceRate": i / 10}) for i in range(5)
+    )
+    app = FastAPI()
+    app.include_router(school_routes.router)
+    app.dependency_overrides[verify_token] = lambda: {"uid": "u1"}
+    return TestClient(app)
+
+
+def etag_of(client):
+    return client.get("/api/schools").headers["ETag"]
+
+
+def test_pages_cover_the_catalog(client):
+    first = client.get("/api/schools", params={"limit": 2}).json()
+    assert [s["id"] for s in first["schools"]] == ["school-0", "school-1"]
+    assert first["nextCursor"] == "school-1"
+    assert first["total"] == 5
+
+    last = client.get("/api/schools", params={"limit": 3, "startAfter": first["nextCursor"]}).json()
+    assert [s["id"] for s in last["schools"]] == ["school-2", "school-3", "school-4"]
+    assert last["nextCursor"] is None
+
+
+def test_page_size_bounds(client):
+    assert client.get("/api/schools", params={"limit": 0}).status_code == 422
+    assert client.get("/api/schools", params={"limit": MAX_SCHOOLS_PAGE_SIZE + 1}).status_code == 422
+    assert client.get("/api/schools", params={"limit": MAX_SCHOOLS_PAGE_SIZE}).status_code == 200
+
+
+def test_unknown_cursor_is_a_400(client):
+    assert client.get("/api/schools", params={"startAfter": "nope"}).status_code == 400
+
+
+def test_fields_and_sort(client):
+    page = client.get("/api/schools", params={"limit": 1, "fields": "schoolName", "sort": "-acceptanceRate"}).json()
+    assert page["schools"] == [{"id": "school-4", "schoolName": "School 4"}]
+
+
+@pytest.mark.parametrize("header", [
+    "{tag}",
+    "{opaque}",
+    '"other", {tag}',
+    '"other",{opaque}',
+    "*",
+])
+def test_matching_if_none_match_is_a_304(client, header):
+    tag = etag_of(client)
+    response = client.get("/api/schools", headers={"If-None-Match": header.format(tag=tag, opaque=tag[2:])})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == tag
+
+
+@pytest.mark.parametrize("header", [
+    '"other"',
+    "{prefix}\"",
+    'W/"{tag_body}0"',
+])
+def test_other_tags_get_the_page(client, header):
+    tag = etag_of(client)
+    response = client.get("/api/schools", headers={"If-None-Match": header.format(prefix=tag[:-3], tag_body=tag[3:-1])})
+
+    assert response.status_code == 200
+    assert response.json()["total"] == 5
+
+
+def test_etag_depends_on_the_query(client):
+    assert etag_of(client) != client.get("/api/schools", params={"limit": 2}).headers["ETag"]
@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import sys
 import os
+import asyncio
 import logging
 import traceback
 
@@ -24,6 +25,8 @@ logger.info("Starting auth service initialization")
 try:
     print("Attempting to import auth_routes...")
     from src.auth.auth_routes import router as auth_router
+    from db.auth_tokens import warm_public_keys
+    from src.http_responses import FirestoreJSONResponse, CompressionMiddleware
     print("Successfully imported auth_routes")
 except Exception as e:
     print(f"Error importing auth_routes: {e}")
@@ -31,7 +34,8 @@ except Exception as e:
     sys.exit(1)
 
 # Create FastAPI app
-app = FastAPI(title="PrivSchool LMS Service")
+app = FastAPI(title="PrivSchool LMS Service", default_response_class=FirestoreJSONResponse)
+app.add_middleware(CompressionMiddleware)
 logger.info("FastAPI app created")
 
 # Configure CORS
@@ -58,6 +62,11 @@ except Exception as e:
     print(f"Error including auth router: {e}")
     traceback.print_exc()
 
+@app.on_event("startup")
+async def warm_auth_public_keys():
+    """Fetch the Firebase token signing certs before the first Google sign-in."""
+    await asyncio.to_thread(warm_public_keys)
+
 @app.get("/health")
 async def health_check():
     logger.info("Health check endpoint called")
@@ -1,6 +1,6 @@
 # src/auth/auth_middleware.py
 from fastapi import Request, HTTPException, Depends
-from firebase_admin import auth
+from db.auth_tokens import verify_token
 from config.firebase_config import FirebaseConfig
 from functools import wraps
 
@@ -8,19 +8,7 @@ firebase = FirebaseConfig()
 
 async def verify_firebase_token(request: Request):
     """Verify Firebase ID token from Authorization header."""
-    authorization = request.headers.get("Authorization")
-    
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization token")
-    
-    token = authorization.split("Bearer ")[1]
-    
-    try:
-        decoded_token = auth.verify_id_token(token)
-        request.state.user = decoded_token
-        return decoded_token
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
+    return await verify_token(request)
 
 def require_auth(func):
     """Decorator to require authentication for routes."""
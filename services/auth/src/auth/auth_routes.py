@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Request
 from typing import Dict, Any
-from firebase_admin import auth  
 from db.firestore_client import FirestoreClient
+from db.auth_tokens import verify_id_token_async
 import logging
 
 logger = logging.getLogger(__name__)
@@ -99,7 +99,7 @@ async def google_auth(request: Request):
         
         # Verify the Google ID token
         try:
-            decoded_token = auth.verify_id_token(id_token)
+            decoded_token = await verify_id_token_async(id_token)
             user_id = decoded_token['uid']
             
             # Check if user exists
@@ -148,7 +148,7 @@ async def check_user(request: Request):
         
         # Verify token
         try:
-            decoded_token = auth.verify_id_token(token)
+            decoded_token = await verify_id_token_async(token)
             user_id = decoded_token['uid']
             
             # Get user from database
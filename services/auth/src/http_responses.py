@@ -0,0 +1,64 @@
+# Response layer shared by every service (orjson JSON, gzip); each keeps an identical copy in src/
+from typing import Any, Tuple
+import os
+
+import orjson
+from fastapi.responses import JSONResponse
+from google.cloud.firestore_v1.transforms import Sentinel
+from starlette.middleware.gzip import GZipMiddleware
+
+# Responses smaller than this are sent uncompressed; gzip only pays off on larger bodies
+GZIP_MIN_BYTES = int(os.getenv('RESPONSE_GZIP_MIN_BYTES', '1024'))
+GZIP_LEVEL = int(os.getenv('RESPONSE_GZIP_LEVEL', '6'))
+
+# Streamed responses (NDJSON roadmaps, SSE job events) must reach the client chunk by chunk
+STREAMING_PATH_SUFFIXES = ('/stream', '/events')
+
+
+def _default(obj: Any) -> Any:
+    # Firestore sentinels (e.g. SERVER_TIMESTAMP) have no value until the write is applied
+    if isinstance(obj, Sentinel):
+        return None
+    # DatetimeWithNanoseconds and other datetime subclasses that orjson does not take natively
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    if hasattr(obj, 'model_dump'):
+        return obj.model_dump()
+    return str(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes with orjson, handling Firestore values."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FirestoreJSONResponse(JSONResponse):
+    """orjson-backed JSON response used as the default response class of every service.
+
+    Routes returning plain data still go through FastAPI's jsonable_encoder first; routes with
+    large bodies can return this class directly to skip that pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class CompressionMiddleware:
+    """gzip for responses of at least GZIP_MIN_BYTES, leaving streaming endpoints untouched."""
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = GZIP_MIN_BYTES,
+        compresslevel: int = GZIP_LEVEL,
+        skip_path_suffixes: Tuple[str, ...] = STREAMING_PATH_SUFFIXES
+    ):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.skip_path_suffixes = skip_path_suffixes
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and not scope['path'].endswith(self.skip_path_suffixes):
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
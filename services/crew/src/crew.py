@@ -1,25 +1,115 @@
 from crewai import Agent, Task, Crew, Process
 from crewai.project import CrewBase, agent, crew, task
 import yaml
-import os
+import copy
+import threading
 from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
 
 from .tools.custom_tool import FirestoreAllCollegesTool
 from .tools.roadmap_tool import FirestoreRoadmapTool
 from .tools.error_handling_tool import ErrorHandlingTool
+from .models import RoadmapOutput
+
+CONFIG_DIR = Path(__file__).parent / 'config'
+
+# Parsed YAML config per file, keyed on the file's mtime so edits are picked up without a restart
+_config_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_config_lock = threading.Lock()
+
+
+def load_config(filename: str) -> Dict[str, Any]:
+    """Load a YAML config file, parsing it again only when its mtime changes.
+
+    Returns a deep copy so callers may mutate the result freely.
+    """
+    config_path = CONFIG_DIR / filename
+    mtime = config_path.stat().st_mtime
+    with _config_lock:
+        cached = _config_cache.get(filename)
+        if cached is None or cached[0] != mtime:
+            with open(config_path, 'r') as file:
+                cached = (mtime, yaml.safe_load(file))
+            _config_cache[filename] = cached
+        return copy.deepcopy(cached[1])
+
+
+class CrewFactory:
+    """Builds fresh roadmap and recommendation crews from cached config and shared tools.
+
+    Agents and tasks carry per-run state, so they are created for every run; the parsed
+    YAML and the tool instances (which only hold references to shared clients) are not.
+    """
+
+    def __init__(self):
+        self.firestore_tool = FirestoreAllCollegesTool()
+        self.roadmap_tool = FirestoreRoadmapTool()
+        self.error_handling_tool = ErrorHandlingTool()
+
+    def _agent(self, name: str, tools: Optional[list] = None) -> Agent:
+        return Agent(
+            config=load_config('agents.yaml')[name],
+            tools=tools or [],
+            verbose=True
+        )
+
+    def _task(self, name: str, agent: Agent, **kwargs) -> Task:
+        config = load_config('tasks.yaml')[name]
+        # The YAML names the agent; CrewBase resolves it, here it is passed in directly
+        config.pop('agent', None)
+        return Task(config=config, agent=agent, **kwargs)
+
+    def roadmap_crew(self) -> Crew:
+        """Crew with only the roadmap generator agent and roadmap task."""
+        roadmap_generator = self._agent('roadmap_generator', [self.roadmap_tool, self.error_handling_tool])
+        return Crew(
+            agents=[roadmap_generator],
+            tasks=[self._task('roadmap_task', roadmap_generator, output_json=RoadmapOutput)],
+            process=Process.sequential,
+            verbose=True
+        )
+
+    def recommendation_crew(self) -> Crew:
+        """Crew that matches the student against the catalog and reports recommendations."""
+        student_data_matcher = self._agent('student_data_matcher', [self.firestore_tool])
+        college_admission_advisor = self._agent('college_admission_advisor')
+        return Crew(
+            agents=[student_data_matcher, college_admission_advisor],
+            tasks=[
+                self._task('matching_task', student_data_matcher),
+                self._task('reporting_task', college_admission_advisor),
+            ],
+            process=Process.sequential,
+            verbose=True
+        )
+
+
+_crew_factory: Optional[CrewFactory] = None
+_crew_factory_lock = threading.Lock()
+
+
+def get_crew_factory() -> CrewFactory:
+    """Process-wide crew factory."""
+    global _crew_factory
+    with _crew_factory_lock:
+        if _crew_factory is None:
+            _crew_factory = CrewFactory()
+        return _crew_factory
+
 
 @CrewBase
 class LmsCrew:
     def __init__(self):
         """Initialize the LmsCrew with agents and tasks configurations."""
         # Load configuration files
-        self.agents_config = self._load_config('agents.yaml')
-        self.tasks_config = self._load_config('tasks.yaml')
+        self.agents_config = load_config('agents.yaml')
+        self.tasks_config = load_config('tasks.yaml')
         
-        # Initialize tools
-        self.firestore_tool = FirestoreAllCollegesTool()
-        self.roadmap_tool = FirestoreRoadmapTool()
-        self.error_handling_tool = ErrorHandlingTool()
+        # Reuse the process-wide tool instances
+        factory = get_crew_factory()
+        self.firestore_tool = factory.firestore_tool
+        self.roadmap_tool = factory.roadmap_tool
+        self.error_handling_tool = factory.error_handling_tool
         
         # Initialize agents and tasks
         self.agents = {}
@@ -27,9 +117,7 @@ class LmsCrew:
 
     def _load_config(self, filename):
         """Load configuration from YAML file."""
-        config_path = Path(__file__).parent / 'config' / filename
-        with open(config_path, 'r') as file:
-            return yaml.safe_load(file)
+        return load_config(filename)
 
     @agent
     def student_data_matcher(self) -> Agent:
@@ -66,7 +154,6 @@ class LmsCrew:
     def reporting_task(self) -> Task:
         return Task(
             config=self.tasks_config['reporting_task'],
-            output_file='report.md'
         )
         
     @task
@@ -74,6 +161,7 @@ class LmsCrew:
         """Creates the roadmap generation task"""
         return Task(
             config=self.tasks_config['roadmap_task'],
+            output_json=RoadmapOutput
         )
 
     @crew
@@ -0,0 +1,7 @@
+from .store import JobStore, InMemoryJobStore, SQLiteJobStore, QUEUED, RUNNING, SUCCEEDED, FAILED, TERMINAL_STATES
+from .manager import JobManager, get_job_manager
+
+__all__ = [
+    "JobStore", "InMemoryJobStore", "SQLiteJobStore", "JobManager", "get_job_manager",
+    "QUEUED", "RUNNING", "SUCCEEDED", "FAILED", "TERMINAL_STATES",
+]
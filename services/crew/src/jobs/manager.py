@@ -0,0 +1,103 @@
+import os
+import uuid
+import asyncio
+import logging
+import traceback
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict, Any, Optional, Tuple
+
+from fastapi import HTTPException
+
+from .store import JobStore, InMemoryJobStore, SQLiteJobStore, QUEUED, RUNNING, SUCCEEDED, FAILED
+
+logger = logging.getLogger(__name__)
+
+# A job handler receives the request payload and a callback for progress messages
+JobHandler = Callable[[Dict[str, Any], Callable[[str], None]], Any]
+
+
+class JobManager:
+    """Runs crew jobs on a bounded worker pool and records their state in a JobStore.
+
+    CrewAI's Crew.kickoff() is synchronous and can take minutes, so handlers run on worker
+    threads and the event loop only ever awaits their futures.
+    """
+
+    def __init__(self, store: JobStore, max_workers: int = 2):
+        self.store = store
+        self.max_workers = max_workers
+        self._handlers: Dict[str, JobHandler] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='crew-job')
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    def has_handler(self, kind: str) -> bool:
+        return kind in self._handlers
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> Tuple[str, Future]:
+        """Queue a job and return its id with the future of its result."""
+        if kind not in self._handlers:
+            raise KeyError(f"Unknown job kind: {kind}")
+
+        job_id = str(uuid.uuid4())
+        self.store.create({
+            "id": job_id,
+            "kind": kind,
+            "status": QUEUED,
+            "message": "Queued",
+            "createdAt": datetime.now().isoformat(),
+            "startedAt": None,
+            "finishedAt": None,
+            "result": None,
+            "error": None,
+        })
+        logger.info(f"Queued {kind} job {job_id}")
+        return job_id, self._executor.submit(self._execute, job_id, kind, payload)
+
+    async def run(self, kind: str, payload: Dict[str, Any]) -> Any:
+        """Queue a job and wait for its result without blocking the event loop."""
+        _, future = self.submit(kind, payload)
+        return await asyncio.wrap_future(future)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Read a job record on a worker thread, since a store such as SQLite does blocking I/O."""
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _execute(self, job_id: str, kind: str, payload: Dict[str, Any]) -> Any:
+        self.store.update(job_id, status=RUNNING, message="Running", startedAt=datetime.now().isoformat())
+
+        def progress(message: str) -> None:
+            self.store.update(job_id, message=message)
+
+        try:
+            result = self._handlers[kind](payload, progress)
+        except Exception as e:
+            error = e.detail if isinstance(e, HTTPException) else str(e)
+            logger.error(f"{kind} job {job_id} failed: {error}")
+            logger.error(traceback.format_exc())
+            self.store.update(job_id, status=FAILED, message="Failed", error=error, finishedAt=datetime.now().isoformat())
+            raise
+
+        self.store.update(job_id, status=SUCCEEDED, message="Done", result=result, finishedAt=datetime.now().isoformat())
+        logger.info(f"{kind} job {job_id} succeeded")
+        return result
+
+
+_job_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """Process-wide job manager configured from CREW_JOB_* environment variables."""
+    global _job_manager
+    if _job_manager is None:
+        if os.getenv("CREW_JOB_STORE", "memory").lower() == "sqlite":
+            store = SQLiteJobStore(os.getenv("CREW_JOB_DB_PATH", "crew_jobs.db"))
+        else:
+            store = InMemoryJobStore()
+        _job_manager = JobManager(store, max_workers=int(os.getenv("CREW_JOB_WORKERS", "2")))
+    return _job_manager
@@ -0,0 +1,115 @@
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+# Job lifecycle states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+TERMINAL_STATES = (SUCCEEDED, FAILED)
+
+
+class JobStore(ABC):
+    """Persistence interface for crew job records (plain JSON-serialisable dicts).
+
+    Methods are synchronous and may block; async callers go through JobManager.get().
+    """
+
+    @abstractmethod
+    def create(self, job: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def update(self, job_id: str, **fields: Any) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+
+class InMemoryJobStore(JobStore):
+    """Process-local job store that keeps about ``max_jobs`` records.
+
+    Past the limit the oldest finished jobs are dropped; queued and running jobs are never
+    evicted, so a client polling an active job cannot lose it.
+    """
+
+    def __init__(self, max_jobs: int = 1000):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            self._jobs[job["id"]] = dict(job)
+            excess = len(self._jobs) - self.max_jobs
+            if excess > 0:
+                finished = [job_id for job_id, record in self._jobs.items() if record.get("status") in TERMINAL_STATES]
+                for job_id in finished[:excess]:
+                    del self._jobs[job_id]
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+
+class SQLiteJobStore(JobStore):
+    """Job store backed by a SQLite file, so job state survives restarts.
+
+    Jobs still queued or running in the file when it is opened belonged to a process that has
+    died, so they are marked failed; the file must not be shared by two live processes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+        self._conn.commit()
+        self.fail_unfinished()
+
+    def fail_unfinished(self, error: str = "Interrupted by a service restart") -> int:
+        """Mark every queued or running job failed, so clients polling them stop waiting; returns the count."""
+        failed = 0
+        with self._lock:
+            for job_id, data in self._conn.execute("SELECT id, data FROM jobs").fetchall():
+                job = json.loads(data)
+                if job.get("status") in TERMINAL_STATES:
+                    continue
+                job.update(status=FAILED, message="Failed", error=error, finishedAt=datetime.now().isoformat())
+                self._conn.execute("UPDATE jobs SET data = ? WHERE id = ?", (json.dumps(job, default=str), job_id))
+                failed += 1
+            self._conn.commit()
+        return failed
+
+    def create(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute("INSERT INTO jobs (id, data) VALUES (?, ?)", (job["id"], json.dumps(job, default=str)))
+            self._conn.commit()
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            job = json.loads(row[0])
+            job.update(fields)
+            self._conn.execute("UPDATE jobs SET data = ? WHERE id = ?", (json.dumps(job, default=str), job_id))
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
@@ -1,10 +1,13 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 import logging
 import warnings
 import sys
 from pathlib import Path
 
+from .http_responses import FirestoreJSONResponse, CompressionMiddleware
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,8 +23,11 @@ app = FastAPI(
     title="PrivSchool LMS Crew Service",
     description="AI-powered college recommendations using CrewAI",
     version="1.0.0",
+    default_response_class=FirestoreJSONResponse,
 )
 
+# Compress large JSON bodies; job event streams are passed through as they are
+app.add_middleware(CompressionMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -37,15 +43,39 @@ app.add_middleware(
 )
 
 # Import and include routers
-from .routes import recommendations_router, roadmap_router, health_router
+from .routes import recommendations_router, roadmap_router, health_router, jobs_router
 
 # Include the API routers
 app.include_router(recommendations_router)
 app.include_router(roadmap_router)
+app.include_router(jobs_router)
 
 # Include the health check router
 app.include_router(health_router)
 
+from db.catalog_cache import CollegeCatalog
+
+@app.on_event("startup")
+async def warm_college_catalog():
+    """Load the US-Colleges snapshot before the first crew run needs it."""
+    try:
+        await CollegeCatalog().ensure_loaded()
+    except Exception as e:
+        logger.error(f"Could not preload college catalog: {e}")
+
+from .jobs import get_job_manager
+from .metrics import crew_metrics
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    """Stop accepting crew jobs and drop the ones still queued."""
+    get_job_manager().shutdown()
+
+@app.get("/metrics")
+async def metrics():
+    """Crew run and token usage counters in Prometheus text format."""
+    return PlainTextResponse(crew_metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     logger.info("Starting PrivSchool LMS Crew Service on port 8003")
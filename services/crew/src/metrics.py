@@ -0,0 +1,126 @@
+import time
+import logging
+import threading
+from typing import Dict, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+_EMPTY_STATS = {
+    "runs": 0,
+    "failures": 0,
+    "llmRequests": 0,
+    "promptTokens": 0,
+    "completionTokens": 0,
+    "totalTokens": 0,
+    "latencySeconds": 0.0,
+}
+
+
+def _usage_value(usage: Any, name: str) -> int:
+    """Read a counter from CrewAI's token usage, which is a UsageMetrics model or a plain dict by version."""
+    if usage is None:
+        return 0
+    value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, 0)
+    return value or 0
+
+
+def _crew_model(crew) -> str:
+    """Model name of the crew's first agent, as far as the installed CrewAI exposes it."""
+    for agent in getattr(crew, "agents", None) or []:
+        llm = getattr(agent, "llm", None)
+        if isinstance(llm, str):
+            return llm
+        model = getattr(llm, "model", None) or getattr(llm, "model_name", None)
+        if model:
+            return str(model)
+    return "unknown"
+
+
+def _label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{name}="{_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+class CrewMetrics:
+    """Process-wide accounting of crew runs: runs, failures, latency and token usage per route and model."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def record_run(self, route: str, model: str, token_usage: Any, latency_seconds: float, failed: bool = False) -> None:
+        with self._lock:
+            stats = self._stats.setdefault((route, model), dict(_EMPTY_STATS))
+            stats["runs"] += 1
+            if failed:
+                stats["failures"] += 1
+            stats["llmRequests"] += _usage_value(token_usage, "successful_requests")
+            stats["promptTokens"] += _usage_value(token_usage, "prompt_tokens")
+            stats["completionTokens"] += _usage_value(token_usage, "completion_tokens")
+            stats["totalTokens"] += _usage_value(token_usage, "total_tokens")
+            stats["latencySeconds"] += latency_seconds
+
+    def kickoff(self, crew, route: str, inputs: Dict[str, Any]):
+        """Run crew.kickoff(inputs), recording its latency and token usage and logging a one-line summary."""
+        model = _crew_model(crew)
+        started = time.perf_counter()
+        try:
+            result = crew.kickoff(inputs=inputs)
+        except Exception:
+            latency = time.perf_counter() - started
+            self.record_run(route, model, getattr(crew, "usage_metrics", None), latency, failed=True)
+            logger.info(f"[USAGE] route={route} model={model} status=failed latency_ms={latency * 1000:.0f}")
+            raise
+
+        latency = time.perf_counter() - started
+        token_usage = getattr(result, "token_usage", None) or getattr(crew, "usage_metrics", None)
+        self.record_run(route, model, token_usage, latency)
+        logger.info(
+            f"[USAGE] route={route} model={model} status=ok latency_ms={latency * 1000:.0f} "
+            f"llm_requests={_usage_value(token_usage, 'successful_requests')} "
+            f"prompt_tokens={_usage_value(token_usage, 'prompt_tokens')} "
+            f"completion_tokens={_usage_value(token_usage, 'completion_tokens')}"
+        )
+        return result
+
+    def render_prometheus(self) -> str:
+        """The counters in Prometheus text exposition format."""
+        with self._lock:
+            stats = {key: dict(value) for key, value in self._stats.items()}
+
+        lines = [
+            "# HELP crew_runs_total Crew kickoffs, including failed ones.",
+            "# TYPE crew_runs_total counter",
+        ]
+        lines += [f"crew_runs_total{_labels(route=r, model=m)} {s['runs']}" for (r, m), s in stats.items()]
+        lines += [
+            "# HELP crew_run_failures_total Crew kickoffs that raised.",
+            "# TYPE crew_run_failures_total counter",
+        ]
+        lines += [f"crew_run_failures_total{_labels(route=r, model=m)} {s['failures']}" for (r, m), s in stats.items()]
+        lines += [
+            "# HELP crew_llm_requests_total LLM requests made by crew agents.",
+            "# TYPE crew_llm_requests_total counter",
+        ]
+        lines += [f"crew_llm_requests_total{_labels(route=r, model=m)} {s['llmRequests']}" for (r, m), s in stats.items()]
+        lines += [
+            "# HELP crew_tokens_total Tokens used by crew agents.",
+            "# TYPE crew_tokens_total counter",
+        ]
+        for (r, m), s in stats.items():
+            lines.append(f"crew_tokens_total{_labels(route=r, model=m, type='prompt')} {s['promptTokens']}")
+            lines.append(f"crew_tokens_total{_labels(route=r, model=m, type='completion')} {s['completionTokens']}")
+        lines += [
+            "# HELP crew_run_latency_seconds Wall time of crew kickoffs.",
+            "# TYPE crew_run_latency_seconds summary",
+        ]
+        for (r, m), s in stats.items():
+            lines.append(f"crew_run_latency_seconds_sum{_labels(route=r, model=m)} {s['latencySeconds']:.6f}")
+            lines.append(f"crew_run_latency_seconds_count{_labels(route=r, model=m)} {s['runs']}")
+        return "\n".join(lines) + "\n"
+
+
+crew_metrics = CrewMetrics()
@@ -0,0 +1,3 @@
+from .roadmap import RoadmapTaskOutput, RoadmapRecommendation, RoadmapOutput
+
+__all__ = ["RoadmapTaskOutput", "RoadmapRecommendation", "RoadmapOutput"]
@@ -0,0 +1,24 @@
+from typing import List
+from pydantic import BaseModel
+
+
+class RoadmapTaskOutput(BaseModel):
+    """A roadmap task in the shape the roadmap_task's expected_output describes."""
+    id: str
+    title: str
+    description: str
+    dueDate: str
+    category: str
+    priority: str
+    school: str
+
+
+class RoadmapRecommendation(BaseModel):
+    text: str
+    priority: str
+
+
+class RoadmapOutput(BaseModel):
+    """Structured output of the roadmap_task, so CrewAI returns it as json_dict."""
+    tasks: List[RoadmapTaskOutput]
+    recommendations: List[RoadmapRecommendation]
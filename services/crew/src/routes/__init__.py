@@ -1,5 +1,6 @@
 from .recommendation import router as recommendations_router
 from .roadmap import router as roadmap_router
 from .health import router as health_router
+from .jobs import router as jobs_router
 
-__all__ = ["recommendations_router", "roadmap_router", "health_router"]
\ No newline at end of file
+__all__ = ["recommendations_router", "roadmap_router", "health_router", "jobs_router"]
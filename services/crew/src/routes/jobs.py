@@ -0,0 +1,70 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+import asyncio
+import logging
+import json
+import time
+
+from ..jobs import get_job_manager, TERMINAL_STATES
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+job_manager = get_job_manager()
+
+# Seconds between job state checks, and between SSE keep-alive comments
+POLL_INTERVAL = 1.0
+HEARTBEAT_INTERVAL = 15.0
+
+# Create jobs router
+router = APIRouter(prefix="/api/crew/jobs")
+
+@router.post("/{kind}", status_code=202)
+async def enqueue_job(kind: str, request: Request):
+    """Queue a crew job ('roadmap' or 'recommendations') and return its id immediately."""
+    if not job_manager.has_handler(kind):
+        raise HTTPException(status_code=404, detail=f"Unknown job kind: {kind}")
+
+    data = await request.json()
+    job_id, _ = job_manager.submit(kind, data)
+    return {
+        "jobId": job_id,
+        "status": "queued",
+        "statusUrl": f"/api/crew/jobs/{job_id}",
+        "eventsUrl": f"/api/crew/jobs/{job_id}/events"
+    }
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    """Get the status of a crew job, including its result once it has finished."""
+    job = await job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """Server-sent events stream of a crew job's status until it finishes."""
+    if not await job_manager.get(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        last_state = None
+        last_sent = time.monotonic()
+        while True:
+            job = await job_manager.get(job_id)
+            if job is None:
+                return
+            state = (job["status"], job.get("message"))
+            if state != last_state:
+                last_state = state
+                last_sent = time.monotonic()
+                yield f"event: status\ndata: {json.dumps(job, default=str)}\n\n"
+                if job["status"] in TERMINAL_STATES:
+                    return
+            elif time.monotonic() - last_sent >= HEARTBEAT_INTERVAL:
+                last_sent = time.monotonic()
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(POLL_INTERVAL)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
@@ -1,11 +1,16 @@
 from fastapi import APIRouter, HTTPException, Request
 import logging
-from typing import Dict
+import time
+from typing import Dict, Any, Callable, Optional
 
-from db.firestore_client import FirestoreClient
-from ..crew import LmsCrew
+from firebase_admin import firestore
+from db.firestore_client import FirestoreClient, ROADMAP_RUNNING, ROADMAP_DONE, ROADMAP_FAILED
+from db.catalog_cache import CollegeCatalog
+from ..crew import get_crew_factory
+from ..jobs import get_job_manager
+from ..metrics import crew_metrics
 from ..tools.roadmap_tool import sanitize_firebase_data
-from crewai import Crew, Process, CrewOutput
+from crewai import CrewOutput
 import json
 
 # Configure logging
@@ -13,14 +18,17 @@ logger = logging.getLogger(__name__)
 
 # Initialize Firestore client
 db_client = FirestoreClient()
+college_catalog = CollegeCatalog()
+job_manager = get_job_manager()
+crew_factory = get_crew_factory()
 
 # Create roadmap router
 router = APIRouter(prefix="/api/crew")
 
-async def get_user_profile(user_id: str):
+def get_user_profile(user_id: str):
     """Get user profile from Firestore."""
     try:
-        user_profile = await db_client.get_user_profile(user_id)
+        user_profile = db_client.get_user_profile_sync(user_id)
         if not user_profile or not user_profile.get('studentProfile'):
             raise HTTPException(status_code=404, detail=f"User profile {user_id} not found or incomplete")
         return user_profile
@@ -28,105 +36,160 @@ async def get_user_profile(user_id: str):
         logger.error(f"Error getting user profile: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def target_school_info(target_schools) -> list:
+    """Catalog documents of the target schools, looked up by document ID or name; unknown ones are skipped."""
+    school_info = []
+    for name in target_schools:
+        school = college_catalog.get_by_name(name)
+        if school:
+            school_info.append(school)
+        else:
+            logger.warning(f"College not found in catalog: {name}")
+    return school_info
+
+def set_roadmap_status(user_id: Optional[str], status: Optional[str] = None, **fields: Any) -> None:
+    """Record roadmap progress on the user document for portals to poll. Best effort."""
+    if not user_id:
+        return
+    try:
+        db_client.update_roadmap_status_sync(user_id, status, **fields)
+    except Exception as e:
+        logger.warning(f"Could not update roadmap status for {user_id}: {e}")
+
+def run_roadmap_crew(data: Dict[str, Any], progress: Callable[[str], None]) -> Dict[str, Any]:
+    """Generate and save a roadmap, tracking it in the user's roadmapStatus; runs on a crew job worker thread."""
+    user_id = data.get('userId')
+    started = time.monotonic()
+    set_roadmap_status(user_id, ROADMAP_RUNNING, startedAt=firestore.SERVER_TIMESTAMP, message="Running")
+
+    def tracked_progress(message: str) -> None:
+        progress(message)
+        set_roadmap_status(user_id, message=message)
+
+    try:
+        result = build_and_save_roadmap(data, tracked_progress)
+    except Exception as e:
+        set_roadmap_status(
+            user_id,
+            ROADMAP_FAILED,
+            finishedAt=firestore.SERVER_TIMESTAMP,
+            durationSeconds=round(time.monotonic() - started, 3),
+            message="Failed",
+            error=e.detail if isinstance(e, HTTPException) else str(e)
+        )
+        raise
+
+    set_roadmap_status(
+        user_id,
+        ROADMAP_DONE,
+        finishedAt=firestore.SERVER_TIMESTAMP,
+        durationSeconds=round(time.monotonic() - started, 3),
+        message="Done"
+    )
+    return result
+
+def build_and_save_roadmap(data: Dict[str, Any], progress: Callable[[str], None]) -> Dict[str, Any]:
+    """Generate and save a roadmap."""
+    # Extract required data
+    user_id = data.get('userId')
+    target_schools = data.get('targetSchools', [])
+
+    if not user_id or not target_schools:
+        raise HTTPException(status_code=400, detail="Missing userId or targetSchools")
+
+    logger.info(f"Generating roadmap for user {user_id} targeting {target_schools}")
+
+    # Only the target schools go to the crew, not the whole catalog
+    logger.info(f"Fetching school info from the college catalog")
+    progress("Loading school info")
+    try:
+        school_info = target_school_info(target_schools)
+    except Exception as e:
+        logger.error(f"Error fetching schools: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if not school_info:
+        raise HTTPException(status_code=404, detail=f"Schools not found")
+
+    # Get user profile from Firestore
+    progress("Loading student profile")
+    user_profile = get_user_profile(user_id)
+    if not user_profile:
+        raise HTTPException(status_code=404, detail=f"User profile {user_id} not found")
+
+    # Get student profile
+    student_profile = user_profile.get('studentProfile')
+    if not student_profile:
+        raise HTTPException(status_code=400, detail="Student profile is empty")
+
+    logger.info(f"Got student profile and school info, generating roadmap")
+
+    # Sanitize all Firebase data before passing to CrewAI
+    sanitized_student_profile = sanitize_firebase_data(student_profile)
+    sanitized_school_info = sanitize_firebase_data(school_info)
+
+    # Create inputs for the roadmap task with sanitized data
+    inputs = {
+        'user_id': user_id,
+        'target_schools': target_schools,
+        'school_info': sanitized_school_info,
+        'student_profile': sanitized_student_profile
+    }
+
+    # Create a new crew with only the roadmap generator agent and roadmap task
+    roadmap_crew = crew_factory.roadmap_crew()
+
+    # Run only the roadmap task
+    progress("Generating roadmap")
+    roadmap_result = crew_metrics.kickoff(roadmap_crew, "roadmap", inputs)
+
+    # Proper CrewOutput handling
+    if isinstance(roadmap_result, CrewOutput):
+        # Access the raw output correctly
+        roadmap_data_str = roadmap_result.raw
+
+        # Try parsing JSON if available
+        if roadmap_result.json_dict:
+            roadmap_data = roadmap_result.json_dict
+        else:
+            try:
+                roadmap_data = json.loads(roadmap_data_str)
+            except json.JSONDecodeError:
+                roadmap_data = {"error": "Failed to parse JSON output"}
+    else:
+        roadmap_data = roadmap_result
+
+    logger.info(f"Processed roadmap data: {roadmap_data}")
+
+    # Add detailed logging about the roadmap_data
+    logger.info(f"Type of roadmap_data: {type(roadmap_data)}")
+    logger.info(f"Keys in roadmap_data: {roadmap_data.keys() if isinstance(roadmap_data, dict) else 'Not a dict'}")
+
+    # Use the shared roadmap tool
+    roadmap_tool = crew_factory.roadmap_tool
+
+    # Save the roadmap to Firestore - use roadmap_data, not the original result
+    progress("Saving roadmap")
+    save_result = roadmap_tool.save_roadmap_to_firestore(user_id, roadmap_data)
+    logger.info(f"Roadmap saved to Firestore: {save_result}")
+
+    return {
+        "success": True,
+        "message": "Roadmap generated and saved successfully",
+        "data": roadmap_data
+    }
+
+job_manager.register("roadmap", run_roadmap_crew)
+
 @router.post("/roadmap")
 async def generate_roadmap(request: Request):
     """Generate a personalized roadmap for a student."""
     data = await request.json()
     try:
-        # Extract required data
-        user_id = data.get('userId')
-        target_schools = data.get('targetSchools', [])
-        
-        if not user_id or not target_schools:
-            raise HTTPException(status_code=400, detail="Missing userId or targetSchools")
-            
-        logger.info(f"Generating roadmap for user {user_id} targeting {target_schools}")
-        
-        # Get school data from Firestore if not provided
-        logger.info(f"Fetching school info from Firestore")
-        try:
-            school_info = await db_client.get_all_documents('US-Colleges')
-            if not school_info:
-                raise HTTPException(status_code=404, detail=f"Schools not found")
-        except Exception as e:
-            logger.error(f"Error fetching schools: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
-        
-        # Get user profile from Firestore
-        user_profile = await get_user_profile(user_id)
-        if not user_profile:
-            raise HTTPException(status_code=404, detail=f"User profile {user_id} not found")
-            
-        # Get student profile
-        student_profile = user_profile.get('studentProfile')
-        if not student_profile:
-            raise HTTPException(status_code=400, detail="Student profile is empty")
-            
-        logger.info(f"Got student profile and school info, generating roadmap")
-        
-        # Sanitize all Firebase data before passing to CrewAI
-        sanitized_student_profile = sanitize_firebase_data(student_profile)
-        sanitized_school_info = sanitize_firebase_data(school_info)
-        
-        # Create inputs for the roadmap task with sanitized data
-        inputs = {
-            'user_id': user_id,
-            'target_schools': target_schools,
-            'school_info': sanitized_school_info,
-            'student_profile': sanitized_student_profile
-        }
-        
-        # Initialize the LmsCrew to get access to the agents and tasks
-        lms_crew = LmsCrew()
-        
-        # Create a new crew with only the roadmap generator agent and roadmap task
-        roadmap_crew = Crew(
-            agents=[lms_crew.roadmap_generator()],
-            tasks=[lms_crew.roadmap_task()],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        # Run only the roadmap task
-        roadmap_result = roadmap_crew.kickoff(inputs=inputs)
-
-        # Proper CrewOutput handling
-        if isinstance(roadmap_result, CrewOutput):
-            # Access the raw output correctly
-            roadmap_data_str = roadmap_result.raw
-            
-            # Try parsing JSON if available
-            if roadmap_result.json_dict:
-                roadmap_data = roadmap_result.json_dict
-            else:
-                try:
-                    roadmap_data = json.loads(roadmap_data_str)
-                except json.JSONDecodeError:
-                    roadmap_data = {"error": "Failed to parse JSON output"}
-        else:
-            roadmap_data = roadmap_result
-        
-        logger.info(f"Processed roadmap data: {roadmap_data}")
-        
-        # Add detailed logging about the roadmap_data
-        logger.info(f"Type of roadmap_data: {type(roadmap_data)}")
-        logger.info(f"Keys in roadmap_data: {roadmap_data.keys() if isinstance(roadmap_data, dict) else 'Not a dict'}")
-        
-        # Initialize the roadmap tool
-        roadmap_tool = lms_crew.roadmap_tool
-        
-        # Save the roadmap to Firestore - use roadmap_data, not the original result
-        save_result = roadmap_tool.save_roadmap_to_firestore(user_id, roadmap_data)
-        logger.info(f"Roadmap saved to Firestore: {save_result}")
-        
-        return {
-            "success": True,
-            "message": "Roadmap generated and saved successfully",
-            "data": roadmap_data
-        }
+        # The crew runs on the job worker pool; this request just waits for it
+        return await job_manager.run("roadmap", data)
     except HTTPException:
         # Re-raise HTTP exceptions
         raise
     except Exception as e:
         logger.error(f"Error generating roadmap: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,181 @@
+import re
+import threading
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from db.catalog_cache import CollegeCatalog
+
+logger = logging.getLogger(__name__)
+
+# Dynamic margins based on selectivity
+MARGINS = {
+    'highly_selective': {'gpa': 0.2, 'sat': 50, 'act': 1},
+    'moderately_selective': {'gpa': 0.3, 'sat': 100, 'act': 2},
+    'less_selective': {'gpa': 0.5, 'sat': 150, 'act': 3},
+}
+
+# Selectivity buckets in the order used by the feature table's integer codes
+SELECTIVITY_BUCKETS = ('highly_selective', 'moderately_selective', 'less_selective')
+
+
+def parse_acceptance_rate(rate_str: str) -> Optional[float]:
+    """Parse an acceptance rate string such as '12%' into a fraction."""
+    if not rate_str:
+        return None
+    match = re.search(r"(\d+)", str(rate_str))
+    if match:
+        return float(match.group(1)) / 100
+    return None
+
+
+def get_selectivity_category(rate_str: str) -> str:
+    rate = parse_acceptance_rate(rate_str)
+    if rate is not None:
+        if rate < 0.15:
+            return 'highly_selective'
+        elif rate < 0.4:
+            return 'moderately_selective'
+    return 'less_selective'
+
+
+def parse_score_range(range_str) -> Tuple[float, float]:
+    """Parse a score range such as '1450-1560' into (low, high); NaN when it has no two numbers."""
+    if not range_str:
+        return np.nan, np.nan
+    match = re.findall(r"\d+", str(range_str))
+    if len(match) >= 2:
+        return float(match[0]), float(match[1])
+    return np.nan, np.nan
+
+
+def calculate_avg_gpa(gpa_dict: dict) -> float:
+    """Weighted average GPA from a {'3.75+': '40%', '3.50-3.74': '30%', ...} distribution."""
+    if not gpa_dict:
+        return 0.0
+
+    total_weight = 0
+    total_percentage = 0
+
+    for range_str, percent_str in gpa_dict.items():
+        if not range_str or not percent_str:
+            continue
+
+        try:
+            if '+' in range_str:
+                midpoint = float(range_str.replace('+', '')) + 0.1
+            else:
+                match = re.findall(r"\d+\.\d+", range_str)
+                if len(match) == 2:
+                    midpoint = (float(match[0]) + float(match[1])) / 2
+                else:
+                    continue
+        except:
+            continue
+
+        try:
+            if 'Less than 1' in percent_str:
+                percentage = 0.5
+            elif match := re.search(r"(\d+(\.\d+)?)%", percent_str):
+                percentage = float(match.group(1))
+            else:
+                continue
+        except:
+            continue
+
+        total_weight += midpoint * percentage
+        total_percentage += percentage
+
+    return round(total_weight / total_percentage, 2) if total_percentage else 0.0
+
+
+class AdmissionFeatureIndex:
+    """Column-oriented table of numeric admission features, one row per college.
+
+    Parsing the free-text GPA, SAT, ACT and acceptance-rate fields happens once when the
+    table is built, so matching a student profile is a handful of NumPy comparisons.
+    Missing values are stored as NaN, which never excludes a college.
+    """
+
+    def __init__(self, colleges: List[Dict[str, Any]]):
+        n = len(colleges)
+        self.names = np.empty(n, dtype=object)
+        self.avg_gpa = np.full(n, np.nan)
+        self.sat_low = np.full(n, np.nan)
+        self.sat_high = np.full(n, np.nan)
+        self.act_low = np.full(n, np.nan)
+        self.act_high = np.full(n, np.nan)
+        self.acceptance_rate = np.full(n, np.nan)
+        self.selectivity = np.full(n, SELECTIVITY_BUCKETS.index('less_selective'), dtype=np.int8)
+
+        for i, data in enumerate(colleges):
+            self.names[i] = data.get("University Name", "Unknown")
+
+            gpa_data = data.get("GPA")
+            if gpa_data:
+                self.avg_gpa[i] = calculate_avg_gpa(gpa_data)
+
+            acceptance_data = data.get("Acceptance Rate") or {}
+            rate_str = acceptance_data.get("Rate", "") if isinstance(acceptance_data, dict) else ""
+            rate = parse_acceptance_rate(rate_str)
+            if rate is not None:
+                self.acceptance_rate[i] = rate
+            self.selectivity[i] = SELECTIVITY_BUCKETS.index(get_selectivity_category(rate_str))
+
+            if isinstance(data.get("SAT"), dict):
+                self.sat_low[i], self.sat_high[i] = parse_score_range(data["SAT"].get("Total"))
+            self.act_low[i], self.act_high[i] = parse_score_range(data.get("ACT"))
+
+        # Per-row margins, looked up once from the selectivity bucket
+        self.gpa_margin = np.array([MARGINS[b]['gpa'] for b in SELECTIVITY_BUCKETS])[self.selectivity]
+        self.sat_margin = np.array([MARGINS[b]['sat'] for b in SELECTIVITY_BUCKETS])[self.selectivity]
+        self.act_margin = np.array([MARGINS[b]['act'] for b in SELECTIVITY_BUCKETS])[self.selectivity]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @staticmethod
+    def _in_range(score: float, low: np.ndarray, high: np.ndarray, margin: np.ndarray) -> np.ndarray:
+        # Rows without a parseable range count as a match, like the original per-document check
+        return np.isnan(low) | (((low - margin) <= score) & (score <= (high + 2 * margin)))
+
+    def match(self, gpa: Optional[float], sat_total: Optional[int], act: Optional[int]) -> np.ndarray:
+        """Boolean mask of colleges that are a reasonable match for the student's scores."""
+        n = len(self.names)
+
+        if gpa is not None:
+            gpa_ok = ~(float(gpa) < (self.avg_gpa - self.gpa_margin))
+        else:
+            gpa_ok = np.ones(n, dtype=bool)
+
+        sat_ok = self._in_range(float(sat_total), self.sat_low, self.sat_high, self.sat_margin) if sat_total else np.ones(n, dtype=bool)
+        act_ok = self._in_range(float(act), self.act_low, self.act_high, self.act_margin) if act else np.ones(n, dtype=bool)
+
+        # A failed SAT check is only forgiven when an ACT score is provided and matches
+        return gpa_ok & (sat_ok | bool(act)) & (sat_ok | act_ok)
+
+    def filter(self, gpa: Optional[float], sat_total: Optional[int], act: Optional[int]) -> List[str]:
+        """Names of the colleges that are a reasonable match, in catalog order."""
+        return self.names[self.match(gpa, sat_total, act)].tolist()
+
+
+_index_lock = threading.Lock()
+_index: Optional[AdmissionFeatureIndex] = None
+_index_version: Optional[str] = None
+
+
+def get_admission_index() -> AdmissionFeatureIndex:
+    """Feature table for the current college catalog, rebuilt only when the catalog version changes."""
+    global _index, _index_version
+
+    version, colleges = CollegeCatalog().snapshot()
+    if _index is not None and _index_version == version:
+        return _index
+
+    with _index_lock:
+        if _index is None or _index_version != version:
+            _index = AdmissionFeatureIndex(colleges)
+            _index_version = version
+            logger.info(f"Built admission feature index for {len(_index)} colleges (catalog version {_index_version})")
+    return _index
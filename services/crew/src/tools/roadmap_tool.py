@@ -12,6 +12,7 @@ from google.protobuf.timestamp_pb2 import Timestamp
 
 # Add the project root to the Python path to import shared modules
 from db.firestore_client import FirestoreClient
+from db.catalog_cache import CollegeCatalog
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -19,6 +20,7 @@ logger = logging.getLogger(__name__)
 
 # Initialize Firestore client
 db_client = FirestoreClient()
+college_catalog = CollegeCatalog()
 
 def sanitize_firebase_data(data):
     """
@@ -73,23 +75,23 @@ class FirestoreRoadmapTool(BaseTool):
             student_profile = sanitize_firebase_data(student_profile)
 
             if not school_info:
-                logger.info(f"No school info provided, fetching from Firestore")
+                logger.info(f"No school info provided, reading from the college catalog")
                 try:
-                    school_docs = db_client.get_all_documents_sync('US-Colleges')
+                    # Look up just the target schools instead of copying the whole catalog
+                    school_docs = [college_catalog.get_by_name(name) for name in target_schools]
+                    school_docs = [s for s in school_docs if s]
                 except Exception as e:
                     logger.error(f"Error fetching schools: {e}")
                     return f"Error fetching schools: {str(e)}"
             else:
-                school_docs = school_info
+                school_docs = [s for s in school_info if s.get("University Name") in target_schools]
 
-            school_docs = sanitize_firebase_data(school_docs)
-            
             # Return the prepared data for the agent to use
             prepared_data = {
                 "user_id": user_id,
                 "target_schools": target_schools,
                 "student_profile": student_profile,
-                "school_info": [s for s in school_docs if s.get("University Name") in target_schools]
+                "school_info": sanitize_firebase_data(school_docs)
             }
             
             return f"Data prepared successfully for roadmap generation: {json.dumps(prepared_data, default=str)}"
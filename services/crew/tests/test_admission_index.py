@@ -0,0 +1,125 @@
+import random
+import re
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("firebase_admin")
+
+from src.tools.admission_index import AdmissionFeatureIndex, MARGINS, calculate_avg_gpa, get_selectivity_category
+
+
+def baseline_filter(colleges, gpa, sat_total, act):
+    """The per-document filter FirestoreAllCollegesTool ran before the feature index, minus Firestore."""
+
+    def is_reasonable_match(student_score, range_str, margin):
+        if not range_str or not student_score:
+            return True
+        match = re.findall(r"\d+", range_str)
+        if len(match) >= 2:
+            low, high = map(int, match[:2])
+            return (low - margin) <= student_score <= (high + 2 * margin)
+        return True
+
+    qualified = []
+    for data in colleges:
+        gpa_data = data.get("GPA")
+        avg_gpa = calculate_avg_gpa(gpa_data) if gpa_data else None
+        margins = MARGINS[get_selectivity_category(data.get("Acceptance Rate", {}).get("Rate", ""))]
+
+        if avg_gpa is not None and gpa is not None and float(gpa) < (float(avg_gpa) - margins['gpa']):
+            continue
+
+        sat_ok = True
+        if sat_total and "SAT" in data and isinstance(data["SAT"], dict):
+            sat_ok = is_reasonable_match(sat_total, data["SAT"].get("Total"), margin=margins['sat'])
+        if not sat_ok and not act:
+            continue
+
+        act_ok = True
+        act_range = data.get("ACT")
+        if act and act_range:
+            act_ok = is_reasonable_match(act, act_range, margin=margins['act'])
+        if not act_ok and not sat_ok:
+            continue
+
+        qualified.append(data.get("University Name", "Unknown"))
+    return qualified
+
+
+def make_college(rng, i):
+    college = {"University Name": f"College {i}", "Acceptance Rate": {}}
+    if rng.random() < 0.9:
+        college["Acceptance Rate"]["Rate"] = rng.choice([f"{rng.randint(3, 95)}%", "Less than 1%", "N/A", ""])
+    if rng.random() < 0.85:
+        college["GPA"] = {
+            "3.75+": f"{rng.randint(0, 80)}%",
+            "3.50-3.74": rng.choice([f"{rng.randint(0, 40)}%", "Less than 1%"]),
+            "3.25-3.49": f"{rng.randint(0, 30)}.{rng.randint(0, 9)}%",
+            "below 3.0": "5%",
+        }
+    if rng.random() < 0.8:
+        low = rng.randint(900, 1450)
+        college["SAT"] = {"Total": rng.choice([f"{low}-{low + rng.randint(50, 200)}", "Not reported", ""])}
+    if rng.random() < 0.8:
+        low = rng.randint(17, 32)
+        college["ACT"] = rng.choice([f"{low}-{low + rng.randint(1, 4)}", "N/A", ""])
+    return college
+
+
+def make_colleges(count, seed=3):
+    rng = random.Random(seed)
+    return [make_college(rng, i) for i in range(count)]
+
+
+def make_profiles(count, seed=5):
+    rng = random.Random(seed)
+    return [
+        (
+            round(rng.uniform(2.5, 4.0), 2),
+            rng.choice([None, 0, rng.randint(900, 1600)]),
+            rng.choice([None, 0, rng.randint(15, 36)]),
+        )
+        for _ in range(count)
+    ]
+
+
+def test_index_matches_the_baseline_filter():
+    colleges = make_colleges(1000)
+    index = AdmissionFeatureIndex(colleges)
+
+    for gpa, sat_total, act in make_profiles(100):
+        assert index.filter(gpa, sat_total, act) == baseline_filter(colleges, gpa, sat_total, act), (gpa, sat_total, act)
+
+
+def test_colleges_without_data_always_match():
+    colleges = [{"University Name": "Unknown data", "Acceptance Rate": {}}]
+
+    assert AdmissionFeatureIndex(colleges).filter(2.0, 400, 1) == ["Unknown data"]
+
+
+@pytest.mark.benchmark
+def test_benchmark_10k_colleges():
+    colleges = make_colleges(10_000)
+    profiles = make_profiles(20)
+
+    started = time.perf_counter()
+    for profile in profiles:
+        baseline_filter(colleges, *profile)
+    baseline = (time.perf_counter() - started) / len(profiles)
+
+    started = time.perf_counter()
+    index = AdmissionFeatureIndex(colleges)
+    build = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for profile in profiles:
+        index.filter(*profile)
+    indexed = (time.perf_counter() - started) / len(profiles)
+
+    print(
+        f"\n10k colleges: per-document filter {baseline * 1000:.1f} ms, "
+        f"index build {build * 1000:.0f} ms once per catalog version, indexed filter {indexed * 1000:.2f} ms"
+    )
+    assert indexed < baseline / 10
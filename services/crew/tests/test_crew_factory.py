@@ -0,0 +1,91 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip("crewai")
+try:
+    from src import crew
+except Exception as e:
+    # The college tool initializes Firebase when it is imported and needs credentials for it
+    pytest.skip(f"crew module unavailable: {e}", allow_module_level=True)
+
+import yaml
+
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    (tmp_path / "agents.yaml").write_text("advisor:\n  role: Advisor\n")
+    monkeypatch.setattr(crew, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(crew, "_config_cache", {})
+    return tmp_path
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    calls = []
+    safe_load = yaml.safe_load
+
+    def counting_safe_load(stream):
+        calls.append(stream.name)
+        return safe_load(stream)
+
+    monkeypatch.setattr(crew.yaml, "safe_load", counting_safe_load)
+    return calls
+
+
+def test_config_is_parsed_once(config_dir, parses):
+    assert crew.load_config("agents.yaml") == {"advisor": {"role": "Advisor"}}
+    crew.load_config("agents.yaml")
+
+    assert len(parses) == 1
+
+
+def test_config_is_reloaded_when_the_file_changes(config_dir, parses):
+    crew.load_config("agents.yaml")
+    path = config_dir / "agents.yaml"
+    path.write_text("advisor:\n  role: Counselor\n")
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+    assert crew.load_config("agents.yaml")["advisor"]["role"] == "Counselor"
+    assert len(parses) == 2
+
+
+def test_callers_get_their_own_copy(config_dir):
+    crew.load_config("agents.yaml")["advisor"]["role"] = "Changed"
+
+    assert crew.load_config("agents.yaml")["advisor"]["role"] == "Advisor"
+
+
+def test_factory_and_tools_are_shared():
+    factory = crew.get_crew_factory()
+
+    assert crew.get_crew_factory() is factory
+    assert crew.LmsCrew().firestore_tool is factory.firestore_tool
+
+
+@pytest.mark.benchmark
+def test_benchmark_per_request_setup(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY", "benchmark"))
+    runs = 20
+
+    def per_request_setup():
+        # What each request paid before: parse both YAML files and build every tool again
+        crew._config_cache.clear()
+        return crew.CrewFactory().roadmap_crew()
+
+    started = time.perf_counter()
+    for _ in range(runs):
+        per_request_setup()
+    before = (time.perf_counter() - started) / runs
+
+    factory = crew.get_crew_factory()
+    factory.roadmap_crew()
+    started = time.perf_counter()
+    for _ in range(runs):
+        factory.roadmap_crew()
+    after = (time.perf_counter() - started) / runs
+
+    print(f"\nRoadmap crew setup per request: {before * 1000:.1f} ms rebuilt, {after * 1000:.1f} ms from the factory")
+    assert after < before
@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("fastapi")
+
+from src.jobs.store import JobStore, InMemoryJobStore, SQLiteJobStore, QUEUED, RUNNING, SUCCEEDED, FAILED
+
+
+def job(job_id, status=QUEUED):
+    return {"id": job_id, "status": status, "message": status.capitalize()}
+
+
+def test_job_store_is_abstract():
+    with pytest.raises(TypeError):
+        JobStore()
+
+
+def test_in_memory_store_evicts_only_finished_jobs():
+    store = InMemoryJobStore(max_jobs=2)
+    store.create(job("running", RUNNING))
+    store.create(job("done", SUCCEEDED))
+    store.create(job("queued"))
+
+    assert store.get("running") is not None
+    assert store.get("done") is None
+    assert store.get("queued") is not None
+
+    # Nothing finished left to drop: active jobs stay even past the limit
+    store.create(job("also-queued"))
+    assert all(store.get(job_id) for job_id in ("running", "queued", "also-queued"))
+
+
+def test_sqlite_store_fails_unfinished_jobs_on_reopen(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = SQLiteJobStore(path)
+    store.create(job("queued"))
+    store.create(job("running", RUNNING))
+    store.create(job("done", SUCCEEDED))
+
+    reopened = SQLiteJobStore(path)
+
+    assert reopened.get("queued")["status"] == FAILED
+    assert reopened.get("running")["status"] == FAILED
+    assert reopened.get("done")["status"] == SUCCEEDED
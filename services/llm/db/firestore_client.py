@@ -11,6 +11,10 @@ from google.cloud.firestore_v1.transforms import Sentinel
 from google.cloud.firestore_v1.field_path import FieldPath
 import os
 import base64
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from google.api_core.exceptions import NotFound, AlreadyExists
 
 
 def replace_sentinel_strings(obj):
@@ -28,6 +32,49 @@ def replace_sentinel_strings(obj):
 
 logger = logging.getLogger(__name__)
 
+# The firebase_admin Firestore client is synchronous. Every async method below hands
+# its round-trip to this bounded pool so a slow read never stalls the event loop.
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('FIRESTORE_MAX_WORKERS', '16')),
+    thread_name_prefix='firestore',
+)
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking Firestore call on the shared executor and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+# Reverse index of targetSchools/{targetId} to its parent student, so targets can be
+# addressed by path instead of through a collection group query
+TARGET_SCHOOL_INDEX_COLLECTION = 'targetSchoolIndex'
+
+# Map on the user document tracking background roadmap generation, and its states
+ROADMAP_STATUS_FIELD = 'roadmapStatus'
+ROADMAP_PENDING = 'pending'
+ROADMAP_RUNNING = 'running'
+ROADMAP_DONE = 'done'
+ROADMAP_FAILED = 'failed'
+
+
+def pending_roadmap_status() -> Dict[str, Any]:
+    """roadmapStatus for a newly requested roadmap; the previous run's fields are cleared explicitly."""
+    return {
+        'status': ROADMAP_PENDING,
+        'requestedAt': firestore.SERVER_TIMESTAMP,
+        'jobId': None,
+        'message': None,
+        'startedAt': None,
+        'finishedAt': None,
+        'durationSeconds': None,
+        'error': None,
+    }
+
+# Fields of a US-Colleges document shown alongside a student's target schools
+SCHOOL_SUMMARY_FIELDS = ['schoolName', 'schoolType', 'city', 'state', 'acceptanceRate']
+
+
 class FirestoreClient:
     _instance = None
 
@@ -76,6 +123,9 @@ class FirestoreClient:
 
     async def create_user(self, user_data: Dict[str, Any]) -> str:
         """Create a new user in the users collection."""
+        return await run_blocking(self._create_user, user_data)
+
+    def _create_user(self, user_data: Dict[str, Any]) -> str:
         try:
             user_ref = self.db.collection('users').document(user_data['uid'])
             user_ref.set({
@@ -97,103 +147,28 @@ class FirestoreClient:
 
     async def update_user_profile(self, user_id: str, profile_data: Dict[str, Any]) -> None:
         """Update a user profile in Firestore."""
+        return await run_blocking(self.update_user_profile_sync, user_id, profile_data)
+
+    async def update_roadmap_status(self, user_id: str, status: Optional[str] = None, **fields: Any) -> None:
+        """Update fields of a user's roadmapStatus (and its status, when given)."""
+        return await run_blocking(self.update_roadmap_status_sync, user_id, status, **fields)
+
+    def update_roadmap_status_sync(self, user_id: str, status: Optional[str] = None, **fields: Any) -> None:
+        """Synchronous version of update_roadmap_status; other roadmapStatus fields are left as they are."""
+        updates = {f"{ROADMAP_STATUS_FIELD}.{key}": value for key, value in fields.items()}
+        if status is not None:
+            updates[f"{ROADMAP_STATUS_FIELD}.status"] = status
         try:
-            logger.info(f"Updating user profile for {user_id}")
-            
-            # Get a reference to the user document
-            user_ref = self.db.collection('users').document(user_id)
-            
-            # Check if the document exists
-            user_doc = user_ref.get()
-            if not user_doc.exists:
-                logger.warning(f"User document {user_id} does not exist, creating it")
-                # Create the document with the provided data
-                user_ref.set(profile_data)
-                return
-            
-            # If the document exists, update it based on the structure of profile_data
-            if 'studentProfile' in profile_data:
-                logger.info("Found studentProfile in profile_data, using nested structure")
-                
-                # Use the provided studentProfile structure directly
-                # Process the data to handle Sentinel strings before updating
-                sanitized_profile_data = replace_sentinel_strings(profile_data)
-                
-                # For nested structures, we need to update field by field to handle SERVER_TIMESTAMP correctly
-                for key, value in sanitized_profile_data.items():
-                    # Handle nested dictionaries separately to avoid Sentinel serialization issues
-                    if isinstance(value, dict):
-                        for nested_key, nested_value in value.items():
-                            field_path = f"{key}.{nested_key}"
-                            user_ref.update({field_path: nested_value})
-                    else:
-                        user_ref.update({key: value})
-                
-                logger.info("Updated user document with provided studentProfile structure")
-            elif 'tasks' in profile_data:
-                # This is a task update, preserve the existing studentProfile
-                logger.info("Found tasks in profile_data, updating tasks")
-                
-                # Extract tasks and other top-level fields
-                tasks = profile_data.pop('tasks', [])
-                
-                # First update all non-task fields
-                if profile_data:
-                    sanitized_data = {}
-                    for key, value in profile_data.items():
-                        if isinstance(value, str) and "Sentinel" in value:
-                            sanitized_data[key] = firestore.SERVER_TIMESTAMP
-                        else:
-                            sanitized_data[key] = value
-                    
-                    if sanitized_data:
-                        user_ref.update(sanitized_data)
-                        logger.info(f"Updated non-task fields: {list(sanitized_data.keys())}")
-                
-                # Then update tasks separately
-                if tasks:
-                    # Instead of trying to sanitize the existing tasks, create a completely new array
-                    # with clean values to avoid any Sentinel serialization issues
-                    clean_tasks = []
-                    
-                    for task in tasks:
-                        # Create a new task dictionary with clean values
-                        clean_task = {}
-                        for k, v in task.items():
-                            # Special handling for timestamp fields
-                            if k in ['createdAt', 'updatedAt']:
-                                # Always use a fresh SERVER_TIMESTAMP for these fields
-                                clean_task[k] = firestore.SERVER_TIMESTAMP
-                            else:
-                                # Copy other fields as is
-                                clean_task[k] = v
-                        
-                        clean_tasks.append(clean_task)
-                    
-                    # Update tasks field with completely clean tasks
-                    logger.info(f"Updating tasks array with {len(clean_tasks)} clean tasks")
-                    
-                    # Use a direct update without any further processing
-                    user_ref.update({"tasks": clean_tasks})
-                    logger.info(f"Successfully updated tasks array")
-                
-                logger.info("Updated user document with tasks and other fields")
-            else:
-                # This is a simple update, just update the fields provided
-                logger.info("Simple update, updating fields directly")
-                
-                # Process the data to handle Sentinel strings before updating
-                sanitized_data = replace_sentinel_strings(profile_data)
-                user_ref.update(sanitized_data)
-                
-                logger.info(f"Updated user document with fields: {list(sanitized_data.keys())}")
+            self.db.collection('users').document(user_id).update(updates)
         except Exception as e:
-            logger.error(f"Error updating user profile: {e}")
-            logger.error(f"Error details: {traceback.format_exc()}")
+            logger.error(f"Error updating roadmap status for {user_id}: {e}")
             raise
 
     async def create_task(self, user_id: str, task_data: Dict[str, Any]) -> str:
         """Create a new task in the tasks collection."""
+        return await run_blocking(self._create_task, user_id, task_data)
+
+    def _create_task(self, user_id: str, task_data: Dict[str, Any]) -> str:
         try:
             # Create task document
             task_ref = self.db.collection('tasks').document()
@@ -220,6 +195,9 @@ class FirestoreClient:
 
     async def get_user_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get a user's profile by ID."""
+        return await run_blocking(self._get_user_profile, user_id)
+
+    def _get_user_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
         try:
             user_ref = self.db.collection('users').document(user_id)
             user = user_ref.get()
@@ -233,18 +211,11 @@ class FirestoreClient:
             logger.error(f"Error getting user profile: {e}")
             raise
 
-    async def get_all_documents(self, collection: str) -> List[Dict[str, Any]]:
-        """Get all documents from a Firestore collection, including document IDs."""
-        try:
-            docs = self.db.collection(collection).stream()
-            return [{**doc.to_dict(), "doc_id": doc.id} for doc in docs if doc.exists]
-        except Exception as e:
-            logger.error(f"Error getting documents from {collection}: {e}")
-            raise
-
-
     async def get_all_documents(self, collection: str) -> List[Dict[str, Any]]:
         """Get all documents from a Firestore collection."""
+        return await run_blocking(self._get_all_documents, collection)
+
+    def _get_all_documents(self, collection: str) -> List[Dict[str, Any]]:
         try:
             docs = self.db.collection(collection).stream()
             return [doc.to_dict() for doc in docs if doc.exists]
@@ -255,14 +226,8 @@ class FirestoreClient:
 
     async def update_document(self, collection: str, doc_id: str, data: Dict[str, Any]) -> None:
         """Update a document in any collection."""
-        try:
-            doc_ref = self.db.collection(collection).document(doc_id)
-            doc_ref.update(data)
-            logger.info(f"Successfully updated document {doc_id} in {collection}")
-        except Exception as e:
-            logger.error(f"Error updating document in {collection}: {e}")
-            raise
-            
+        return await run_blocking(self.update_document_sync, collection, doc_id, data)
+
     def update_document_sync(self, collection: str, doc_id: str, data: Dict[str, Any]) -> None:
         """Synchronous version of update_document."""
         try:
@@ -275,6 +240,9 @@ class FirestoreClient:
 
     async def get_tasks(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all tasks for a user."""
+        return await run_blocking(self._get_tasks, user_id)
+
+    def _get_tasks(self, user_id: str) -> List[Dict[str, Any]]:
         try:
             tasks = []
             tasks_ref = self.db.collection('tasks').where('userId', '==', user_id)
@@ -292,6 +260,9 @@ class FirestoreClient:
 
     async def update_task(self, task_id: str, task_data: Dict[str, Any]) -> None:
         """Update a task document."""
+        return await run_blocking(self._update_task, task_id, task_data)
+
+    def _update_task(self, task_id: str, task_data: Dict[str, Any]) -> None:
         try:
             task_ref = self.db.collection('tasks').document(task_id)
             task_data['updatedAt'] = firestore.SERVER_TIMESTAMP
@@ -304,6 +275,9 @@ class FirestoreClient:
     # Add this method to your FirestoreClient class
     async def create_or_update_google_user(self, user_data: Dict[str, Any]) -> str:
         """Create or update a user from Google authentication data."""
+        return await run_blocking(self._create_or_update_google_user, user_data)
+
+    def _create_or_update_google_user(self, user_data: Dict[str, Any]) -> str:
         try:
             user_id = user_data['uid']
             user_ref = self.db.collection('users').document(user_id)
@@ -345,6 +319,9 @@ class FirestoreClient:
     # Student-related methods
     async def get_student(self, student_id: str) -> Optional[Dict[str, Any]]:
         """Get a student profile by ID."""
+        return await run_blocking(self._get_student, student_id)
+
+    def _get_student(self, student_id: str) -> Optional[Dict[str, Any]]:
         try:
             student_ref = self.db.collection('students').document(student_id)
             student = student_ref.get()
@@ -360,6 +337,9 @@ class FirestoreClient:
 
     async def update_student_profile(self, student_id: str, data: Dict[str, Any]) -> None:
         """Update a student profile."""
+        return await run_blocking(self._update_student_profile, student_id, data)
+
+    def _update_student_profile(self, student_id: str, data: Dict[str, Any]) -> None:
         try:
             student_ref = self.db.collection('students').document(student_id)
             
@@ -374,6 +354,9 @@ class FirestoreClient:
 
     async def get_all_students(self) -> List[Dict[str, Any]]:
         """Get all students (for admin purposes)."""
+        return await run_blocking(self._get_all_students)
+
+    def _get_all_students(self) -> List[Dict[str, Any]]:
         try:
             students = []
             students_ref = self.db.collection('students')
@@ -391,6 +374,9 @@ class FirestoreClient:
 
     async def get_student_interests(self, student_id: str) -> List[Dict[str, Any]]:
         """Get interests for a student."""
+        return await run_blocking(self._get_student_interests, student_id)
+
+    def _get_student_interests(self, student_id: str) -> List[Dict[str, Any]]:
         try:
             interests = []
             interests_ref = self.db.collection('students').document(student_id).collection('interests')
@@ -408,6 +394,9 @@ class FirestoreClient:
 
     async def add_or_update_student_interest(self, student_id: str, interest_data: Dict[str, Any]) -> str:
         """Add or update a student interest."""
+        return await run_blocking(self._add_or_update_student_interest, student_id, interest_data)
+
+    def _add_or_update_student_interest(self, student_id: str, interest_data: Dict[str, Any]) -> str:
         try:
             # Check if interest already exists
             interests_ref = self.db.collection('students').document(student_id).collection('interests')
@@ -444,6 +433,9 @@ class FirestoreClient:
 
     async def remove_student_interest(self, student_id: str, interest_id: str) -> bool:
         """Remove a student interest."""
+        return await run_blocking(self._remove_student_interest, student_id, interest_id)
+
+    def _remove_student_interest(self, student_id: str, interest_id: str) -> bool:
         try:
             interest_ref = self.db.collection('students').document(student_id).collection('interests').document(interest_id)
             interest = interest_ref.get()
@@ -462,6 +454,9 @@ class FirestoreClient:
     # School-related methods
     async def get_all_schools(self) -> List[Dict[str, Any]]:
         """Get all schools."""
+        return await run_blocking(self._get_all_schools)
+
+    def _get_all_schools(self) -> List[Dict[str, Any]]:
         try:
             schools = []
             schools_ref = self.db.collection('US-Colleges')
@@ -479,6 +474,9 @@ class FirestoreClient:
 
     async def get_school(self, school_id: str) -> Optional[Dict[str, Any]]:
         """Get a school by ID."""
+        return await run_blocking(self._get_school, school_id)
+
+    def _get_school(self, school_id: str) -> Optional[Dict[str, Any]]:
         try:
             school_ref = self.db.collection('US-Colleges').document(school_id)
             school = school_ref.get()
@@ -494,6 +492,9 @@ class FirestoreClient:
 
     async def get_college_by_name(self, school_name: str) -> Optional[Dict[str, Any]]:
         """Get a college by name."""
+        return await run_blocking(self._get_college_by_name, school_name)
+
+    def _get_college_by_name(self, school_name: str) -> Optional[Dict[str, Any]]:
         try:
             # Query for school with matching name
             # query = self.db.collection('US-Colleges').where('schoolName', '==', school_name)
@@ -516,6 +517,9 @@ class FirestoreClient:
 
     async def get_school_programs(self, school_id: str) -> List[Dict[str, Any]]:
         """Get programs for a school."""
+        return await run_blocking(self._get_school_programs, school_id)
+
+    def _get_school_programs(self, school_id: str) -> List[Dict[str, Any]]:
         try:
             programs = []
             programs_ref = self.db.collection('US-Colleges').document(school_id).collection('programs')
@@ -533,6 +537,9 @@ class FirestoreClient:
 
     async def get_school_activities(self, school_id: str) -> List[Dict[str, Any]]:
         """Get activities for a school."""
+        return await run_blocking(self._get_school_activities, school_id)
+
+    def _get_school_activities(self, school_id: str) -> List[Dict[str, Any]]:
         try:
             activities = []
             activities_ref = self.db.collection('US-Colleges').document(school_id).collection('activities')
@@ -550,6 +557,9 @@ class FirestoreClient:
 
     async def get_school_test_requirements(self, school_id: str) -> List[Dict[str, Any]]:
         """Get test requirements for a school."""
+        return await run_blocking(self._get_school_test_requirements, school_id)
+
+    def _get_school_test_requirements(self, school_id: str) -> List[Dict[str, Any]]:
         try:
             requirements = []
             requirements_ref = self.db.collection('US-Colleges').document(school_id).collection('testRequirements')
@@ -567,6 +577,9 @@ class FirestoreClient:
 
     async def get_student_target_schools(self, student_id: str) -> List[Dict[str, Any]]:
         """Get target schools for a student."""
+        return await run_blocking(self._get_student_target_schools, student_id)
+
+    def _get_student_target_schools(self, student_id: str) -> List[Dict[str, Any]]:
         try:
             target_schools = []
             target_schools_ref = self.db.collection('students').document(student_id).collection('targetSchools')
@@ -575,28 +588,58 @@ class FirestoreClient:
             for doc in target_school_docs:
                 target_school_data = doc.to_dict()
                 target_school_data['id'] = doc.id
-                
-                # Get school details
-                if 'schoolId' in target_school_data:
-                    school = await self.get_school(target_school_data['schoolId'])
-                    if school:
-                        target_school_data['schoolName'] = school.get('schoolName', '')
-                        target_school_data['schoolType'] = school.get('schoolType', '')
-                        target_school_data['location'] = {
-                            'city': school.get('city', ''),
-                            'state': school.get('state', '')
-                        }
-                        target_school_data['acceptanceRate'] = school.get('acceptanceRate', '')
-                
                 target_schools.append(target_school_data)
             
+            # Resolve all school details at once rather than one get() per target
+            school_ids = {t['schoolId'] for t in target_schools if t.get('schoolId')}
+            schools = self._get_schools_summary(school_ids)
+            
+            for target_school_data in target_schools:
+                school = schools.get(target_school_data.get('schoolId'))
+                if school:
+                    target_school_data['schoolName'] = school.get('schoolName', '')
+                    target_school_data['schoolType'] = school.get('schoolType', '')
+                    target_school_data['location'] = {
+                        'city': school.get('city', ''),
+                        'state': school.get('state', '')
+                    }
+                    target_school_data['acceptanceRate'] = school.get('acceptanceRate', '')
+            
             return target_schools
         except Exception as e:
             logger.error(f"Error getting student target schools: {e}")
             raise
 
+    def _get_schools_summary(self, school_ids) -> Dict[str, Dict[str, Any]]:
+        """Get the summary fields of several schools, from the college catalog cache when it is loaded
+        and otherwise with a single batched get_all() limited to those fields."""
+        from .catalog_cache import CollegeCatalog
+
+        catalog = CollegeCatalog()
+        schools = {}
+        missing = []
+        for school_id in school_ids:
+            school = catalog.peek(school_id)
+            if school is not None:
+                schools[school_id] = school
+            else:
+                missing.append(school_id)
+        
+        if missing:
+            refs = [self.db.collection('US-Colleges').document(school_id) for school_id in missing]
+            for school in self.db.get_all(refs, field_paths=SCHOOL_SUMMARY_FIELDS):
+                if school.exists:
+                    schools[school.id] = school.to_dict()
+                else:
+                    logger.warning(f"School not found for ID: {school.id}")
+        
+        return schools
+
     async def add_target_school(self, student_id: str, school_id: str, data: Dict[str, Any]) -> str:
         """Add a target school for a student."""
+        return await run_blocking(self._add_target_school, student_id, school_id, data)
+
+    def _add_target_school(self, student_id: str, school_id: str, data: Dict[str, Any]) -> str:
         try:
             target_school_ref = self.db.collection('students').document(student_id).collection('targetSchools').document()
             
@@ -605,57 +648,130 @@ class FirestoreClient:
             data['createdAt'] = firestore.SERVER_TIMESTAMP
             data['updatedAt'] = firestore.SERVER_TIMESTAMP
             
-            target_school_ref.set(data)
+            # Write the target and its reverse index entry together
+            batch = self.db.batch()
+            batch.set(target_school_ref, data)
+            batch.set(self.db.collection(TARGET_SCHOOL_INDEX_COLLECTION).document(target_school_ref.id), {
+                'studentId': student_id,
+                'schoolId': school_id
+            })
+            batch.commit()
             logger.info(f"Added target school {school_id} for student {student_id}")
             return target_school_ref.id
         except Exception as e:
             logger.error(f"Error adding target school: {e}")
             raise
 
-    async def update_target_school(self, target_id: str, data: Dict[str, Any]) -> bool:
+    def _find_target_school_ref(self, target_id: str, student_id: Optional[str] = None):
+        """Resolve a target school's document reference.
+
+        Uses the student id when the caller knows it, then the targetSchoolIndex entry, and only
+        falls back to a collection group query for targets added before the index existed.
+        """
+        if not student_id:
+            index_doc = self.db.collection(TARGET_SCHOOL_INDEX_COLLECTION).document(target_id).get()
+            if index_doc.exists:
+                student_id = index_doc.to_dict().get('studentId')
+        
+        if student_id:
+            return self.db.collection('students').document(student_id).collection('targetSchools').document(target_id)
+        
+        logger.warning(f"Target school {target_id} is not indexed, falling back to a collection group query")
+        query = self.db.collection_group('targetSchools').where(firestore.field_path.FieldPath.document_id(), '==', target_id)
+        target_schools = list(query.stream())
+        return target_schools[0].reference if target_schools else None
+
+    async def update_target_school(self, target_id: str, data: Dict[str, Any], student_id: Optional[str] = None) -> bool:
         """Update a target school."""
+        return await run_blocking(self._update_target_school, target_id, data, student_id)
+
+    def _update_target_school(self, target_id: str, data: Dict[str, Any], student_id: Optional[str] = None) -> bool:
         try:
             # Find the target school document
-            query = self.db.collection_group('targetSchools').where(firestore.field_path.FieldPath.document_id(), '==', target_id)
-            target_schools = list(query.stream())
+            target_school_ref = self._find_target_school_ref(target_id, student_id)
             
-            if not target_schools:
+            if target_school_ref is None:
                 logger.warning(f"Target school {target_id} not found")
                 return False
             
             # Add updated timestamp
             data['updatedAt'] = firestore.SERVER_TIMESTAMP
             
-            # Update the document
-            target_schools[0].reference.update(data)
+            # Update the document; update() fails with NotFound if it does not exist
+            try:
+                target_school_ref.update(data)
+            except NotFound:
+                logger.warning(f"Target school {target_id} not found")
+                return False
             logger.info(f"Updated target school {target_id}")
             return True
         except Exception as e:
             logger.error(f"Error updating target school: {e}")
             raise
 
-    async def remove_target_school(self, target_id: str) -> bool:
+    async def remove_target_school(self, target_id: str, student_id: Optional[str] = None) -> bool:
         """Remove a target school."""
+        return await run_blocking(self._remove_target_school, target_id, student_id)
+
+    def _remove_target_school(self, target_id: str, student_id: Optional[str] = None) -> bool:
         try:
             # Find the target school document
-            query = self.db.collection_group('targetSchools').where(firestore.field_path.FieldPath.document_id(), '==', target_id)
-            target_schools = list(query.stream())
+            target_school_ref = self._find_target_school_ref(target_id, student_id)
             
-            if not target_schools:
+            if target_school_ref is None:
                 logger.warning(f"Target school {target_id} not found")
                 return False
             
-            # Delete the document
-            target_schools[0].reference.delete()
+            # Delete the document and its index entry; the exists precondition reports missing targets
+            batch = self.db.batch()
+            batch.delete(target_school_ref, option=self.db.write_option(exists=True))
+            batch.delete(self.db.collection(TARGET_SCHOOL_INDEX_COLLECTION).document(target_id))
+            try:
+                batch.commit()
+            except NotFound:
+                logger.warning(f"Target school {target_id} not found")
+                return False
             logger.info(f"Removed target school {target_id}")
             return True
         except Exception as e:
             logger.error(f"Error removing target school: {e}")
             raise
 
+    def backfill_target_school_index(self, batch_size: int = 400) -> int:
+        """Write a targetSchoolIndex entry for every existing target school. Safe to re-run."""
+        try:
+            count = 0
+            batch = self.db.batch()
+            pending = 0
+            for doc in self.db.collection_group('targetSchools').stream():
+                # students/{studentId}/targetSchools/{targetId}
+                student_ref = doc.reference.parent.parent
+                if student_ref is None or student_ref.parent.id != 'students':
+                    continue
+                batch.set(self.db.collection(TARGET_SCHOOL_INDEX_COLLECTION).document(doc.id), {
+                    'studentId': student_ref.id,
+                    'schoolId': (doc.to_dict() or {}).get('schoolId')
+                })
+                pending += 1
+                count += 1
+                if pending >= batch_size:
+                    batch.commit()
+                    batch = self.db.batch()
+                    pending = 0
+            if pending:
+                batch.commit()
+            logger.info(f"Backfilled {count} target school index entries")
+            return count
+        except Exception as e:
+            logger.error(f"Error backfilling target school index: {e}")
+            raise
+
     # Create student method
     async def create_student(self, student_data: Dict[str, Any], user_id: str = None) -> str:
         """Create a new student profile."""
+        return await run_blocking(self._create_student, student_data, user_id)
+
+    def _create_student(self, student_data: Dict[str, Any], user_id: str = None) -> str:
         try:
             student_ref = self.db.collection('students').document()
             
@@ -713,22 +829,18 @@ class FirestoreClient:
             raise
 
     def update_user_profile_sync(self, user_id: str, profile_data: Dict[str, Any]) -> None:
-        """Update a user profile in Firestore (synchronous version)."""
+        """Update a user profile in Firestore (synchronous version).
+
+        All fields go out in a single update() call; a missing document is created with set(),
+        or with create() when profile_data holds no field to update.
+        """
         try:
             logger.info(f"Updating user profile for {user_id} (sync)")
             
             # Get a reference to the user document
             user_ref = self.db.collection('users').document(user_id)
             
-            # Check if the document exists
-            user_doc = user_ref.get()
-            if not user_doc.exists:
-                logger.warning(f"User document {user_id} does not exist, creating it")
-                # Create the document with the provided data
-                user_ref.set(profile_data)
-                return
-            
-            # If the document exists, update it based on the structure of profile_data
+            # Build every field change up front based on the structure of profile_data
             if 'studentProfile' in profile_data:
                 logger.info("Found studentProfile in profile_data, using nested structure")
                 
@@ -736,38 +848,29 @@ class FirestoreClient:
                 # Process the data to handle Sentinel strings before updating
                 sanitized_profile_data = replace_sentinel_strings(profile_data)
                 
-                # For nested structures, we need to update field by field to handle SERVER_TIMESTAMP correctly
+                # Nested dictionaries are written as dotted field paths so sibling fields are
+                # preserved and SERVER_TIMESTAMP values are handled correctly
+                updates = {}
                 for key, value in sanitized_profile_data.items():
-                    # Handle nested dictionaries separately to avoid Sentinel serialization issues
                     if isinstance(value, dict):
                         for nested_key, nested_value in value.items():
-                            field_path = f"{key}.{nested_key}"
-                            user_ref.update({field_path: nested_value})
+                            updates[f"{key}.{nested_key}"] = nested_value
                     else:
-                        user_ref.update({key: value})
-                
-                logger.info("Updated user document with provided studentProfile structure")
+                        updates[key] = value
             elif 'tasks' in profile_data:
                 # This is a task update, preserve the existing studentProfile
                 logger.info("Found tasks in profile_data, updating tasks")
                 
-                # Extract tasks and other top-level fields
-                tasks = profile_data.pop('tasks', [])
-                
-                # First update all non-task fields
-                if profile_data:
-                    sanitized_data = {}
-                    for key, value in profile_data.items():
-                        if isinstance(value, str) and "Sentinel" in value:
-                            sanitized_data[key] = firestore.SERVER_TIMESTAMP
-                        else:
-                            sanitized_data[key] = value
-                    
-                    if sanitized_data:
-                        user_ref.update(sanitized_data)
-                        logger.info(f"Updated non-task fields: {list(sanitized_data.keys())}")
+                updates = {}
+                for key, value in profile_data.items():
+                    if key == 'tasks':
+                        continue
+                    if isinstance(value, str) and "Sentinel" in value:
+                        updates[key] = firestore.SERVER_TIMESTAMP
+                    else:
+                        updates[key] = value
                 
-                # Then update tasks separately
+                tasks = profile_data.get('tasks', [])
                 if tasks:
                     # Instead of trying to sanitize the existing tasks, create a completely new array
                     # with clean values to avoid any Sentinel serialization issues
@@ -787,23 +890,31 @@ class FirestoreClient:
                         
                         clean_tasks.append(clean_task)
                     
-                    # Update tasks field with completely clean tasks
                     logger.info(f"Updating tasks array with {len(clean_tasks)} clean tasks")
-                    
-                    # Use a direct update without any further processing
-                    user_ref.update({"tasks": clean_tasks})
-                    logger.info(f"Successfully updated tasks array")
-                
-                logger.info("Updated user document with tasks and other fields")
+                    updates["tasks"] = clean_tasks
             else:
                 # This is a simple update, just update the fields provided
                 logger.info("Simple update, updating fields directly")
                 
                 # Process the data to handle Sentinel strings before updating
-                sanitized_data = replace_sentinel_strings(profile_data)
-                user_ref.update(sanitized_data)
-                
-                logger.info(f"Updated user document with fields: {list(sanitized_data.keys())}")
+                updates = replace_sentinel_strings(profile_data)
+            
+            if not updates:
+                # Nothing to change on an existing document, but a missing one is still created
+                try:
+                    user_ref.create(profile_data)
+                    logger.warning(f"User document {user_id} did not exist, created it")
+                except AlreadyExists:
+                    pass
+                return
+            
+            try:
+                user_ref.update(updates)
+                logger.info(f"Updated user document with fields: {list(updates.keys())}")
+            except NotFound:
+                logger.warning(f"User document {user_id} does not exist, creating it")
+                # Create the document with the provided data
+                user_ref.set(profile_data)
         except Exception as e:
             logger.error(f"Error updating user profile: {e}")
             logger.error(f"Error details: {traceback.format_exc()}")
@@ -0,0 +1,146 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+logger = logging.getLogger('main')
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Strip per-line indentation and blank lines so formatting-only differences share a key."""
+    return "\n".join(line.strip() for line in prompt.strip().splitlines() if line.strip())
+
+
+class CompletionCache:
+    """Content-addressed cache of LLM completions.
+
+    Entries are keyed on a SHA-256 of the normalized prompt, model and temperature. A bounded
+    in-memory LRU sits in front of an optional SQLite file; both tiers expire entries after
+    ``ttl_seconds``. The SQLite connection has a lock of its own, so a slow disk read or commit
+    on a worker thread never holds up a memory hit on the event loop.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 86400, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        # Guards the in-memory LRU and the counters
+        self._lock = threading.Lock()
+        # Serializes use of the SQLite connection across worker threads
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS completions (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+            self._purge_expired()
+
+    @classmethod
+    def from_env(cls) -> Optional["CompletionCache"]:
+        """Build the cache from LLM_CACHE_* environment variables, or None when disabled."""
+        if os.getenv("LLM_CACHE_ENABLED", "true").lower() not in ("1", "true", "yes"):
+            return None
+        return cls(
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "256")),
+            ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400")),
+            db_path=os.getenv("LLM_CACHE_DB_PATH") or None,
+        )
+
+    @staticmethod
+    def make_key(prompt: str, model: str, temperature: float, response_format: Optional[Dict[str, Any]] = None) -> str:
+        key_parts = [model, temperature, normalize_prompt(prompt)]
+        if response_format:
+            key_parts.append(response_format)
+        payload = json.dumps(key_parts, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._memory[key]
+
+        if self._db is not None:
+            value = await asyncio.to_thread(self._disk_get, key, now)
+            if value is not None:
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                self._remember(key, value[1], value[0])
+                return value[1]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, value, expires_at)
+        if self._db is not None:
+            await asyncio.to_thread(self._disk_set, key, value, expires_at)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "diskHits": self.disk_hits,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "memoryEntries": len(self._memory),
+            "maxEntries": self.max_entries,
+            "ttlSeconds": self.ttl_seconds,
+            "diskEnabled": self._db is not None,
+        }
+
+    def _remember(self, key: str, value: str, expires_at: float) -> None:
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT expires_at, value FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] <= now:
+                self._db.execute("DELETE FROM completions WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            return row[0], row[1]
+
+    def _disk_set(self, key: str, value: str, expires_at: float) -> None:
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO completions (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+            self._db.commit()
+
+    def _purge_expired(self) -> None:
+        with self._db_lock:
+            deleted = self._db.execute("DELETE FROM completions WHERE expires_at <= ?", (time.time(),)).rowcount
+            self._db.commit()
+        if deleted:
+            logger.info(f"[CACHE] Purged {deleted} expired completions from {self.db_path}")
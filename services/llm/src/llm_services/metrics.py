@@ -0,0 +1,136 @@
+import threading
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, Tuple
+
+# Counters kept for every (route, model) pair that calls the LLM
+_EMPTY_MODEL_STATS = {
+    "calls": 0,
+    "cacheHits": 0,
+    "promptTokens": 0,
+    "completionTokens": 0,
+    "totalTokens": 0,
+    "latencySeconds": 0.0,
+}
+
+# Usage of the HTTP request being handled in the current context; the access logger starts a
+# fresh one per request and prints it, every LLM call made while serving the request adds to it
+_request_usage: ContextVar[Optional[Dict[str, Any]]] = ContextVar("llm_request_usage", default=None)
+
+
+def start_request_usage():
+    """Begin collecting LLM usage for the current request; returns the token to reset it with."""
+    return _request_usage.set({"calls": 0, "promptTokens": 0, "completionTokens": 0, "latencySeconds": 0.0})
+
+
+def reset_request_usage(token) -> None:
+    _request_usage.reset(token)
+
+
+def current_request_usage() -> Optional[Dict[str, Any]]:
+    return _request_usage.get()
+
+
+def _label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{name}="{_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+class LLMMetrics:
+    """Process-wide LLM call accounting: calls, cache hits, tokens and latency per route and model,
+    plus output validation failures per route."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._validation_failures: Dict[str, int] = {}
+
+    def record_completion(
+        self,
+        route: str,
+        usage: Optional[Dict[str, Any]] = None,
+        cached: bool = False,
+        latency_seconds: float = 0.0,
+        model: str = "unknown"
+    ) -> None:
+        usage = usage or {}
+        prompt_tokens = usage.get("prompt_tokens", 0) or 0
+        completion_tokens = usage.get("completion_tokens", 0) or 0
+        with self._lock:
+            stats = self._models.setdefault((route, model), dict(_EMPTY_MODEL_STATS))
+            stats["calls"] += 1
+            if cached:
+                stats["cacheHits"] += 1
+            stats["promptTokens"] += prompt_tokens
+            stats["completionTokens"] += completion_tokens
+            stats["totalTokens"] += usage.get("total_tokens", 0) or 0
+            stats["latencySeconds"] += latency_seconds
+
+        request_usage = _request_usage.get()
+        if request_usage is not None:
+            request_usage["calls"] += 1
+            request_usage["promptTokens"] += prompt_tokens
+            request_usage["completionTokens"] += completion_tokens
+            request_usage["latencySeconds"] += latency_seconds
+
+    def record_validation_failure(self, route: str) -> None:
+        with self._lock:
+            self._validation_failures[route] = self._validation_failures.get(route, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            snapshot: Dict[str, Dict[str, Any]] = {}
+            for (route, model), stats in self._models.items():
+                route_stats = snapshot.setdefault(route, {"calls": 0, "validationFailures": 0, "models": {}})
+                route_stats["calls"] += stats["calls"]
+                route_stats["models"][model] = dict(stats)
+            for route, failures in self._validation_failures.items():
+                route_stats = snapshot.setdefault(route, {"calls": 0, "validationFailures": 0, "models": {}})
+                route_stats["validationFailures"] = failures
+            for route_stats in snapshot.values():
+                calls = route_stats["calls"]
+                # Share of calls whose output had to be rejected, i.e. would need a retry
+                route_stats["validationFailureRate"] = route_stats["validationFailures"] / calls if calls else 0.0
+            return snapshot
+
+    def render_prometheus(self) -> str:
+        """The counters in Prometheus text exposition format."""
+        with self._lock:
+            models = {key: dict(stats) for key, stats in self._models.items()}
+            failures = dict(self._validation_failures)
+
+        lines = [
+            "# HELP llm_calls_total LLM completions requested, including cache hits.",
+            "# TYPE llm_calls_total counter",
+        ]
+        lines += [f"llm_calls_total{_labels(route=r, model=m)} {s['calls']}" for (r, m), s in models.items()]
+        lines += [
+            "# HELP llm_cache_hits_total LLM completions answered from the completion cache.",
+            "# TYPE llm_cache_hits_total counter",
+        ]
+        lines += [f"llm_cache_hits_total{_labels(route=r, model=m)} {s['cacheHits']}" for (r, m), s in models.items()]
+        lines += [
+            "# HELP llm_tokens_total Tokens billed by the LLM provider.",
+            "# TYPE llm_tokens_total counter",
+        ]
+        for (r, m), s in models.items():
+            lines.append(f"llm_tokens_total{_labels(route=r, model=m, type='prompt')} {s['promptTokens']}")
+            lines.append(f"llm_tokens_total{_labels(route=r, model=m, type='completion')} {s['completionTokens']}")
+        lines += [
+            "# HELP llm_request_latency_seconds Time spent waiting for LLM completions.",
+            "# TYPE llm_request_latency_seconds summary",
+        ]
+        for (r, m), s in models.items():
+            lines.append(f"llm_request_latency_seconds_sum{_labels(route=r, model=m)} {s['latencySeconds']:.6f}")
+            lines.append(f"llm_request_latency_seconds_count{_labels(route=r, model=m)} {s['calls'] - s['cacheHits']}")
+        lines += [
+            "# HELP llm_validation_failures_total LLM outputs rejected by validation.",
+            "# TYPE llm_validation_failures_total counter",
+        ]
+        lines += [f"llm_validation_failures_total{_labels(route=r)} {n}" for r, n in failures.items()]
+        return "\n".join(lines) + "\n"
+
+
+llm_metrics = LLMMetrics()
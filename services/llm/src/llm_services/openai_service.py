@@ -1,10 +1,16 @@
 import os
+import time
 import logging
 import json
-import requests
+from typing import Optional, AsyncIterator, Callable, Dict, Any
+import httpx
 from fastapi import HTTPException
 from dotenv import load_dotenv
 
+from .completion_cache import CompletionCache
+from .metrics import llm_metrics
+from utils.request_deadline import remaining_seconds, timeout_for
+
 logger = logging.getLogger('main')
 
 # Load environment variables
@@ -24,35 +30,127 @@ else:
     logger.info("[STARTUP] OpenAI API key found")
     logger.info(f"[STARTUP] Key preview: {openai_api_key[:4]}...{openai_api_key[-4:]}")
 
+OPENAI_CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+
+# Connection pool settings for the shared OpenAI client
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "10"))
+OPENAI_READ_TIMEOUT = float(os.getenv("OPENAI_READ_TIMEOUT", "180"))
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+
+OPENAI_MODEL = "gpt-4o"
+OPENAI_TEMPERATURE = 0.7
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Shared response cache; None when LLM_CACHE_ENABLED is off
+completion_cache = CompletionCache.from_env()
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the process-wide pooled HTTP/2 client used for OpenAI calls, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(OPENAI_READ_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=OPENAI_MAX_CONNECTIONS,
+                keepalive_expiry=60.0
+            ),
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {openai_api_key}"
+            }
+        )
+    return _http_client
+
+async def close_http_client() -> None:
+    """Close the shared OpenAI client; called on application shutdown."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+def build_payload(prompt: str, stream: bool = False, response_format: Optional[Dict[str, Any]] = None) -> dict:
+    """Chat completions request body for a single user prompt."""
+    payload = {
+        "model": OPENAI_MODEL,
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a college admissions expert. Generate detailed and specific responses in the exact format requested."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "temperature": OPENAI_TEMPERATURE,
+        "max_tokens": 16380
+    }
+    if response_format:
+        payload["response_format"] = response_format
+    if stream:
+        payload["stream"] = True
+        # Ask for a final chunk carrying token usage
+        payload["stream_options"] = {"include_usage": True}
+    return payload
+
+def check_deadline() -> None:
+    """Do not start a completion the caller can no longer wait for."""
+    remaining = remaining_seconds()
+    if remaining is not None and remaining <= 0:
+        raise HTTPException(status_code=504, detail="Request deadline exceeded before calling OpenAI")
+
+def request_timeout() -> httpx.Timeout:
+    """Timeouts of one OpenAI call, clamped so it never outlives the current request's deadline."""
+    return httpx.Timeout(timeout_for(OPENAI_READ_TIMEOUT), connect=timeout_for(OPENAI_CONNECT_TIMEOUT))
+
+def is_cacheable(content: str, finish_reason: Optional[str], validate: Optional[Callable[[str], Any]]) -> bool:
+    """Only complete completions the caller accepts are cached; a truncated or invalid one would
+    otherwise be replayed on every retry until it expires."""
+    if finish_reason != "stop":
+        logger.warning(f"[CACHE] Not caching completion with finish_reason={finish_reason}")
+        return False
+    if validate is not None:
+        try:
+            validate(content)
+        except ValueError as e:
+            logger.warning(f"[CACHE] Not caching completion that failed validation: {str(e)}")
+            return False
+    return True
+
 # Direct API call function to avoid client initialization issues
-async def get_completion(prompt: str) -> str:
-    """Get completion from OpenAI API using direct HTTP request."""
+async def get_completion(
+    prompt: str,
+    use_cache: bool = True,
+    response_format: Optional[Dict[str, Any]] = None,
+    route: str = "default",
+    validate: Optional[Callable[[str], Any]] = None
+) -> str:
+    """Get completion from OpenAI API over the shared pooled HTTP client.
+
+    Identical prompts are answered from the completion cache unless use_cache is False. A
+    completion is only cached when it finished normally and, if given, validate (raising
+    ValueError for output the caller would reject) accepts it; it is returned either way.
+    response_format is passed through to OpenAI, e.g. a JSON schema for structured output.
+    Calls and token usage are counted under `route` in llm_metrics.
+    """
+    cache_key = None
+    if use_cache and completion_cache is not None:
+        cache_key = completion_cache.make_key(prompt, OPENAI_MODEL, OPENAI_TEMPERATURE, response_format)
+        cached = await completion_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"[CACHE] Completion cache hit {cache_key[:12]}")
+            llm_metrics.record_completion(route, cached=True, model=OPENAI_MODEL)
+            return cached
+
+    check_deadline()
+
+    started = time.perf_counter()
     try:
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {openai_api_key}"
-        }
-        
-        payload = {
-            "model": "gpt-4o",
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "You are a college admissions expert. Generate detailed and specific responses in the exact format requested."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "temperature": 0.7,
-            "max_tokens": 16380
-        }
-        
-        response = requests.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers=headers,
-            json=payload
+        response = await get_http_client().post(
+            OPENAI_CHAT_COMPLETIONS_URL, json=build_payload(prompt, response_format=response_format), timeout=request_timeout()
         )
         
         if response.status_code != 200:
@@ -63,11 +161,97 @@ async def get_completion(prompt: str) -> str:
             )
             
         result = response.json()
-        return result["choices"][0]["message"]["content"]
+        choice = result["choices"][0]
+        content = choice["message"]["content"]
+        llm_metrics.record_completion(
+            route, result.get("usage"), latency_seconds=time.perf_counter() - started, model=result.get("model", OPENAI_MODEL)
+        )
+        if cache_key is not None and is_cacheable(content, choice.get("finish_reason"), validate):
+            await completion_cache.set(cache_key, content)
+        return content
         
+    except httpx.TimeoutException as e:
+        logger.error(f"OpenAI request timed out: {e}")
+        raise HTTPException(
+            status_code=504,
+            detail="Timed out waiting for OpenAI"
+        )
     except Exception as e:
         logger.error(f"Error getting completion: {e}")
         raise HTTPException(
             status_code=500,
             detail=f"Error generating response: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+async def stream_completion(
+    prompt: str,
+    use_cache: bool = True,
+    response_format: Optional[Dict[str, Any]] = None,
+    route: str = "default",
+    validate: Optional[Callable[[str], Any]] = None
+) -> AsyncIterator[str]:
+    """Stream a completion from OpenAI as content deltas, using the chat completions stream mode.
+
+    A cached completion is yielded in one piece; a streamed one is cached once it has finished,
+    under the same conditions as in get_completion.
+    """
+    cache_key = None
+    if use_cache and completion_cache is not None:
+        cache_key = completion_cache.make_key(prompt, OPENAI_MODEL, OPENAI_TEMPERATURE, response_format)
+        cached = await completion_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"[CACHE] Completion cache hit {cache_key[:12]}")
+            llm_metrics.record_completion(route, cached=True, model=OPENAI_MODEL)
+            yield cached
+            return
+
+    check_deadline()
+
+    parts = []
+    usage = None
+    finish_reason = None
+    model = OPENAI_MODEL
+    started = time.perf_counter()
+    try:
+        async with get_http_client().stream(
+            "POST",
+            OPENAI_CHAT_COMPLETIONS_URL,
+            json=build_payload(prompt, stream=True, response_format=response_format),
+            timeout=request_timeout()
+        ) as response:
+            if response.status_code != 200:
+                error_text = (await response.aread()).decode("utf-8", errors="replace")
+                logger.error(f"Error from OpenAI API: {error_text}")
+                raise HTTPException(
+                    status_code=response.status_code,
+                    detail=f"Error from OpenAI API: {error_text}"
+                )
+
+            # Server-sent events: one "data: {json}" line per chunk, ending with "data: [DONE]"
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                usage = chunk.get("usage") or usage
+                model = chunk.get("model", model)
+                choices = chunk.get("choices") or []
+                if choices:
+                    finish_reason = choices[0].get("finish_reason") or finish_reason
+                delta = choices[0].get("delta", {}).get("content") if choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+    except httpx.TimeoutException as e:
+        logger.error(f"OpenAI stream timed out: {e}")
+        raise HTTPException(
+            status_code=504,
+            detail="Timed out waiting for OpenAI"
+        )
+
+    llm_metrics.record_completion(route, usage, latency_seconds=time.perf_counter() - started, model=model)
+    content = "".join(parts)
+    if cache_key is not None and is_cacheable(content, finish_reason, validate):
+        await completion_cache.set(cache_key, content)
@@ -0,0 +1,37 @@
+from typing import Any, Dict, Type
+from pydantic import BaseModel
+
+
+def _strict(node: Any) -> Any:
+    """Adapt a JSON schema node to OpenAI's strict mode: closed objects, every property required, no titles."""
+    if isinstance(node, list):
+        return [_strict(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    strict = {}
+    for key, value in node.items():
+        if key == "title":
+            continue
+        if key in ("properties", "$defs"):
+            # Keys of these maps are field and definition names, not schema keywords
+            strict[key] = {name: _strict(sub) for name, sub in value.items()}
+        else:
+            strict[key] = _strict(value)
+
+    if strict.get("type") == "object":
+        strict["additionalProperties"] = False
+        strict["required"] = list(strict.get("properties", {}))
+    return strict
+
+
+def json_schema_response_format(name: str, model: Type[BaseModel]) -> Dict[str, Any]:
+    """Chat completions `response_format` that makes the model return JSON matching a Pydantic model."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "schema": _strict(model.model_json_schema()),
+            "strict": True,
+        },
+    }
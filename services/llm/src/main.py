@@ -2,6 +2,7 @@ import logging
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from dotenv import load_dotenv
 from pathlib import Path
 import sys
@@ -32,15 +33,19 @@ except ModuleNotFoundError:
         from middleware.timeout import TimeoutMiddleware
     except ModuleNotFoundError:
         # If all else fails, create dummy middleware
-        from fastapi import Request
-        
         class RequestLoggingMiddleware:
-            async def __call__(self, request: Request, call_next):
-                return await call_next(request)
+            def __init__(self, app):
+                self.app = app
+
+            async def __call__(self, scope, receive, send):
+                await self.app(scope, receive, send)
                 
         class TimeoutMiddleware:
-            async def __call__(self, request: Request, call_next):
-                return await call_next(request)
+            def __init__(self, app):
+                self.app = app
+
+            async def __call__(self, scope, receive, send):
+                await self.app(scope, receive, send)
         
         logging.warning("Could not import middleware modules, using dummy middleware instead")
 
@@ -60,6 +65,10 @@ except ModuleNotFoundError:
         logging.warning("Could not import auth_router, using a dummy router instead")
 
 from routes.roadmap import router as roadmap_router
+from db.catalog_cache import CollegeCatalog
+from http_responses import FirestoreJSONResponse, CompressionMiddleware
+from llm_services.openai_service import get_http_client, close_http_client, completion_cache
+from llm_services.metrics import llm_metrics
 
 # Configure logging
 logging.basicConfig(
@@ -73,7 +82,41 @@ logger.info("[STARTUP] Loading environment variables...")
 load_dotenv()
 
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(default_response_class=FirestoreJSONResponse)
+
+@app.on_event("startup")
+async def warm_college_catalog():
+    """Load the US-Colleges snapshot before the first roadmap request needs it."""
+    try:
+        await CollegeCatalog().ensure_loaded()
+    except Exception as e:
+        logger.error(f"[STARTUP] Could not preload college catalog: {e}")
+
+@app.on_event("startup")
+async def open_openai_client():
+    """Open the pooled OpenAI client so the first roadmap request skips client setup."""
+    get_http_client()
+
+@app.on_event("shutdown")
+async def close_openai_client():
+    await close_http_client()
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit and miss counters of the LLM completion cache."""
+    if completion_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **completion_cache.stats()}
+
+@app.get("/llm/stats")
+async def llm_stats():
+    """Per-route LLM call, validation failure, token usage and latency counters."""
+    return llm_metrics.snapshot()
+
+@app.get("/metrics")
+async def metrics():
+    """LLM usage counters in Prometheus text format."""
+    return PlainTextResponse(llm_metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
 
 # Include routers
 app.include_router(auth_router)
@@ -89,9 +132,11 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
-# Add middleware
-app.add_middleware(RequestLoggingMiddleware)
+# Add middleware; the access logger is added last so it wraps the timeout and logs its 504s.
+# Compression is innermost and skips the NDJSON /stream route so tasks still arrive one by one.
+app.add_middleware(CompressionMiddleware)
 app.add_middleware(TimeoutMiddleware)
+app.add_middleware(RequestLoggingMiddleware)
 
 if __name__ == "__main__":
     import uvicorn
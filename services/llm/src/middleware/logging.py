@@ -1,64 +1,90 @@
-import json
+import os
+import time
+import uuid
+import random
 import logging
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+
+from llm_services.metrics import start_request_usage, reset_request_usage, current_request_usage
 
 logger = logging.getLogger('main')
 
+# Request bodies are only logged when sampled in, and then only their first bytes
+LOG_BODY_SAMPLE_RATE = float(os.getenv('REQUEST_LOG_BODY_SAMPLE_RATE', '0'))
+LOG_BODY_MAX_BYTES = int(os.getenv('REQUEST_LOG_BODY_MAX_BYTES', '2048'))
+
+REQUEST_ID_HEADER = b'x-request-id'
+
+
+class RequestLoggingMiddleware:
+    """Pure ASGI access logger writing one line per request.
+
+    The request id is taken from the X-Request-ID header (or generated), stored on
+    ``request.state.request_id`` and echoed on the response. LLM calls made while serving
+    the request are summed into the line (calls, tokens, time waiting on the LLM). Neither
+    the request nor the response body is buffered; a sampled, size-capped prefix of the
+    request body is logged only when REQUEST_LOG_BODY_SAMPLE_RATE is above zero.
+    """
+
+    def __init__(self, app, body_sample_rate: float = LOG_BODY_SAMPLE_RATE, body_max_bytes: int = LOG_BODY_MAX_BYTES):
+        self.app = app
+        self.body_sample_rate = body_sample_rate
+        self.body_max_bytes = body_max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        request_id = None
+        for name, value in scope.get('headers', []):
+            if name == REQUEST_ID_HEADER:
+                request_id = value.decode('latin-1')
+                break
+        if not request_id:
+            request_id = uuid.uuid4().hex
+        scope.setdefault('state', {})['request_id'] = request_id
+
+        status_code = 500
+        body = bytearray()
+        capture_body = self.body_sample_rate > 0 and random.random() < self.body_sample_rate
+
+        async def receive_with_capture():
+            message = await receive()
+            if message['type'] == 'http.request':
+                remaining = self.body_max_bytes - len(body)
+                if remaining > 0:
+                    body.extend(message.get('body', b'')[:remaining])
+            return message
 
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                message['headers'] = list(message.get('headers', [])) + [(REQUEST_ID_HEADER, request_id.encode('latin-1'))]
+            await send(message)
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # Log request details
-        logger.info(f"[MIDDLEWARE] Received request: {request.method} {request.url.path}")
-        logger.info(f"[MIDDLEWARE] Full URL: {request.url}")
-        logger.info(f"[MIDDLEWARE] Headers: {dict(request.headers)}")
-        
-        # Log available routes
-        routes = []
-        for route in request.app.routes:
-            routes.append({
-                "path": route.path,
-                "name": route.name,
-                "methods": list(route.methods) if route.methods else []
-            })
-        logger.info(f"[MIDDLEWARE] Available routes: {json.dumps(routes, indent=2)}")
-        
+        usage_token = start_request_usage()
         try:
-            body = await request.body()
-            if body:
-                try:
-                    # Try to parse and pretty print JSON
-                    json_body = json.loads(body)
-                    logger.info(f"[MIDDLEWARE] Request body: {json.dumps(json_body, indent=2)}")
-                except json.JSONDecodeError:
-                    logger.info(f"[MIDDLEWARE] Request body (raw): {body.decode()}")
+            await self.app(scope, receive_with_capture if capture_body else receive, send_with_request_id)
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            line = (
+                f"[ACCESS] method={scope['method']} path={scope['path']} status={status_code} "
+                f"latency_ms={latency_ms:.1f} request_id={request_id}"
+            )
+            usage = current_request_usage()
+            reset_request_usage(usage_token)
+            if usage and usage["calls"]:
+                line += (
+                    f" llm_calls={usage['calls']} prompt_tokens={usage['promptTokens']} "
+                    f"completion_tokens={usage['completionTokens']} llm_ms={usage['latencySeconds'] * 1000:.1f}"
+                )
+            if capture_body:
+                line += f" body={bytes(body).decode('utf-8', errors='replace')!r}"
+            if status_code >= 500:
+                logger.error(line)
+            elif status_code >= 400:
+                logger.warning(line)
             else:
-                logger.info("[MIDDLEWARE] Request body: None")
-        except Exception as e:
-            logger.error(f"[MIDDLEWARE] Error reading body: {str(e)}")
-        
-        # Log if route is not found
-        if request.url.path not in [route.path for route in request.app.routes]:
-            logger.warning(f"[DEBUG] Unhandled request to path: {request.url.path}")
-            logger.warning(f"[DEBUG] Full URL: {request.url}")
-            logger.warning(f"[DEBUG] Method: {request.method}")
-            logger.warning(f"[DEBUG] Headers: {dict(request.headers)}")
-            if body:
-                try:
-                    json_body = json.loads(body)
-                    logger.warning(f"[DEBUG] Body: {json.dumps(json_body, indent=2)}")
-                except:
-                    logger.warning(f"[DEBUG] Body (raw): {body.decode()}")
-        
-        response = await call_next(request)
-        logger.info(f"[MIDDLEWARE] Response status: {response.status_code}")
-        if response.status_code >= 400:
-            logger.error(f"[MIDDLEWARE] Error response: {response.status_code}")
-            try:
-                response_body = [chunk async for chunk in response.body_iterator]
-                logger.error(f"[MIDDLEWARE] Response body: {response_body}")
-            except:
-                logger.error("[MIDDLEWARE] Could not read response body")
-        
-        return response
\ No newline at end of file
+                logger.info(line)
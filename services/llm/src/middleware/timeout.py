@@ -1,28 +1,92 @@
+import os
+import json
 import asyncio
 import logging
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 
-
+from utils.request_deadline import DEADLINE_HEADER, parse_deadline_header, set_deadline, reset_deadline
 
 logger = logging.getLogger('main')
 
-# Timeout middleware
-class TimeoutMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+# Budget for routes without a more specific entry below; the same 200s every route had before
+DEFAULT_REQUEST_TIMEOUT = float(os.getenv('REQUEST_TIMEOUT_SECONDS', '200'))
+# Roadmap generation waits on a long LLM completion; as long as the api service waits for it
+ROADMAP_REQUEST_TIMEOUT = float(os.getenv('ROADMAP_REQUEST_TIMEOUT_SECONDS', '300'))
+
+# Per-route budgets in seconds, matched by path prefix
+ROUTE_TIMEOUTS = {
+    "/health": 5.0,
+    "/cache/stats": 5.0,
+    "/generate-roadmap-from-db": ROADMAP_REQUEST_TIMEOUT,
+}
+
+_DEADLINE_HEADER_KEY = DEADLINE_HEADER.lower().encode('latin-1')
+TIMEOUT_DETAIL = "Request timeout. Please try again."
+NDJSON_MEDIA_TYPE = b'application/x-ndjson'
+
+
+class TimeoutMiddleware:
+    """Pure ASGI deadline middleware.
+
+    Each request gets its route's budget, shortened by an X-Request-Deadline header when the
+    caller sends one. The deadline is published through utils.request_deadline so downstream
+    calls can clamp their own timeouts. When it passes, the handler task is cancelled and, if
+    no response has started yet, a 504 is returned. An NDJSON stream that has already started
+    is ended with a {"type": "error"} line instead, so clients can tell it from a finished one.
+    """
+
+    def __init__(self, app, default_timeout: float = DEFAULT_REQUEST_TIMEOUT, route_timeouts: dict = None):
+        self.app = app
+        self.default_timeout = default_timeout
+        # Longest prefix first so more specific routes win
+        self.route_timeouts = sorted((route_timeouts or ROUTE_TIMEOUTS).items(), key=lambda item: len(item[0]), reverse=True)
+
+    def budget_for(self, path: str) -> float:
+        for prefix, timeout in self.route_timeouts:
+            if path.startswith(prefix):
+                return timeout
+        return self.default_timeout
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        timeout = self.budget_for(scope['path'])
+        for name, value in scope.get('headers', []):
+            if name == _DEADLINE_HEADER_KEY:
+                remaining = parse_deadline_header(value.decode('latin-1'))
+                if remaining is not None:
+                    timeout = max(0.0, min(timeout, remaining))
+                break
+
+        response_started = False
+        response_finished = False
+        ndjson = False
+
+        async def send_tracking_start(message):
+            nonlocal response_started, response_finished, ndjson
+            if message['type'] == 'http.response.start':
+                response_started = True
+                content_type = dict(message.get('headers', [])).get(b'content-type', b'')
+                ndjson = content_type.startswith(NDJSON_MEDIA_TYPE)
+            elif message['type'] == 'http.response.body' and not message.get('more_body', False):
+                response_finished = True
+            await send(message)
+
+        token = set_deadline(timeout)
         try:
-            # Increase timeout to 200 seconds for long-running operations
-            return await asyncio.wait_for(call_next(request), timeout=200.0)
+            await asyncio.wait_for(self.app(scope, receive, send_tracking_start), timeout=timeout)
         except asyncio.TimeoutError:
-            logger.error(f"Request timeout: {request.url.path}")
-            return JSONResponse(
-                status_code=504,
-                content={"detail": "Request timeout. Please try again."}
-            )
-        except Exception as e:
-            logger.error(f"Error processing request: {str(e)}")
-            return JSONResponse(
-                status_code=500,
-                content={"detail": str(e)}
-            )
\ No newline at end of file
+            logger.error(f"Request timeout after {timeout:.1f}s: {scope['path']}")
+            if not response_started:
+                response = JSONResponse(
+                    status_code=504,
+                    content={"detail": TIMEOUT_DETAIL}
+                )
+                await response(scope, receive, send)
+            elif ndjson and not response_finished:
+                line = json.dumps({"type": "error", "detail": TIMEOUT_DETAIL}) + "\n"
+                await send({'type': 'http.response.body', 'body': line.encode('utf-8'), 'more_body': False})
+        finally:
+            reset_deadline(token)
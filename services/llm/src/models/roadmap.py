@@ -1,5 +1,5 @@
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 class Task(BaseModel):
     title: str
@@ -19,4 +19,20 @@ class Timeline(BaseModel):
 class Roadmap(BaseModel):
     milestones: List[Milestone]
     recommendations: List[str]
-    timeline: Optional[Timeline] = None
\ No newline at end of file
+    timeline: Optional[Timeline] = None
+
+class RoadmapTask(BaseModel):
+    """A task of an LLM-generated roadmap, as stored on the user document."""
+    # Keep any extra keys the model adds (e.g. an id) on the stored task
+    model_config = ConfigDict(extra='allow')
+
+    title: str
+    description: str
+    dueDate: str
+    category: str
+    priority: str
+    school: str
+
+class RoadmapResponse(BaseModel):
+    tasks: List[RoadmapTask]
+    recommendations: List[str]
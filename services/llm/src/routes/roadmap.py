@@ -1,188 +1,227 @@
+import os
 import json
 import logging
 import uuid
 import traceback
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 # from ..models.roadmap import Roadmap
-from models.roadmap import Roadmap
+from models.roadmap import Roadmap, RoadmapResponse
 from models.student import StudentProfile
-from llm_services.openai_service import get_completion
-from utils.date_utils import parse_deadline, days_until_deadline
+from llm_services.openai_service import get_completion, stream_completion
+from llm_services.structured_output import json_schema_response_format
+from llm_services.metrics import llm_metrics
+from utils.date_utils import days_until_deadline
 from utils.data_conversion import convert_timestamps_to_str
+from utils.prompt_context import build_school_context, school_name
+from utils.roadmap_parser import RoadmapParser
+from utils.roadmap_scheduler import schedule_standard_tasks
 from db.firestore_client import FirestoreClient
+from db.catalog_cache import CollegeCatalog
 
 router = APIRouter()
 logger = logging.getLogger('main')
 db_client = FirestoreClient()
+college_catalog = CollegeCatalog()
+
+# Structured output schema for roadmap completions, so the model cannot drift from the format
+ROADMAP_RESPONSE_FORMAT = json_schema_response_format("roadmap", RoadmapResponse)
+ROADMAP_ROUTE = "generate-roadmap-from-db"
+ROADMAP_STREAM_ROUTE = "generate-roadmap-from-db/stream"
+
+# Schedule the mechanical tasks by rule and only ask the LLM for the personalised ones
+ROADMAP_RULE_SCHEDULER_ENABLED = os.getenv("ROADMAP_RULE_SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes")
+
+def merge_scheduled_tasks(roadmap: Dict[str, Any], scheduled_tasks: List[dict]) -> Dict[str, Any]:
+    """Add the rule-scheduled tasks to an LLM roadmap, keeping tasks sorted by due date."""
+    if scheduled_tasks:
+        roadmap["tasks"] = sorted(scheduled_tasks + roadmap["tasks"], key=lambda x: x["dueDate"])
+    return roadmap
+
+def build_roadmap_prompt(profile_dict: dict, request_id: str, school_infos: List[dict]) -> Tuple[str, List[dict], List[dict]]:
+    """Build the roadmap prompt.
+
+    Returns the prompt, the projected target-school infos it was built from and the tasks already
+    scheduled by the rule-based scheduler, which the LLM's tasks are merged with.
+    """
+    # Convert Firestore timestamps to string format; the school infos may be the whole catalog,
+    # so only the target schools are converted, by build_school_context below
+    profile_dict = convert_timestamps_to_str(profile_dict)
+    
+    logger.info(f"[ROADMAP:{request_id}] Generating roadmap with profile: {json.dumps(profile_dict, indent=2)}")
+    
+    # Parse profile into Pydantic model
+    profile = StudentProfile(**profile_dict)
+    
+    # Get student's interests and target schools
+    interests = profile.interests or ["general education"]
+    target_schools = profile.collegePreferences.targetSchools
+    if not target_schools:
+        raise ValueError("At least one target school is required")
+
+    # Only the target schools' deadline, test and essay fields go into the prompt
+    school_context, school_infos = build_school_context(school_infos, target_schools)
+    logger.info(f"[ROADMAP:{request_id}] School info: {school_context}")
+    
+    # Create the prompt
+    example_task = {
+        "title": "Submit SAT Scores to UCLA",
+        "description": "Send official SAT scores through College Board to UCLA (required for admission). Schedule early to ensure scores arrive before the deadline.",
+        "dueDate": "2025-11-15",
+        "category": "Application",
+        "priority": "high",
+        "school": "UCLA"  # Added school field
+    }
+
+    time_remaining_info = [
+        f"{school}: {days_until_deadline(next((s.get('regularDeadline') for s in school_infos if school_name(s) == school), None))} days"
+        for school in target_schools
+    ]
+    
+    student_context = f"""
+    ### STUDENT PROFILE:
+    - Grade: {profile.generalInfo.grade}
+    - GPA: {profile.highSchoolProfile.gpa}
+    - Weighted GPA: {profile.highSchoolProfile.weightedGpa}
+    - Interests: {', '.join(interests)}
+    - Planned Tests: {', '.join(profile.highSchoolProfile.plannedTests)}
+    - Study Style: {', '.join(profile.highSchoolProfile.studyStylePreference)}
+
+    ### TIME CONTEXT:
+    - Current Date: {datetime.now().strftime("%Y-%m-%d")}
+    - Time Remaining Until Application Deadlines:
+    {', '.join(time_remaining_info)}
+    """
+
+    # Test registration, recommendation letters, FAFSA and submissions are scheduled by rules;
+    # the model is then only asked for the personalised essay, research and activity tasks
+    scheduled_tasks = schedule_standard_tasks(profile, school_infos) if ROADMAP_RULE_SCHEDULER_ENABLED else []
+    if scheduled_tasks:
+        scheduled_summary = "\n".join(
+            f"    - {task['dueDate']}: {task['title']} ({task['school']})" for task in scheduled_tasks
+        )
+        prompt = f"""
+    Generate the personalised part of a college preparation roadmap for a student applying to multiple colleges.
+    {student_context}
+    ### TARGET SCHOOLS AND REQUIREMENTS:
+    {school_context}
+
+    ### ALREADY SCHEDULED:
+    These tasks are already on the student's roadmap. Do not repeat them:
+{scheduled_summary}
+
+    ### TASKS TO GENERATE:
+    Only tasks personalised to this student's profile and interests:
+    - **Essay**: the personal statement and each target school's supplemental essays.
+    - **Research**: programs, majors and opportunities at each target school worth mentioning in the application.
+    - **Extracurricular**: activities that strengthen the student's profile for these schools.
+    Spread the tasks over the time available and schedule each before its school's deadline.
+
+    ### GENERAL RECOMMENDATIONS:
+    Based on student's profile and target schools, provide **at least 3 recommendations** for the student about:
+    - Application strategies
+    - Extracurricular improvements
+    - Time management for balancing school, tests, and activities
+
+    ### RESPONSE FORMAT:
+    Return a **JSON object** with these fields:
+    1. `"tasks"`: A list of tasks, where each task has:
+    - `"title"`, `"description"`, `"dueDate"` (YYYY-MM-DD), `"category"` ("Essay", "Research" or "Extracurricular"), `"priority"` ("high", "medium" or "low"), `"school"` (a target school or "All Schools")
+
+    2. `"recommendations"`: A list of **general recommendations** as **strings**.
+
+    ### **IMPORTANT**: Return only the JSON object, without any markdown formatting or code blocks.
+    """
+        return prompt, school_infos, scheduled_tasks
+
+    prompt = f"""
+    Generate a comprehensive college preparation roadmap for a student applying to multiple colleges.
+    {student_context}
+    Use this information to carefully schedule tasks **in a progressive and manageable way** based on time available.
+
+    ### TARGET SCHOOLS AND REQUIREMENTS:
+    {school_context}
+
+    ### TASK SCHEDULING RULES:
+    1. **Task Scheduling Based on Deadlines**:
+    - Prioritize schools with earlier deadlines.
+    - Distribute tasks over time so they are manageable.
+    - Schedule important tasks (e.g., SAT, essays) well before deadlines.
+    - Avoid bunching too many tasks together in a short time.
+
+    2. **Types of Tasks & Due Dates**:
+    - **Common Tasks**: Tasks that apply to all schools (e.g., test prep, general application steps).
+    - **School-Specific Tasks**: Unique tasks for each school (e.g., essays, financial aid).
+    - **Grouped Tasks**: Tasks that can be done together for multiple schools.
+
+    ### EXAMPLES OF TASKS WITH DEADLINES:
+
+    #### **Common Task Example**
+    - **Title:** SAT Preparation
+    - **Description:** Study for the SAT and take practice tests to ensure a high score.
+    - **Due Date:** 2025-10-01 (At least one month before any early deadlines)
+    - **Category:** Test Prep
+    - **Priority:** High
+    - **School:** All Schools
+
+    #### **School-Specific Task Example**
+    - **Title:** Submit Common App Essay for UCLA
+    - **Description:** Finalize and submit the Common App personal statement required for UCLA.
+    - **Due Date:** 2025-10-25 (Two weeks before UCLA's deadline)
+    - **Category:** Application
+    - **Priority:** High
+    - **School:** UCLA
+
+    #### **Coordinated Task Example (Multiple Schools)**
+    - **Title:** Request Letters of Recommendation
+    - **Description:** Contact teachers for letters of recommendation. Ensure they are ready before the earliest deadline.
+    - **Due Date:** 2025-09-15 (6 weeks before the earliest application deadline)
+    - **Category:** Application
+    - **Priority:** High
+    - **School:** All Schools
+
+    ### GENERAL RECOMMENDATIONS:
+    Based on student's profile and target schools, provide **at least 3 recommendations** for the student about:
+    - Application strategies
+    - Extracurricular improvements
+    - Time management for balancing school, tests, and activities
+
+    ### RESPONSE FORMAT:
+    Return a **JSON object** with these fields:
+    1. `"tasks"`: A list of tasks, where each task has:
+    - `"title"`, `"description"`, `"dueDate"`, `"category"`, `"priority"`, `"school"`
+
+    2. `"recommendations"`: A list of **general recommendations** as **strings**.
+
+    ### **IMPORTANT**: Return only the JSON object, without any markdown formatting or code blocks.
+    """
+
+    return prompt, school_infos, scheduled_tasks
 
 async def generate_roadmap_with_llm(profile_dict: dict, request_id: str, school_infos: List[dict]) -> Dict[str, Any]:
     """Generate a personalized roadmap based on student profile and college requirements."""
     try:
-        # Convert Firestore timestamps to string format
-        profile_dict = convert_timestamps_to_str(profile_dict)
-        school_infos = convert_timestamps_to_str(school_infos)
-        
-        logger.info(f"[ROADMAP:{request_id}] Generating roadmap with profile: {json.dumps(profile_dict, indent=2)}")
-        logger.info(f"[ROADMAP:{request_id}] School info: {json.dumps(school_infos, indent=2)}")
-        
-        # Parse profile into Pydantic model
-        profile = StudentProfile(**profile_dict)
-        
-        # Get student's interests and target schools
-        interests = profile.interests or ["general education"]
-        target_schools = profile.collegePreferences.targetSchools
-        if not target_schools:
-            raise ValueError("At least one target school is required")
-        
-        # Create the prompt
-        example_task = {
-            "title": "Submit SAT Scores to UCLA",
-            "description": "Send official SAT scores through College Board to UCLA (required for admission). Schedule early to ensure scores arrive before the deadline.",
-            "dueDate": "2025-11-15",
-            "category": "Application",
-            "priority": "high",
-            "school": "UCLA"  # Added school field
-        }
-
-        time_remaining_info = [
-            f"{school}: {days_until_deadline(next((s['regularDeadline'] for s in school_infos if s['schoolName'] == school), None))} days"
-            for school in target_schools
-        ]
-        
-        prompt = f"""
-        Generate a comprehensive college preparation roadmap for a student applying to multiple colleges.
-
-        ### STUDENT PROFILE:
-        - Grade: {profile.generalInfo.grade}
-        - GPA: {profile.highSchoolProfile.gpa}
-        - Weighted GPA: {profile.highSchoolProfile.weightedGpa}
-        - Interests: {', '.join(interests)}
-        - Planned Tests: {', '.join(profile.highSchoolProfile.plannedTests)}
-        - Study Style: {', '.join(profile.highSchoolProfile.studyStylePreference)}
-
-        ### TIME CONTEXT:
-        - Current Date: {datetime.now().strftime("%Y-%m-%d")}
-        - Time Remaining Until Application Deadlines:
-        {', '.join(time_remaining_info)}
-
-        Use this information to carefully schedule tasks **in a progressive and manageable way** based on time available.
-
-        ### TARGET SCHOOLS AND REQUIREMENTS:
-        {json.dumps(school_infos, indent=2)}
-
-        ### TASK SCHEDULING RULES:
-        1. **Task Scheduling Based on Deadlines**:
-        - Prioritize schools with earlier deadlines.
-        - Distribute tasks over time so they are manageable.
-        - Schedule important tasks (e.g., SAT, essays) well before deadlines.
-        - Avoid bunching too many tasks together in a short time.
-
-        2. **Types of Tasks & Due Dates**:
-        - **Common Tasks**: Tasks that apply to all schools (e.g., test prep, general application steps).
-        - **School-Specific Tasks**: Unique tasks for each school (e.g., essays, financial aid).
-        - **Grouped Tasks**: Tasks that can be done together for multiple schools.
-
-        ### EXAMPLES OF TASKS WITH DEADLINES:
-
-        #### **Common Task Example**
-        - **Title:** SAT Preparation
-        - **Description:** Study for the SAT and take practice tests to ensure a high score.
-        - **Due Date:** 2025-10-01 (At least one month before any early deadlines)
-        - **Category:** Test Prep
-        - **Priority:** High
-        - **School:** All Schools
-
-        #### **School-Specific Task Example**
-        - **Title:** Submit Common App Essay for UCLA
-        - **Description:** Finalize and submit the Common App personal statement required for UCLA.
-        - **Due Date:** 2025-10-25 (Two weeks before UCLA's deadline)
-        - **Category:** Application
-        - **Priority:** High
-        - **School:** UCLA
-
-        #### **Coordinated Task Example (Multiple Schools)**
-        - **Title:** Request Letters of Recommendation
-        - **Description:** Contact teachers for letters of recommendation. Ensure they are ready before the earliest deadline.
-        - **Due Date:** 2025-09-15 (6 weeks before the earliest application deadline)
-        - **Category:** Application
-        - **Priority:** High
-        - **School:** All Schools
-
-        ### GENERAL RECOMMENDATIONS:
-        Based on student's profile and target schools, provide **at least 3 recommendations** for the student about:
-        - Application strategies
-        - Extracurricular improvements
-        - Time management for balancing school, tests, and activities
-
-        ### RESPONSE FORMAT:
-        Return a **JSON object** with these fields:
-        1. `"tasks"`: A list of tasks, where each task has:
-        - `"title"`, `"description"`, `"dueDate"`, `"category"`, `"priority"`, `"school"`
-
-        2. `"recommendations"`: A list of **general recommendations** as **strings**.
-
-        ### **IMPORTANT**: Return only the JSON object, without any markdown formatting or code blocks.
-        """
-
-        # Get LLM response
-        response = await get_completion(prompt)
-        logger.info(f"[ROADMAP:{request_id}] Raw LLM response: {response}")
+        prompt, school_infos, scheduled_tasks = build_roadmap_prompt(profile_dict, request_id, school_infos)
 
-        # Clean up response - remove markdown code blocks if present
-        cleaned_response = response
-        if cleaned_response.startswith("```"):
-            # Find the first and last occurrence of ```
-            first_block = cleaned_response.find("\n")
-            last_block = cleaned_response.rfind("```")
-            if first_block != -1 and last_block != -1:
-                cleaned_response = cleaned_response[first_block:last_block].strip()
+        # Get LLM response; only a roadmap that passes validation is cached
+        parser = RoadmapParser(school_infos)
+        response = await get_completion(
+            prompt, response_format=ROADMAP_RESPONSE_FORMAT, route=ROADMAP_ROUTE, validate=parser.parse
+        )
+        logger.info(f"[ROADMAP:{request_id}] Raw LLM response: {response}")
 
-        # Parse and validate response
+        # Parse and validate response; fences and text around the JSON are tolerated
         try:
-            data = json.loads(cleaned_response)
-            if not isinstance(data, dict) or "tasks" not in data or "recommendations" not in data:
-                raise ValueError("Invalid response format")
-            
-            # Validate each task has required fields
-            for task in data["tasks"]:
-                required_fields = ["title", "description", "dueDate", "category", "priority", "school"]
-                if not all(field in task for field in required_fields):
-                    raise ValueError(f"Task missing required fields: {task}")
-                
-                # Validate date format
-                try:
-                    task_date = parse_deadline(task["dueDate"])
-
-                    # Find correct school info
-                    school_info = next((s for s in school_infos if s.get("schoolName") == task["school"]), None)
-
-                    # Ensure task date is before school deadline
-                    if task["school"] != "All Schools" and school_info and "regularDeadline" in school_info:
-                        school_deadline = parse_deadline(school_info["regularDeadline"])
-                        if task_date > school_deadline:
-                            raise ValueError(f"Task due date {task['dueDate']} is after application deadline for {task['school']}")
-                except ValueError as e:
-                    raise ValueError(f"Invalid date format in task: {task}")
-
-            # Sort tasks by due date
-            data["tasks"].sort(key=lambda x: x["dueDate"])
-
-            return data
-
-        except json.JSONDecodeError as e:
-            logger.error(f"[ROADMAP:{request_id}] Failed to parse JSON: {str(e)}")
-            logger.error(f"[ROADMAP:{request_id}] Cleaned response: {cleaned_response}")
-            raise ValueError(f"Failed to parse JSON: {str(e)}")
+            roadmap = parser.parse(response)
         except ValueError as e:
+            llm_metrics.record_validation_failure(ROADMAP_ROUTE)
             logger.error(f"[ROADMAP:{request_id}] Validation error: {str(e)}")
             raise ValueError(f"Validation error: {str(e)}")
-        except Exception as e:
-            logger.error(f"[ROADMAP:{request_id}] Error parsing response: {str(e)}")
-            raise ValueError(f"Error parsing response: {str(e)}")
+
+        return merge_scheduled_tasks(roadmap, scheduled_tasks)
 
     except Exception as e:
         logger.error(f"[ROADMAP:{request_id}] Error generating roadmap: {str(e)}")
@@ -191,38 +230,61 @@ async def generate_roadmap_with_llm(profile_dict: dict, request_id: str, school_
             detail=f"Failed to parse roadmap data: {str(e)}"
         )
 
+async def load_roadmap_inputs(data: Dict[str, Any]) -> Tuple[str, Dict[str, Any], Any]:
+    """Resolve the user id, student profile and school info a roadmap request is generated from."""
+    user_id = data.get('userId')
+    target_schools = data.get('targetSchool')
+    school_info = data.get('schoolInfo', {})
+
+    if not user_id or not target_schools:
+        raise HTTPException(status_code=400, detail="Missing userId or targetSchool")
+
+    logger.info(f"Generating roadmap for user {user_id} targeting {target_schools}")
+
+    # Get school data from Firestore if not provided
+    if not school_info:
+        logger.info(f"We did not get school info from the client, so we're using the college catalog")
+        school_doc = await college_catalog.all_async()
+        if not school_doc:
+            raise HTTPException(status_code=404, detail=f"School {target_schools} not found")
+        school_info = school_doc
+
+    # Get user profile from Firestore
+    user_profile = await db_client.get_user_profile(user_id)
+    if not user_profile or not user_profile.get('studentProfile'):
+        raise HTTPException(status_code=404, detail=f"User profile {user_id} not found or incomplete")
+
+    # Get student profile
+    student_profile = user_profile.get('studentProfile')
+    if not student_profile:
+        raise HTTPException(status_code=400, detail="Student profile is empty")
+
+    logger.info(f"Using info for {len(school_info)} schools")
+    return user_id, student_profile, school_info
+
+async def store_roadmap(user_id: str, roadmap: Dict[str, Any]) -> None:
+    """Update user document with roadmap data."""
+    await db_client.update_document('users', user_id, {
+        "tasks": [
+            {
+                **task,
+                "createdAt": datetime.now().isoformat(),
+                "updatedAt": datetime.now().isoformat(),
+                "isCompleted": False
+            }
+            for task in roadmap.get('tasks', [])
+        ],
+        "totalTasks": len(roadmap.get('tasks', [])),
+        "recommendations": roadmap.get('recommendations', []),
+        "lastTaskGeneratedAt": datetime.now().isoformat(),
+        "updatedAt": datetime.now().isoformat()
+    })
+
 @router.post("/generate-roadmap-from-db")
 async def generate_roadmap_from_db(request: Request):
     try:
         data = await request.json()
-        user_id = data.get('userId')
-        target_schools = data.get('targetSchool')
-        school_info = data.get('schoolInfo', {})
-
-        if not user_id or not target_schools:
-            raise HTTPException(status_code=400, detail="Missing userId or targetSchool")
-
-        logger.info(f"Generating roadmap for user {user_id} targeting {target_schools}")
-
-        # Get school data from Firestore if not provided
-        if not school_info:
-            logger.info(f"We did not get school info from the client, so we're fetching it from Firestore")
-            school_doc = await db_client.get_all_documents('US-Colleges')
-            if not school_doc:
-                raise HTTPException(status_code=404, detail=f"School {target_schools} not found")
-            school_info = school_doc
-
-        # Get user profile from Firestore
-        user_profile = await db_client.get_user_profile(user_id)
-        if not user_profile or not user_profile.get('studentProfile'):
-            raise HTTPException(status_code=404, detail=f"User profile {user_id} not found or incomplete")
-
-        # Get student profile
-        student_profile = user_profile.get('studentProfile')
-        if not student_profile:
-            raise HTTPException(status_code=400, detail="Student profile is empty")
-
-        logger.info(f"Original school_info: {school_info}")
+        user_id, student_profile, school_info = await load_roadmap_inputs(data)
 
         # Generate roadmap using the combined data
         roadmap = await generate_roadmap_with_llm(
@@ -233,22 +295,7 @@ async def generate_roadmap_from_db(request: Request):
 
         logger.info("Generated roadmap successfully")
 
-        # Update user document with roadmap data
-        await db_client.update_document('users', user_id, {
-            "tasks": [
-                {
-                    **task,
-                    "createdAt": datetime.now().isoformat(),
-                    "updatedAt": datetime.now().isoformat(),
-                    "isCompleted": False
-                }
-                for task in roadmap.get('tasks', [])
-            ],
-            "totalTasks": len(roadmap.get('tasks', [])),
-            "recommendations": roadmap.get('recommendations', []),
-            "lastTaskGeneratedAt": datetime.now().isoformat(),
-            "updatedAt": datetime.now().isoformat()
-        })
+        await store_roadmap(user_id, roadmap)
 
         logger.info("Stored roadmap in user profile")
 
@@ -260,4 +307,53 @@ async def generate_roadmap_from_db(request: Request):
     except Exception as e:
         logger.error(f"Error generating roadmap: {str(e)}")
         logger.error(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/generate-roadmap-from-db/stream")
+async def generate_roadmap_from_db_stream(request: Request):
+    """Generate a roadmap like /generate-roadmap-from-db, streaming it as NDJSON.
+
+    Each validated task is sent as a {"type": "task"} line as soon as the model has written it.
+    The final {"type": "done"} line carries the sorted roadmap, which is also stored in Firestore.
+    Failures after the stream has started are reported as a {"type": "error"} line.
+    """
+    data = await request.json()
+    user_id, student_profile, school_info = await load_roadmap_inputs(data)
+    request_id = str(uuid.uuid4())
+
+    try:
+        prompt, school_infos, scheduled_tasks = build_roadmap_prompt(student_profile, request_id, school_info)
+    except Exception as e:
+        logger.error(f"[ROADMAP:{request_id}] Error building prompt: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to build roadmap prompt: {str(e)}")
+
+    async def roadmap_events():
+        parser = RoadmapParser(school_infos)
+        try:
+            # Rule-scheduled tasks are ready before the model has written anything
+            for task in scheduled_tasks:
+                yield json.dumps({"type": "task", "task": task}) + "\n"
+
+            # Validated strictly as a whole before caching, so a roadmap with skipped tasks is not replayed
+            async for chunk in stream_completion(
+                prompt,
+                response_format=ROADMAP_RESPONSE_FORMAT,
+                route=ROADMAP_STREAM_ROUTE,
+                validate=RoadmapParser(school_infos).parse
+            ):
+                for task in parser.feed(chunk):
+                    yield json.dumps({"type": "task", "task": task}) + "\n"
+
+            roadmap = merge_scheduled_tasks(parser.finish(), scheduled_tasks)
+            if parser.skipped:
+                llm_metrics.record_validation_failure(ROADMAP_STREAM_ROUTE)
+            await store_roadmap(user_id, roadmap)
+            logger.info(f"[ROADMAP:{request_id}] Streamed and stored {len(roadmap['tasks'])} tasks, skipped {parser.skipped}")
+            yield json.dumps({"type": "done", "data": roadmap}) + "\n"
+        except Exception as e:
+            logger.error(f"[ROADMAP:{request_id}] Error streaming roadmap: {str(e)}")
+            logger.error(traceback.format_exc())
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            yield json.dumps({"type": "error", "detail": detail}) + "\n"
+
+    return StreamingResponse(roadmap_events(), media_type="application/x-ndjson")
@@ -30,14 +30,25 @@ def parse_deadline(deadline_str: str, year: int = None) -> datetime:
     except Exception as e:
         raise ValueError(f"Invalid deadline format: {deadline_str}. Supported formats: 'MM/DD', 'YYYY-MM-DD', 'MM-DD-YYYY'. Error: {e}")
 
-def days_until_deadline(deadline_str: str) -> int:
-    """Calculate the number of days until a deadline."""
+def resolve_deadline(deadline_str: str, today: datetime = None) -> datetime:
+    """Parse an application deadline as of `today`.
+
+    Deadlines given without a year (MM/DD) that have already passed this year are taken to be next year's.
+    """
+    today = (today or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    deadline = parse_deadline(deadline_str, year=today.year)
+    if deadline < today and '/' in deadline_str:
+        deadline = deadline.replace(year=deadline.year + 1)
+    return deadline
+
+def days_until_deadline(deadline_str: str, today: datetime = None) -> int:
+    """Calculate the number of days until a deadline, resolved as by resolve_deadline()."""
     if not deadline_str:
         return None
     
     try:
-        deadline_date = parse_deadline(deadline_str)
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        today = (today or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+        deadline_date = resolve_deadline(deadline_str, today)
         delta = deadline_date - today
         return max(0, delta.days)
     except Exception:
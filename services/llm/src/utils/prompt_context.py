@@ -0,0 +1,101 @@
+import os
+import json
+import logging
+from typing import List, Dict, Any, Tuple
+
+from utils.data_conversion import convert_timestamps_to_str
+
+logger = logging.getLogger('main')
+
+# Fields that identify a school in the different US-Colleges document shapes
+NAME_FIELDS = ("schoolName", "University Name")
+
+# The roadmap prompt only needs deadlines, test policy and essay requirements
+PROMPT_FIELD_KEYWORDS = ("deadline", "decision", "test", "essay")
+
+# Upper bound for the school section of the roadmap prompt, in estimated tokens
+SCHOOL_CONTEXT_TOKEN_BUDGET = int(os.getenv("ROADMAP_SCHOOL_CONTEXT_TOKEN_BUDGET", "4000"))
+
+# Longest string value kept when a single school does not fit the budget
+MAX_VALUE_CHARS = 300
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English/JSON text (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+def compact_json(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def school_name(school: Dict[str, Any]) -> str:
+    for field in NAME_FIELDS:
+        if school.get(field):
+            return school[field]
+    return school.get("id", "")
+
+
+def select_target_schools(school_infos: List[Dict[str, Any]], target_schools: List[str]) -> List[Dict[str, Any]]:
+    """Pick the documents for the student's target schools, in target-list order."""
+    by_name = {}
+    for school in school_infos:
+        for key in (*NAME_FIELDS, "id"):
+            if school.get(key):
+                by_name.setdefault(school[key], school)
+    return [by_name[name] for name in dict.fromkeys(target_schools) if name in by_name]
+
+
+def project_school(school: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the name, deadline, test policy and essay fields of a school document."""
+    projected = {field: school[field] for field in NAME_FIELDS if school.get(field)}
+    for key, value in school.items():
+        if any(word in key.lower() for word in PROMPT_FIELD_KEYWORDS):
+            projected[key] = value
+    return projected
+
+
+def _truncate_values(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {k: _truncate_values(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_truncate_values(v) for v in obj]
+    if isinstance(obj, str) and len(obj) > MAX_VALUE_CHARS:
+        return obj[:MAX_VALUE_CHARS] + "..."
+    return obj
+
+
+def build_school_context(
+    school_infos: List[Dict[str, Any]],
+    target_schools: List[str],
+    token_budget: int = SCHOOL_CONTEXT_TOKEN_BUDGET,
+) -> Tuple[str, List[Dict[str, Any]]]:
+    """Build the compact JSON school section of the roadmap prompt.
+
+    school_infos may be the raw catalog: only the selected schools' projected fields are copied,
+    with Firestore timestamps converted to strings.
+
+    Returns the JSON text and the projected school documents it contains. Schools are added
+    in target-list order until the token budget is spent; a school that does not fit has its
+    long text values truncated and is dropped only if it still does not fit.
+    """
+    selected = select_target_schools(school_infos, target_schools)
+    missing = set(target_schools) - {school_name(s) for s in selected} - {s.get("id") for s in selected}
+    if missing:
+        logger.warning(f"[PROMPT] No school info found for target schools: {sorted(missing)}")
+
+    included = []
+    used = 2  # surrounding brackets
+    for school in selected:
+        projected = convert_timestamps_to_str(project_school(school))
+        cost = estimate_tokens(compact_json(projected))
+        if used + cost > token_budget:
+            projected = _truncate_values(projected)
+            cost = estimate_tokens(compact_json(projected))
+        if used + cost > token_budget:
+            logger.warning(f"[PROMPT] Dropping {school_name(school)} from the prompt, school context budget of {token_budget} tokens reached")
+            continue
+        included.append(projected)
+        used += cost
+
+    return compact_json(included), included
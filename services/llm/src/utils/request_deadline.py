@@ -0,0 +1,46 @@
+import time
+from contextvars import ContextVar, Token
+from typing import Optional
+
+# Absolute Unix time (seconds) by which the caller needs a response. The LLM service
+# accepts it from callers (the api service sends it) and clamps its OpenAI timeouts to it.
+DEADLINE_HEADER = "X-Request-Deadline"
+
+# Monotonic deadline of the request being handled in the current context
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def parse_deadline_header(value: Optional[str]) -> Optional[float]:
+    """Seconds left until an X-Request-Deadline header value, or None if it is missing or invalid."""
+    if not value:
+        return None
+    try:
+        return float(value) - time.time()
+    except ValueError:
+        return None
+
+
+def set_deadline(seconds: float) -> Token:
+    """Start a deadline `seconds` from now for the current request context."""
+    return _deadline.set(time.monotonic() + seconds)
+
+
+def reset_deadline(token: Token) -> None:
+    _deadline.reset(token)
+
+
+def remaining_seconds() -> Optional[float]:
+    """Seconds left before the current request's deadline, or None outside a request."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def timeout_for(default: float) -> float:
+    """Clamp a downstream call's timeout so it cannot outlive the current request."""
+    remaining = remaining_seconds()
+    if remaining is None:
+        return default
+    return max(0.0, min(default, remaining))
+
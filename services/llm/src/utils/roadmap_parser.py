@@ -0,0 +1,208 @@
+import re
+import json
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from models.roadmap import RoadmapTask, RoadmapResponse
+from utils.date_utils import parse_deadline, resolve_deadline
+from utils.prompt_context import school_name
+
+logger = logging.getLogger('main')
+
+ALL_SCHOOLS = "All Schools"
+
+_TASKS_ARRAY_START = re.compile(r'"tasks"\s*:\s*\[')
+_decoder = json.JSONDecoder()
+
+
+def strip_code_fences(text: str) -> str:
+    """Remove a surrounding markdown code block from an LLM response, if present."""
+    if text.startswith("```"):
+        # Find the first and last occurrence of ```
+        first_block = text.find("\n")
+        last_block = text.rfind("```")
+        if first_block != -1 and last_block != -1:
+            return text[first_block:last_block].strip()
+    return text
+
+
+def extract_json_object(text: str) -> Dict[str, Any]:
+    """Decode the first JSON object in an LLM response, ignoring code fences and any text around it."""
+    text = strip_code_fences(text.strip())
+    start = text.find("{")
+    if start == -1:
+        raise ValueError("No JSON object in response")
+    try:
+        data, _ = _decoder.raw_decode(text, start)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Failed to parse JSON: {str(e)}")
+    if not isinstance(data, dict):
+        raise ValueError("Invalid response format")
+    return data
+
+
+def build_deadline_index(school_infos: List[dict], today: Optional[datetime] = None) -> Dict[str, datetime]:
+    """Map each school name to its regular deadline, resolved as by resolve_deadline(), skipping
+    schools without a usable one."""
+    deadlines = {}
+    for school in school_infos:
+        name = school_name(school)
+        deadline = school.get("regularDeadline")
+        if not name or not deadline or name in deadlines:
+            continue
+        try:
+            deadlines[name] = resolve_deadline(deadline, today)
+        except ValueError:
+            logger.warning(f"Ignoring unparseable deadline {deadline!r} for {name}")
+    return deadlines
+
+
+class IncrementalTaskParser:
+    """Pulls complete task objects out of a roadmap JSON document while it is still streaming.
+
+    feed() takes the next chunk of model output and returns the tasks whose closing brace
+    arrived in it. Only the unfinished task (or a short overlap while the tasks key is still
+    being looked for) is carried over to the next chunk, so each character is scanned once.
+    """
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        # Pending tail of the stream, starting at the open task's "{" when there is one
+        self._window = ""
+        # Scan offset into _window
+        self._pos = 0
+        self._in_tasks = False
+        self._tasks_done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._task_start: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        self._chunks.append(chunk)
+        tasks = []
+        if self._tasks_done:
+            return tasks
+
+        text = self._window + chunk
+        i = self._pos
+        if not self._in_tasks:
+            match = _TASKS_ARRAY_START.search(text)
+            if not match:
+                # Keep a little overlap so a key split across chunks is still found
+                self._window = text[-16:]
+                self._pos = 0
+                return tasks
+            self._in_tasks = True
+            i = match.end()
+
+        while i < len(text):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                if self._depth == 0:
+                    self._task_start = i
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0 and self._task_start is not None:
+                    try:
+                        task = json.loads(text[self._task_start:i + 1])
+                        if isinstance(task, dict):
+                            tasks.append(task)
+                    except json.JSONDecodeError:
+                        pass
+                    self._task_start = None
+            elif ch == "]" and self._depth == 0:
+                self._in_tasks = False
+                self._tasks_done = True
+                self._window = ""
+                self._pos = 0
+                return tasks
+            i += 1
+
+        # Drop what has been scanned, keeping only the task that is still open
+        keep_from = self._task_start if self._task_start is not None else i
+        self._window = text[keep_from:]
+        self._pos = i - keep_from
+        if self._task_start is not None:
+            self._task_start = 0
+        return tasks
+
+
+class RoadmapParser:
+    """Parses and validates LLM roadmap output against the target schools' deadlines.
+
+    parse() handles a complete response and fails on the first invalid task. For streamed
+    output, feed() returns each valid task as soon as it is complete (invalid ones are
+    skipped and logged) and finish() assembles the roadmap once the stream has ended.
+    """
+
+    def __init__(self, school_infos: List[dict]):
+        self.deadlines = build_deadline_index(school_infos)
+        self.tasks: List[Dict[str, Any]] = []
+        self.skipped = 0
+        self._stream = IncrementalTaskParser()
+
+    def validate_task(self, task: Any) -> Dict[str, Any]:
+        """Validate one task; returns it as a plain dict or raises ValueError."""
+        validated = RoadmapTask.model_validate(task)
+        try:
+            task_date = parse_deadline(validated.dueDate)
+        except ValueError:
+            raise ValueError(f"Invalid date format in task: {task}")
+
+        # Ensure task date is before school deadline
+        school_deadline = self.deadlines.get(validated.school) if validated.school != ALL_SCHOOLS else None
+        if school_deadline is not None and task_date > school_deadline:
+            raise ValueError(f"Task due date {validated.dueDate} is after application deadline for {validated.school}")
+        return validated.model_dump()
+
+    def parse(self, text: str) -> Dict[str, Any]:
+        """Parse a complete response into {"tasks", "recommendations"} with tasks sorted by due date."""
+        data = extract_json_object(text)
+        if "tasks" not in data or "recommendations" not in data:
+            raise ValueError("Invalid response format")
+        roadmap = RoadmapResponse.model_validate(data)
+        tasks = [self.validate_task(task) for task in roadmap.tasks]
+        tasks.sort(key=lambda x: x["dueDate"])
+        return {"tasks": tasks, "recommendations": roadmap.recommendations}
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Validated tasks completed by this chunk of streamed output."""
+        valid = []
+        for task in self._stream.feed(chunk):
+            try:
+                valid.append(self.validate_task(task))
+            except ValueError as e:
+                self.skipped += 1
+                logger.warning(f"Skipping invalid roadmap task: {str(e)}")
+        self.tasks.extend(valid)
+        return valid
+
+    def finish(self) -> Dict[str, Any]:
+        """The roadmap assembled from all streamed tasks and the document's recommendations."""
+        try:
+            recommendations = extract_json_object(self._stream.text).get("recommendations", [])
+        except ValueError as e:
+            logger.warning(f"Could not read recommendations from streamed roadmap: {str(e)}")
+            recommendations = []
+        recommendations = [r for r in recommendations if isinstance(r, str)]
+        return {
+            "tasks": sorted(self.tasks, key=lambda x: x["dueDate"]),
+            "recommendations": recommendations
+        }
@@ -0,0 +1,182 @@
+import os
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+
+from models.student import StudentProfile
+from utils.date_utils import resolve_deadline
+from utils.prompt_context import school_name
+
+ALL_SCHOOLS = "All Schools"
+
+# Lead times (days before the relevant deadline) of the mechanical application tasks
+SUBMISSION_LEAD_DAYS = 14
+RECOMMENDATION_LEAD_DAYS = 42
+TEST_REGISTRATION_LEAD_DAYS = 120
+# Minimum notice for a task that would otherwise already be overdue
+MIN_NOTICE_DAYS = 7
+# FAFSA opens on October 1st; aim for two weeks after
+FAFSA_DUE_MONTH, FAFSA_DUE_DAY = 10, 15
+# Tests students sign up for themselves; AP exams and the like are ordered through their school
+REGISTRATION_TESTS = frozenset({'SAT', 'ACT'})
+
+MAX_TASKS_PER_WEEK = int(os.getenv('ROADMAP_MAX_TASKS_PER_WEEK', '3'))
+
+
+def school_deadlines(school_infos: List[dict], today: datetime) -> List[Tuple[str, datetime]]:
+    """(school name, regular deadline) pairs sorted by deadline, resolved as by resolve_deadline().
+
+    Schools whose deadline is already behind `today` are left out; there is nothing left to schedule for them.
+    """
+    deadlines = []
+    for school in school_infos:
+        name = school_name(school)
+        raw = school.get('regularDeadline')
+        if not name or not raw:
+            continue
+        try:
+            deadline = resolve_deadline(raw, today)
+        except ValueError:
+            continue
+        if deadline < today:
+            continue
+        deadlines.append((name, deadline))
+    deadlines.sort(key=lambda item: item[1])
+    return deadlines
+
+
+def _task(
+    title: str,
+    description: str,
+    due: datetime,
+    latest: datetime,
+    category: str,
+    priority: str,
+    school: str = ALL_SCHOOLS
+) -> Dict[str, Any]:
+    return {
+        "title": title,
+        "description": description,
+        "dueDate": due,
+        "category": category,
+        "priority": priority,
+        "school": school,
+        # Latest acceptable due date when spreading; dropped before the task is returned
+        "_latest": latest,
+    }
+
+
+def _week_start(day: datetime) -> datetime:
+    return day - timedelta(days=day.weekday())
+
+
+def _spread(tasks: List[Dict[str, Any]], earliest_due: datetime, max_per_week: int) -> None:
+    """Move tasks out of weeks already holding max_per_week tasks.
+
+    A task is moved to the nearest earlier week with room (not before earliest_due) and
+    otherwise to the nearest later one that still leaves it before its latest due date. A task
+    with nowhere to go stays where it is.
+    """
+    load: Dict[datetime, int] = {}
+
+    def has_room(day: datetime) -> bool:
+        return load.get(_week_start(day), 0) < max_per_week
+
+    for task in sorted(tasks, key=lambda t: t["dueDate"]):
+        due = task["dueDate"]
+        week = _week_start(due)
+        if not has_room(due):
+            moved = None
+            candidate = week - timedelta(weeks=1)
+            while moved is None and candidate + timedelta(days=6) >= earliest_due:
+                # Clamping to earliest_due can land outside the candidate week; only keep a day with room
+                day = max(earliest_due, due - (week - candidate))
+                if has_room(day):
+                    moved = day
+                candidate -= timedelta(weeks=1)
+            candidate = week + timedelta(weeks=1)
+            while moved is None and candidate <= task["_latest"]:
+                day = min(task["_latest"], due + (candidate - week))
+                if has_room(day):
+                    moved = day
+                candidate += timedelta(weeks=1)
+            if moved is not None:
+                task["dueDate"] = moved
+                week = _week_start(moved)
+        load[week] = load.get(week, 0) + 1
+
+
+def schedule_standard_tasks(
+    profile: StudentProfile,
+    school_infos: List[dict],
+    today: Optional[datetime] = None,
+    max_per_week: int = MAX_TASKS_PER_WEEK
+) -> List[Dict[str, Any]]:
+    """Deterministically schedule the mechanical roadmap tasks: test registration, recommendation
+    letters, FAFSA and one submission per target school, no more than max_per_week in any week.
+
+    Tasks have the same fields as LLM roadmap tasks, with dueDate as YYYY-MM-DD.
+    """
+    today = (today or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    deadlines = school_deadlines(school_infos, today)
+    if not deadlines:
+        return []
+
+    earliest = deadlines[0][1]
+    min_due = today + timedelta(days=MIN_NOTICE_DAYS)
+
+    def not_before_notice(due: datetime) -> datetime:
+        # Never schedule past the deadline it prepares for, even when notice is short
+        return min(max(due, min_due), earliest)
+
+    tasks = []
+    for test in profile.highSchoolProfile.plannedTests:
+        if test.strip().upper() not in REGISTRATION_TESTS:
+            continue
+        tasks.append(_task(
+            f"Register for the {test}",
+            f"Register for a {test} date that leaves time for a retake and for scores to reach every school before {earliest.strftime('%B %d')}.",
+            not_before_notice(earliest - timedelta(days=TEST_REGISTRATION_LEAD_DAYS)),
+            earliest,
+            "Test Prep",
+            "high"
+        ))
+
+    tasks.append(_task(
+        "Request Letters of Recommendation",
+        "Ask teachers and your counselor for recommendation letters, giving them at least six weeks before the earliest application deadline.",
+        not_before_notice(earliest - timedelta(days=RECOMMENDATION_LEAD_DAYS)),
+        earliest,
+        "Application",
+        "high"
+    ))
+
+    fafsa_due = datetime(earliest.year, FAFSA_DUE_MONTH, FAFSA_DUE_DAY)
+    if fafsa_due > earliest:
+        fafsa_due = fafsa_due.replace(year=earliest.year - 1)
+    tasks.append(_task(
+        "Submit FAFSA Application",
+        "Complete and submit the Free Application for Federal Student Aid (FAFSA), which opens on October 1st.",
+        max(fafsa_due, min_due),
+        max(fafsa_due, min_due, earliest),
+        "Financial Aid",
+        "high"
+    ))
+
+    for name, deadline in deadlines:
+        due = max(deadline - timedelta(days=SUBMISSION_LEAD_DAYS), min(min_due, deadline))
+        tasks.append(_task(
+            f"Submit {name} Application",
+            f"Complete and submit your {name} application with all required materials, two weeks ahead of the {deadline.strftime('%B %d, %Y')} deadline.",
+            due,
+            deadline,
+            "Application",
+            "high",
+            name
+        ))
+
+    _spread(tasks, min(min_due, earliest), max_per_week)
+    tasks.sort(key=lambda t: t["dueDate"])
+    for task in tasks:
+        del task["_latest"]
+        task["dueDate"] = task["dueDate"].strftime("%Y-%m-%d")
+    return tasks
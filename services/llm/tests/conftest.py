@@ -0,0 +1,23 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# The service imports its modules relative to src/ (as in the Docker image) and db/ from the service root
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SERVICE_ROOT))
+sys.path.insert(0, str(SERVICE_ROOT / "src"))
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: timing comparison, only run with RUN_BENCHMARKS=1")
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.getenv("RUN_BENCHMARKS"):
+        return
+    skip = pytest.mark.skip(reason="benchmark; set RUN_BENCHMARKS=1 to run it")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,130 @@
+import asyncio
+import io
+import json
+import logging
+import time
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+
+from fastapi import FastAPI, HTTPException, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from middleware.logging import RequestLoggingMiddleware
+
+BODY = {"userId": "u1", "profile": {"interests": ["math"] * 200, "notes": "x" * 2000}}
+
+
+def make_app(middleware=None, route_count=1, **options):
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return await request.json()
+
+    @app.get("/fail")
+    async def fail():
+        raise HTTPException(status_code=404, detail="No such roadmap")
+
+    # Filler routes, since the old logger dumped the whole route table on every request
+    for i in range(route_count - 1):
+        app.add_api_route(f"/filler-{i}", lambda: None, methods=["GET"])
+
+    if middleware is not None:
+        app.add_middleware(middleware, **options)
+    return app
+
+
+async def send_requests(app, count, **kwargs):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://llm") as client:
+        return [await client.request(**kwargs) for _ in range(count)]
+
+
+def request(app, **kwargs):
+    return asyncio.run(send_requests(app, 1, **kwargs))[0]
+
+
+def access_lines(caplog):
+    return [r.getMessage() for r in caplog.records if r.getMessage().startswith("[ACCESS]")]
+
+
+def test_one_line_per_request_with_the_callers_request_id(caplog):
+    caplog.set_level(logging.INFO, logger="main")
+    response = request(make_app(RequestLoggingMiddleware), method="POST", url="/echo", json=BODY, headers={"X-Request-ID": "abc"})
+
+    assert response.json() == BODY
+    assert response.headers["x-request-id"] == "abc"
+    [line] = access_lines(caplog)
+    assert "method=POST path=/echo status=200" in line
+    assert "request_id=abc" in line
+    assert "body=" not in line
+
+
+def test_error_response_body_reaches_the_client(caplog):
+    caplog.set_level(logging.INFO, logger="main")
+    response = request(make_app(RequestLoggingMiddleware), method="GET", url="/fail")
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "No such roadmap"}
+    assert "status=404" in access_lines(caplog)[0]
+    assert response.headers["x-request-id"]
+
+
+def test_sampled_body_is_capped(caplog):
+    caplog.set_level(logging.INFO, logger="main")
+    app = make_app(RequestLoggingMiddleware, body_sample_rate=1.0, body_max_bytes=16)
+    request(app, method="POST", url="/echo", content=json.dumps(BODY), headers={"Content-Type": "application/json"})
+
+    [line] = access_lines(caplog)
+    assert line.endswith(f"body={json.dumps(BODY)[:16]!r}")
+
+
+class PreviousRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """The logger RequestLoggingMiddleware replaced, reduced to the work it did per request."""
+
+    async def dispatch(self, request, call_next):
+        logger = logging.getLogger("main")
+        logger.info(f"[MIDDLEWARE] Received request: {request.method} {request.url.path}")
+        logger.info(f"[MIDDLEWARE] Headers: {dict(request.headers)}")
+        routes = [
+            {"path": route.path, "name": route.name, "methods": list(route.methods) if route.methods else []}
+            for route in request.app.routes
+        ]
+        logger.info(f"[MIDDLEWARE] Available routes: {json.dumps(routes, indent=2)}")
+        body = await request.body()
+        if body:
+            logger.info(f"[MIDDLEWARE] Request body: {json.dumps(json.loads(body), indent=2)}")
+        response = await call_next(request)
+        logger.info(f"[MIDDLEWARE] Response status: {response.status_code}")
+        return response
+
+
+@pytest.mark.benchmark
+def test_benchmark_logging_overhead():
+    logger = logging.getLogger("main")
+    handler = logging.StreamHandler(io.StringIO())
+    logger.addHandler(handler)
+    previous_level = logger.level
+    logger.setLevel(logging.INFO)
+    count = 500
+    try:
+        timings = {}
+        for name, middleware in (("none", None), ("previous", PreviousRequestLoggingMiddleware), ("access log", RequestLoggingMiddleware)):
+            app = make_app(middleware, route_count=40)
+            asyncio.run(send_requests(app, 20, method="POST", url="/echo", json=BODY))
+            started = time.perf_counter()
+            asyncio.run(send_requests(app, count, method="POST", url="/echo", json=BODY))
+            timings[name] = (time.perf_counter() - started) / count * 1e6
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(previous_level)
+
+    overhead = {name: micros - timings["none"] for name, micros in timings.items() if name != "none"}
+    print(
+        f"\nPer request: no middleware {timings['none']:.0f} us, previous logger +{overhead['previous']:.0f} us, "
+        f"access log +{overhead['access log']:.0f} us"
+    )
+    assert overhead["access log"] < overhead["previous"]
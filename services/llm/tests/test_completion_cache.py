@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+pytest.importorskip("dotenv")
+
+from llm_services import openai_service
+from llm_services.completion_cache import CompletionCache
+
+
+def openai_reply(content, finish_reason="stop"):
+    return {
+        "model": "gpt-4o",
+        "choices": [{"message": {"content": content}, "finish_reason": finish_reason}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    }
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """Answers OpenAI calls from a list of replies and records every request that reached it."""
+    calls = []
+    replies = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=replies[len(calls) - 1])
+
+    monkeypatch.setattr(openai_service, "get_http_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(openai_service, "completion_cache", CompletionCache())
+    return calls, replies
+
+
+def validate_json(text):
+    json.loads(text)
+
+
+def test_invalid_completion_is_not_cached(fake_openai):
+    calls, replies = fake_openai
+    replies += [openai_reply('{"tasks": ['), openai_reply('{"tasks": []}')]
+
+    first = asyncio.run(openai_service.get_completion("prompt", validate=validate_json))
+    retry = asyncio.run(openai_service.get_completion("prompt", validate=validate_json))
+    again = asyncio.run(openai_service.get_completion("prompt", validate=validate_json))
+
+    assert first == '{"tasks": ['
+    assert retry == '{"tasks": []}'
+    # The invalid answer went back to OpenAI, the valid one is then served from the cache
+    assert len(calls) == 2
+    assert again == retry
+
+
+def test_truncated_completion_is_not_cached(fake_openai):
+    calls, replies = fake_openai
+    replies += [openai_reply('{"tasks": []}', finish_reason="length"), openai_reply('{"tasks": []}')]
+
+    asyncio.run(openai_service.get_completion("prompt"))
+    asyncio.run(openai_service.get_completion("prompt"))
+
+    assert len(calls) == 2
@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+from llm_services.completion_cache import CompletionCache
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    db_path = str(tmp_path / "completions.sqlite3")
+    asyncio.run(CompletionCache(db_path=db_path).set("key", "value"))
+
+    reopened = CompletionCache(db_path=db_path)
+    assert asyncio.run(reopened.get("key")) == "value"
+    assert reopened.disk_hits == 1
+    # Promoted to memory: the second lookup does not go back to SQLite
+    assert asyncio.run(reopened.get("key")) == "value"
+    assert reopened.disk_hits == 1
+    assert reopened.hits == 2
+
+
+def test_expired_disk_entries_are_dropped(tmp_path):
+    db_path = str(tmp_path / "completions.sqlite3")
+    cache = CompletionCache(db_path=db_path)
+    cache._disk_set("key", "value", time.time() - 1)
+
+    assert asyncio.run(cache.get("key")) is None
+    assert cache.misses == 1
+    assert cache._db.execute("SELECT COUNT(*) FROM completions").fetchone()[0] == 0
+
+
+def test_memory_hit_does_not_wait_for_sqlite(tmp_path):
+    cache = CompletionCache(db_path=str(tmp_path / "completions.sqlite3"))
+    asyncio.run(cache.set("key", "value"))
+
+    async def lookup_while_disk_is_busy():
+        # Stands in for a commit running on a worker thread
+        with cache._db_lock:
+            return await asyncio.wait_for(cache.get("key"), timeout=1)
+
+    assert asyncio.run(lookup_while_disk_is_busy()) == "value"
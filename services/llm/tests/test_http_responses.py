@@ -0,0 +1,124 @@
+import asyncio
+import json
+import time
+from datetime import timezone
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+pytest.importorskip("orjson")
+pytest.importorskip("google.cloud.firestore")
+
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+from google.cloud.firestore import SERVER_TIMESTAMP
+from pydantic import BaseModel
+
+from http_responses import CompressionMiddleware, FirestoreJSONResponse, dumps
+
+UPDATED_AT = DatetimeWithNanoseconds(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+
+
+class Program(BaseModel):
+    name: str
+
+
+def make_colleges(count):
+    return [
+        {
+            "id": f"college-{i}",
+            "schoolName": f"College {i}",
+            "city": "Springfield",
+            "state": "IL",
+            "acceptanceRate": round(i % 97 / 100, 2),
+            "satRange": {"low": 1100 + i % 300, "high": 1400 + i % 200},
+            "majors": ["Biology", "Computer Science", "Economics", "History"],
+            "regularDeadline": "01/05",
+            "updatedAt": UPDATED_AT,
+        }
+        for i in range(count)
+    ]
+
+
+def test_firestore_values_are_serialized():
+    data = json.loads(dumps({"updatedAt": UPDATED_AT, "createdAt": SERVER_TIMESTAMP, "program": Program(name="Art"), 1: "one"}))
+
+    assert data == {"updatedAt": "2026-03-01T12:30:00+00:00", "createdAt": None, "program": {"name": "Art"}, "1": "one"}
+
+
+def make_app():
+    app = FastAPI(default_response_class=FirestoreJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/colleges")
+    async def colleges():
+        return FirestoreJSONResponse(make_colleges(50))
+
+    @app.get("/colleges/stream")
+    async def stream():
+        return StreamingResponse(iter([dumps(college) + b"\n" for college in make_colleges(50)]), media_type="application/x-ndjson")
+
+    return app
+
+
+def get(path):
+    async def send():
+        transport = httpx.ASGITransport(app=make_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://svc") as client:
+            return await client.get(path, headers={"Accept-Encoding": "gzip"})
+    return asyncio.run(send())
+
+
+def test_large_responses_are_gzipped():
+    response = get("/colleges")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 50
+
+
+def test_small_and_streamed_responses_are_not_compressed():
+    assert "content-encoding" not in get("/small").headers
+    assert "content-encoding" not in get("/colleges/stream").headers
+
+
+class FirestoreEncoder(json.JSONEncoder):
+    """The per-route encoder the shared response class replaced."""
+
+    def default(self, obj):
+        if hasattr(obj, '_sentinel_type'):
+            return f"Sentinel: {obj._sentinel_type}"
+        if hasattr(obj, 'isoformat'):
+            return obj.isoformat()
+        try:
+            return super().default(obj)
+        except TypeError:
+            return str(obj)
+
+
+@pytest.mark.benchmark
+def test_benchmark_5k_college_payload():
+    colleges = make_colleges(5000)
+    serializers = {
+        "JSONResponse": lambda: JSONResponse(jsonable_encoder(colleges)).body,
+        "FirestoreEncoder": lambda: json.dumps(colleges, cls=FirestoreEncoder).encode("utf-8"),
+        "FirestoreJSONResponse": lambda: FirestoreJSONResponse(colleges).body,
+    }
+    timings = {}
+    for name, serialize in serializers.items():
+        size = len(serialize())
+        started = time.perf_counter()
+        for _ in range(5):
+            serialize()
+        timings[name] = (time.perf_counter() - started) / 5
+
+    print("\n5000 colleges (" + f"{size / 1e6:.1f} MB): " + ", ".join(
+        f"{name} {seconds * 1000:.1f} ms" for name, seconds in timings.items()
+    ))
+    assert timings["FirestoreJSONResponse"] < timings["FirestoreEncoder"] < timings["JSONResponse"]
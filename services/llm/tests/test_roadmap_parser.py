@@ -0,0 +1,138 @@
+import json
+import random
+import time
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from utils.roadmap_parser import IncrementalTaskParser, RoadmapParser
+
+SCHOOLS = [{"schoolName": "MIT", "regularDeadline": "2027-01-01"}]
+
+# Strings that end or open JSON structures if the scanner loses track of string and escape state
+TRICKY_TEXT = [
+    'Plain text',
+    'Braces } and { inside',
+    'A "quoted" word and a ] bracket',
+    'Backslash \\ then quote \\"',
+    'Escaped \\\\" not a quote end',
+    'Unicode é and ☃ and a\nnew line',
+]
+
+
+def make_task(i, school="MIT"):
+    return {
+        "title": f"Task {i}: {TRICKY_TEXT[i % len(TRICKY_TEXT)]}",
+        "description": f"Step {i} {{with}} [brackets] and \"quotes\"",
+        "dueDate": f"2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+        "category": "Essay",
+        "priority": "medium",
+        "school": school,
+        "meta": {"nested": {"list": [1, {"deep": "}]"}], "flag": True}},
+    }
+
+
+def make_document(task_count, fenced=True):
+    document = json.dumps({
+        "tasks": [make_task(i) for i in range(task_count)],
+        "recommendations": ["Start early", "Ask for feedback"],
+    }, ensure_ascii=False, indent=2)
+    if fenced:
+        document = f"```json\n{document}\n```\nLet me know if you need anything else."
+    return document
+
+
+def stream(parser, document, cuts):
+    tasks = []
+    bounds = [0, *sorted(cuts), len(document)]
+    for start, end in zip(bounds, bounds[1:]):
+        tasks += parser.feed(document[start:end])
+    return tasks
+
+
+def random_cuts(rng, document, count):
+    return rng.sample(range(1, len(document)), min(count, len(document) - 1))
+
+
+def test_every_two_chunk_split_yields_the_same_tasks():
+    document = make_document(len(TRICKY_TEXT))
+    expected = [make_task(i) for i in range(len(TRICKY_TEXT))]
+
+    # Covers splits inside strings, escapes, the "tasks" key and nested objects
+    for cut in range(1, len(document)):
+        parser = IncrementalTaskParser()
+        assert stream(parser, document, [cut]) == expected, f"split at {cut}: {document[cut - 5:cut + 5]!r}"
+        assert parser.text == document
+
+
+def test_random_chunking_yields_the_same_tasks():
+    rng = random.Random(17)
+    document = make_document(40)
+    expected = [make_task(i) for i in range(40)]
+
+    for _ in range(200):
+        cuts = random_cuts(rng, document, rng.randint(1, 300))
+        assert stream(IncrementalTaskParser(), document, cuts) == expected
+
+
+def test_one_character_chunks():
+    document = make_document(5)
+
+    assert stream(IncrementalTaskParser(), document, range(1, len(document))) == [make_task(i) for i in range(5)]
+
+
+def test_tasks_key_with_spacing_split_across_chunks():
+    document = '{"recommendations": [], "tasks"  :\n  [{"title": "a"}]}'
+
+    for cut in range(1, len(document)):
+        assert stream(IncrementalTaskParser(), document, [cut]) == [{"title": "a"}]
+
+
+def test_finish_matches_parse():
+    rng = random.Random(3)
+    document = make_document(60)
+
+    expected = RoadmapParser(SCHOOLS).parse(document)
+    parser = RoadmapParser(SCHOOLS)
+    stream(parser, document, random_cuts(rng, document, 500))
+
+    assert parser.finish() == expected
+    assert parser.skipped == 0
+
+
+def test_stream_skips_invalid_tasks_that_parse_rejects():
+    late = make_task(1)
+    late["dueDate"] = "2027-02-01"
+    document = json.dumps({"tasks": [make_task(0), late], "recommendations": []})
+
+    with pytest.raises(ValueError):
+        RoadmapParser(SCHOOLS).parse(document)
+
+    parser = RoadmapParser(SCHOOLS)
+    stream(parser, document, [len(document) // 2])
+    assert [task["title"] for task in parser.finish()["tasks"]] == [make_task(0)["title"]]
+    assert parser.skipped == 1
+
+
+@pytest.mark.benchmark
+def test_benchmark_500_task_roadmap():
+    document = make_document(500)
+    rng = random.Random(500)
+    cuts = random_cuts(rng, document, len(document) // 20)
+
+    started = time.perf_counter()
+    parsed = RoadmapParser(SCHOOLS).parse(document)
+    parse_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    parser = RoadmapParser(SCHOOLS)
+    stream(parser, document, cuts)
+    streamed = parser.finish()
+    stream_seconds = time.perf_counter() - started
+
+    assert streamed == parsed
+    print(
+        f"\n500 tasks, {len(document)} chars: parse {parse_seconds * 1000:.1f} ms, "
+        f"streamed in {len(cuts) + 1} chunks {stream_seconds * 1000:.1f} ms"
+    )
@@ -0,0 +1,77 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from models.student import StudentProfile
+from utils.date_utils import days_until_deadline
+from utils.roadmap_scheduler import school_deadlines, schedule_standard_tasks
+
+TODAY = datetime(2026, 10, 18)
+
+
+def make_profile(planned_tests=("SAT",)):
+    return StudentProfile(
+        generalInfo={
+            "currentSchool": "Lincoln High",
+            "firstName": "Sam",
+            "lastName": "Lee",
+            "schoolType": "public",
+            "grade": 12,
+        },
+        collegePreferences={"targetSchools": []},
+        highSchoolProfile={"gpa": 3.8, "weightedGpa": 4.2, "plannedTests": list(planned_tests)},
+    )
+
+
+def school(name, deadline):
+    return {"schoolName": name, "regularDeadline": deadline}
+
+
+def due_dates(tasks):
+    return [datetime.strptime(task["dueDate"], "%Y-%m-%d") for task in tasks]
+
+
+def test_passed_month_day_deadline_rolls_into_next_year():
+    deadlines = school_deadlines([school("UCLA", "11/30"), school("MIT", "01/05")], TODAY)
+
+    assert deadlines == [("UCLA", datetime(2026, 11, 30)), ("MIT", datetime(2027, 1, 5))]
+    assert days_until_deadline("01/05", TODAY) == 79
+
+
+def test_past_full_date_deadline_is_dropped():
+    assert school_deadlines([school("MIT", "2026-01-05")], TODAY) == []
+    assert schedule_standard_tasks(make_profile(), [school("MIT", "2026-01-05")], today=TODAY) == []
+
+
+def test_no_task_is_due_before_today():
+    schools = [school("MIT", "2026-01-05"), school("UCLA", "10/25"), school("Yale", "01/02")]
+
+    tasks = schedule_standard_tasks(make_profile(), schools, today=TODAY)
+
+    assert {task["school"] for task in tasks} == {"All Schools", "UCLA", "Yale"}
+    assert min(due_dates(tasks)) >= TODAY
+
+
+def test_weekly_cap_is_respected():
+    schools = [school(f"School {i}", "2027-01-05") for i in range(6)]
+
+    tasks = schedule_standard_tasks(make_profile(), schools, today=TODAY, max_per_week=2)
+
+    assert len(tasks) == 9
+    weeks = Counter(day - timedelta(days=day.weekday()) for day in due_dates(tasks))
+    assert max(weeks.values()) <= 2
+    assert max(due_dates(tasks)) <= datetime(2027, 1, 5)
+
+
+def test_only_self_registered_tests_get_registration_tasks():
+    tasks = schedule_standard_tasks(
+        make_profile(["SAT", "ACT", "AP Tests", "SAT Subject Tests"]), [school("MIT", "01/05")], today=TODAY
+    )
+
+    assert sorted(task["title"] for task in tasks if task["title"].startswith("Register")) == [
+        "Register for the ACT",
+        "Register for the SAT",
+    ]
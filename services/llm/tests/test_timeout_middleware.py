@@ -0,0 +1,54 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("starlette")
+
+from middleware.timeout import TimeoutMiddleware
+
+
+def run(app, path="/generate-roadmap-from-db/stream"):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    middleware = TimeoutMiddleware(app, route_timeouts={path: 0.05})
+    asyncio.run(middleware({"type": "http", "path": path, "headers": []}, receive, send))
+    return messages
+
+
+def test_timeout_before_the_response_starts_is_a_504():
+    async def app(scope, receive, send):
+        await asyncio.sleep(1)
+
+    messages = run(app)
+
+    assert messages[0]["status"] == 504
+
+
+def test_timed_out_ndjson_stream_ends_with_an_error_line():
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/x-ndjson")]})
+        await send({"type": "http.response.body", "body": b'{"type": "task"}\n', "more_body": True})
+        await asyncio.sleep(1)
+
+    messages = run(app)
+
+    last = messages[-1]
+    assert last["more_body"] is False
+    assert json.loads(last["body"])["type"] == "error"
+
+
+def test_finished_stream_is_left_alone():
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/x-ndjson")]})
+        await send({"type": "http.response.body", "body": b'{"type": "done"}\n', "more_body": False})
+
+    messages = run(app)
+
+    assert len(messages) == 2
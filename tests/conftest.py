@@ -0,0 +1,21 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# The shared db package lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: timing comparison, only run with RUN_BENCHMARKS=1")
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.getenv("RUN_BENCHMARKS"):
+        return
+    skip = pytest.mark.skip(reason="benchmark; set RUN_BENCHMARKS=1 to run it")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
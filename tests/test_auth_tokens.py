@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("firebase_admin")
+pytest.importorskip("fastapi")
+
+from fastapi import HTTPException
+
+from db import auth_tokens
+from db.auth_tokens import TokenCache
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(auth_tokens, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def verifier(monkeypatch):
+    """Stands in for firebase_admin's verify_id_token and counts the tokens it checks."""
+    calls = []
+
+    def verify_id_token(token):
+        calls.append(token)
+        if token.startswith("bad"):
+            raise ValueError("Token has been revoked")
+        return {"uid": token, "exp": auth_tokens.time.time() + 600}
+
+    monkeypatch.setattr(auth_tokens.auth, "verify_id_token", verify_id_token)
+    monkeypatch.setattr(auth_tokens, "token_cache", TokenCache())
+    return calls
+
+
+def test_expired_token_is_not_served(clock):
+    cache = TokenCache()
+    cache.set("t", {"uid": "u", "exp": clock.now + 60})
+    assert cache.get("t") == {"uid": "u", "exp": clock.now + 60}
+
+    clock.now += 60
+    assert cache.get("t") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_max_ttl_caps_a_long_lived_token(clock):
+    cache = TokenCache(max_ttl_seconds=30)
+    cache.set("t", {"uid": "u", "exp": clock.now + 3600})
+
+    clock.now += 29
+    assert cache.get("t") is not None
+    clock.now += 1
+    assert cache.get("t") is None
+
+
+def test_token_without_exp_is_not_cached(clock):
+    cache = TokenCache()
+    cache.set("t", {"uid": "u"})
+
+    assert cache.get("t") is None
+
+
+def test_least_recently_used_token_is_evicted(clock):
+    cache = TokenCache(max_entries=2)
+    for token in ("a", "b"):
+        cache.set(token, {"uid": token, "exp": clock.now + 60})
+    cache.get("a")
+    cache.set("c", {"uid": "c", "exp": clock.now + 60})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_cache_hit_skips_verification(clock, verifier):
+    first = asyncio.run(auth_tokens.verify_id_token_async("good"))
+    second = asyncio.run(auth_tokens.verify_id_token_async("good"))
+
+    assert first == second
+    assert verifier == ["good"]
+
+
+def test_rejected_token_is_never_cached(clock, verifier):
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            asyncio.run(auth_tokens.verify_id_token_async("bad-token"))
+
+    assert verifier == ["bad-token", "bad-token"]
+    assert auth_tokens.token_cache.stats()["entries"] == 0
+
+
+def test_rejected_token_is_a_401(clock, verifier):
+    class FakeRequest:
+        headers = {"Authorization": "Bearer bad-token"}
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(auth_tokens.verify_token(FakeRequest()))
+
+    assert error.value.status_code == 401
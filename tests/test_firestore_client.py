@@ -0,0 +1,98 @@
+import pytest
+
+pytest.importorskip("firebase_admin")
+pytest.importorskip("google.api_core")
+
+from google.api_core.exceptions import NotFound, AlreadyExists
+from firebase_admin import firestore
+
+from db.firestore_client import FirestoreClient
+
+
+class FakeDocument:
+    def __init__(self, db, path):
+        self.db = db
+        self.path = path
+
+    def update(self, data):
+        self.db.rpcs.append(("update", self.path, data))
+        if self.path not in self.db.existing:
+            raise NotFound(f"No document to update: {self.path}")
+
+    def set(self, data):
+        self.db.rpcs.append(("set", self.path, data))
+        self.db.existing.add(self.path)
+
+    def create(self, data):
+        self.db.rpcs.append(("create", self.path, data))
+        if self.path in self.db.existing:
+            raise AlreadyExists(f"Document already exists: {self.path}")
+        self.db.existing.add(self.path)
+
+
+class FakeCollection:
+    def __init__(self, db, name):
+        self.db = db
+        self.name = name
+
+    def document(self, doc_id):
+        return FakeDocument(self.db, f"{self.name}/{doc_id}")
+
+
+class FakeDb:
+    """Records every Firestore round-trip made through it."""
+
+    def __init__(self, existing=()):
+        self.existing = set(existing)
+        self.rpcs = []
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+
+def make_client(db):
+    # Skip __init__, which would initialize the Firebase Admin SDK
+    client = object.__new__(FirestoreClient)
+    client.db = db
+    return client
+
+
+PROFILE_UPDATE = {
+    "studentProfile": {
+        "generalInfo": {"grade": "11"},
+        "lastUpdated": firestore.SERVER_TIMESTAMP,
+    },
+    "isOnboarded": True,
+}
+
+
+def test_update_user_profile_is_a_single_update():
+    db = FakeDb(existing={"users/u1"})
+    make_client(db).update_user_profile_sync("u1", PROFILE_UPDATE)
+
+    assert [(op, path) for op, path, _ in db.rpcs] == [("update", "users/u1")]
+    _, _, data = db.rpcs[0]
+    assert data["studentProfile.generalInfo"] == {"grade": "11"}
+    assert data["isOnboarded"] is True
+
+
+def test_update_user_profile_creates_missing_document():
+    db = FakeDb()
+    make_client(db).update_user_profile_sync("u1", PROFILE_UPDATE)
+
+    assert [(op, path) for op, path, _ in db.rpcs] == [("update", "users/u1"), ("set", "users/u1")]
+    assert db.rpcs[1][2] == PROFILE_UPDATE
+
+
+def test_update_without_fields_still_creates_missing_document():
+    db = FakeDb()
+    make_client(db).update_user_profile_sync("u1", {"tasks": []})
+
+    assert db.rpcs == [("create", "users/u1", {"tasks": []})]
+
+
+def test_update_without_fields_leaves_existing_document_alone():
+    db = FakeDb(existing={"users/u1"})
+    make_client(db).update_user_profile_sync("u1", {"tasks": []})
+
+    assert [op for op, _, _ in db.rpcs] == ["create"]
@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("firebase_admin")
+
+from db.firestore_client import FirestoreClient
+
+LATENCY = 0.05
+
+
+class SlowSnapshot:
+    def __init__(self, doc_id):
+        self.id = doc_id
+        self.exists = True
+
+    def to_dict(self):
+        return {"uid": self.id}
+
+
+class SlowDocument:
+    def __init__(self, doc_id):
+        self.doc_id = doc_id
+
+    def get(self):
+        # The firebase_admin client blocks its calling thread for the whole round-trip
+        time.sleep(LATENCY)
+        return SlowSnapshot(self.doc_id)
+
+
+class SlowCollection:
+    def document(self, doc_id):
+        return SlowDocument(doc_id)
+
+
+class SlowFirestore:
+    """Local stand-in for Firestore where every read takes LATENCY seconds."""
+
+    def collection(self, name):
+        return SlowCollection()
+
+
+def make_client():
+    # Skip __init__, which would initialize the Firebase Admin SDK
+    client = object.__new__(FirestoreClient)
+    client.db = SlowFirestore()
+    return client
+
+
+async def serve(handler, count, concurrency):
+    """Run `count` requests, `concurrency` at a time, and return the requests per second."""
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with slots:
+            await handler(f"user-{i}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return count / (time.perf_counter() - started)
+
+
+def test_reads_do_not_block_the_event_loop():
+    client = make_client()
+
+    async def main():
+        ticks = 0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not done.is_set():
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticking = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        profiles = await asyncio.gather(*(client.get_user_profile(f"user-{i}") for i in range(8)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await ticking
+        return profiles, elapsed, ticks
+
+    profiles, elapsed, ticks = asyncio.run(main())
+
+    assert [p["uid"] for p in profiles] == [f"user-{i}" for i in range(8)]
+    # Eight blocking reads one after another would take 8 * LATENCY
+    assert elapsed < 4 * LATENCY
+    assert ticks >= 5
+
+
+@pytest.mark.benchmark
+def test_benchmark_concurrent_profile_reads():
+    client = make_client()
+
+    async def blocking_read(user_id):
+        # What every async method did before: call the sync client on the event loop
+        return client._get_user_profile(user_id)
+
+    before = asyncio.run(serve(blocking_read, 40, concurrency=16))
+    after = asyncio.run(serve(client.get_user_profile, 40, concurrency=16))
+
+    print(f"\n{LATENCY * 1000:.0f} ms reads, 16 in flight: {before:.0f} req/s on the event loop, {after:.0f} req/s on the executor")
+    assert after > 4 * before